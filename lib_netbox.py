@@ -12,562 +12,984 @@
 #-------------------------------------------------------------------------------
 
 import lib_nspylib as mylib
+import lib_netbox_log
+import lib_netbox_metrics
+import lib_netbox_records
+import lib_netbox_sink
 import requests as rq
 import urllib3
 import json
 import re
 import time
+import random
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+NETBOX_API = {'custom_fields': {'url_part': 'extras/custom-fields',            'desc': 'Custom Fields',     'method': 'CustomFields',  'object_type': 'extras.customfield'},
+              'vms':           {'url_part': 'virtualization/virtual-machines', 'desc': 'Virtual Machines',  'method': 'VMs',           'object_type': 'virtualization.virtualmachine'},
+              'cluster_types': {'url_part': 'virtualization/cluster-types',    'desc': 'Cluster Types',     'method': 'ClusterTypes',  'object_type': 'virtualization.clustertype'},
+              'clusters':      {'url_part': 'virtualization/clusters',         'desc': 'Clusters',          'method': 'Clusters',      'object_type': 'virtualization.cluster'},
+              'ip_addresses':  {'url_part': 'ipam/ip-addresses',               'desc': 'IP Addresses',      'method': 'IPAddresses',   'object_type': 'ipam.ipaddress'},
+              'ip_ranges':     {'url_part': 'ipam/ip-ranges',                  'desc': 'IP Ranges',         'method': 'IPRanges',      'object_type': 'ipam.iprange'},
+              'ip_prefixes':   {'url_part': 'ipam/prefixes',                   'desc': 'IP Prefixes',       'method': 'IPPrefixes',    'object_type': 'ipam.prefix'},
+              'vlan_groups':   {'url_part': 'ipam/vlan-groups',                'desc': 'VLAN Groups',       'method': 'VlanGroups',    'object_type': 'ipam.vlangroup'},
+              'vlans':         {'url_part': 'ipam/vlans',                      'desc': 'VLANs',             'method': 'Vlans',         'object_type': 'ipam.vlan'},
+              'sites':         {'url_part': 'dcim/sites',                      'desc': 'Sites',             'method': 'Sites',         'object_type': 'dcim.site'},
+              'locations':     {'url_part': 'dcim/locations',                  'desc': 'Locations',         'method': 'Locations',     'object_type': 'dcim.location'},
+              'racks':         {'url_part': 'dcim/racks',                      'desc': 'Racks',             'method': 'Racks',         'object_type': 'dcim.rack'},
+              'owners':        {'url_part': 'tenancy/contacts',                'desc': 'Owners',            'method': 'Owners',        'object_type': 'tenancy.contact'},
+              'manufacturers': {'url_part': 'dcim/manufacturers',              'desc': 'Manufacturers',     'method': 'Manufacturers', 'object_type': 'dcim.manufacturer'},
+              'platforms':     {'url_part': 'dcim/platforms',                  'desc': 'Platforms',         'method': 'Platforms',     'object_type': 'dcim.platform'},
+              'device_roles':  {'url_part': 'dcim/device-roles',               'desc': 'Device Roles',      'method': 'DeviceRoles',   'object_type': 'dcim.devicerole'},
+              'device_types':  {'url_part': 'dcim/device-types',               'desc': 'Device Types',      'method': 'DeviceTypes',   'object_type': 'dcim.devicetype'},
+              'devices':       {'url_part': 'dcim/devices',                    'desc': 'Devices',           'method': 'Devices',       'object_type': 'dcim.device'}}
+
+NETBOX_DEPENDS = {'custom_fields': [],
+                  'vms':           ['custom_fields', 'clusters', 'sites', 'platforms', 'device_roles'],
+                  'cluster_types': ['custom_fields'],
+                  'clusters':      ['custom_fields', 'cluster_types', 'sites', 'locations'],
+                  'ip_addresses':  ['custom_fields', 'vms', 'devices'],
+                  'ip_ranges':     ['custom_fields'],
+                  'ip_prefixes':   ['custom_fields', 'sites', 'locations', 'vlans'],
+                  'vlan_groups':   ['custom_fields', 'sites', 'locations', 'racks', 'clusters'],
+                  'vlans':         ['custom_fields', 'vlan_groups', 'sites'],
+                  'sites':         ['custom_fields'],
+                  'locations':     ['custom_fields', 'sites'],
+                  'racks':         ['custom_fields', 'sites', 'locations'],
+                  'owners':        ['custom_fields'],
+                  'manufacturers': ['custom_fields'],
+                  'platforms':     ['custom_fields', 'manufacturers'],
+                  'device_roles':  ['custom_fields'],
+                  'device_types':  ['custom_fields', 'manufacturers'],
+                  'devices':       ['custom_fields', 'sites', 'locations', 'racks', 'device_roles', 'device_types', 'platforms', 'clusters']}
+
+NETBOX_API_INTERNAL = {'object_changes': {'url_part': 'extras/object-changes', 'desc': 'Object Changes'}}
+
+BRIEF_FIELDS = {'id', 'url', 'display', 'name', 'slug', 'model', 'description', 'address', 'prefix', 'start_address', 'end_address', 'family', 'vid', '_depth'}
+
+SERVER_EXCLUDE_FIELDS = {'config_context'}
+
+#-------------------------------------------------------------------------------
+
+def getObjectName(data):
+    if 'name' in data.keys():
+        object_name = data['name']
+    elif 'address' in data.keys():
+        object_name = data['address']
+    elif 'display' in data.keys():
+        object_name = data['display']
+    elif 'model' in data.keys():
+        object_name = data['model']
+    elif 'description' in data.keys():
+        object_name = data['description']
+    elif 'id' in data.keys():
+        object_name = f'Object with ID {data['id']}'
+    else:
+        object_name = 'Unknown Object'
+    return object_name
+
+#-------------------------------------------------------------------------------
+
+def projectionQuery(projection):
+    query = {}
+    if projection.get('brief'):
+        query['brief'] = 'true'
+    if projection.get('fields'):
+        query['fields'] = ','.join(sorted(set(projection['fields']) | {'id'}))
+    if projection.get('exclude'):
+        # older NetBox versions only know "exclude=config_context", newer ones take any field in "omit"
+        excluded = set(projection['exclude'])
+        if len(excluded & SERVER_EXCLUDE_FIELDS) > 0:
+            query['exclude'] = ','.join(sorted(excluded & SERVER_EXCLUDE_FIELDS))
+        if len(excluded - SERVER_EXCLUDE_FIELDS) > 0:
+            query['omit'] = ','.join(sorted(excluded - SERVER_EXCLUDE_FIELDS))
+    return query
+
+def filterQuery(filters):
+    def __value(value):
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if value is None:
+            return 'null'
+        if isinstance(value, dict) and 'id' in value:
+            return value['id']
+        return value
+    query = {}
+    for key, value in filters.items():
+        query[key] = [__value(item) for item in value] if isinstance(value, (list, tuple, set, frozenset)) else __value(value)
+    return query
+
+def projectItem(item, projection):
+    if projection.get('fields'):
+        item = {key: value for key, value in item.items() if key == 'id' or key in projection['fields']}
+    elif projection.get('brief'):
+        item = {key: value for key, value in item.items() if key in BRIEF_FIELDS}
+    if projection.get('exclude'):
+        item = {key: value for key, value in item.items() if key not in projection['exclude']}
+    return item
+
+def mergeChanges(old_data, changed_data, deleted_ids):
+    index_by_id = {item.get('id'): i for i, item in enumerate(old_data)}
+    result = list(old_data)
+    for item in changed_data:
+        if item.get('id') in index_by_id:
+            result[index_by_id[item.get('id')]] = item
+        else:
+            result.append(item)
+    if len(deleted_ids) > 0:
+        result = [item for item in result if item.get('id') not in deleted_ids]
+    return result
+
+def changedSince(since, overlap=60):
+    if isinstance(since, str):
+        since = datetime.fromisoformat(since)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return (since - timedelta(seconds=overlap)).isoformat()
+
+def deletedObjectPart(change):
+    object_type = change.get('changed_object_type')
+    if isinstance(object_type, dict):
+        object_type = f'{object_type.get('app_label')}.{object_type.get('model')}'
+    return next((part for part in NETBOX_API if NETBOX_API[part]['object_type'] == object_type), None)
+
+def retryDelay(attempt, backoff, max_backoff, retry_after=None):
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                from email.utils import parsedate_to_datetime
+                return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    delay = min(max_backoff, backoff * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def receivedBytes(headers, content, wire_bytes=None):
+    # what came over the network: with gzip/br the decoded content is several times larger
+    if wire_bytes is not None and (wire_bytes > 0 or len(content) == 0):
+        return wire_bytes
+    length = headers.get('Content-Length')
+    if length is not None and length.isdigit() and headers.get('Content-Encoding', 'identity') != 'identity':
+        return int(length)
+    return len(content)
+
+def retryDecision(method, attempt, retries, request_sent, status_code=None, not_sent=False):
+    # shared by the sync and the async client, status_code None stands for a network error
+    # POST is not idempotent: it is only retried when NetBox surely did not process the request
+    idempotent = method != 'POST'
+    if status_code is None:
+        retry = attempt < retries and (idempotent or not_sent)
+        return ('retry' if retry else 'fail'), request_sent or not not_sent
+    if method == 'DELETE' and request_sent and status_code == 404:
+        # an earlier attempt was sent and may have already deleted the object
+        return 'deleted', request_sent
+    retryable = status_code in (429, 503) if not idempotent else status_code in (429, 502, 503, 504)
+    retry = attempt < retries and retryable
+    return ('retry' if retry else 'done'), request_sent or status_code != 429
+
+def dependencyWaves(parts, depends=NETBOX_DEPENDS):
+    ancestors = {}
+    def __ancestors(part):
+        if part not in ancestors:
+            ancestors[part] = set()
+            for dependency in depends[part]:
+                ancestors[part].add(dependency)
+                ancestors[part].update(__ancestors(dependency))
+        return ancestors[part]
+
+    levels = {}
+    def __level(part):
+        if part not in levels:
+            levels[part] = 1 + max((__level(dependency) for dependency in parts if dependency in __ancestors(part)), default=-1)
+        return levels[part]
+
+    waves = [[] for i in range(1 + max((__level(part) for part in parts), default=-1))]
+    for part in parts:
+        waves[__level(part)].append(part)
+    return waves
+
+#-------------------------------------------------------------------------------
+
+class FailedResponse:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, exception):
+        self.exception = exception
+        self.status_code = 0
+        self.headers = {}
+        self.text = json.dumps({'detail': f'{type(exception).__name__}: {exception}'})
+        self.content = self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        raise self.exception
+
+#-------------------------------------------------------------------------------
+
+class AdaptiveLimiter:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, max_limit, min_limit=1, latency_factor=2.0, smoothing=0.2):
+        self.__max_limit = max(1, max_limit)
+        self.__min_limit = max(1, min(min_limit, self.__max_limit))
+        self.__latency_factor = latency_factor
+        self.__smoothing = smoothing
+        self.__limit = float(self.__max_limit)
+        self.__in_flight = 0
+        self.__latency = {}
+        self.__baseline = {}
+        self.__condition = threading.Condition()
+
+    #-------------------------------------------------------------------------------
+
+    def getLimit(self):
+        return int(self.__limit)
+
+    def getMaxLimit(self):
+        return self.__max_limit
+
+    def setMaxLimit(self, max_limit):
+        with self.__condition:
+            self.__max_limit = max(1, max_limit)
+            self.__min_limit = min(self.__min_limit, self.__max_limit)
+            self.__limit = min(self.__limit, float(self.__max_limit))
+            self.__condition.notify_all()
+
+    def acquire(self):
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait()
+            self.__in_flight += 1
+
+    def release(self, key, latency, overloaded=False):
+        # latency is tracked per (part, method): a slow endpoint must not look like an overloaded server
+        with self.__condition:
+            self.__in_flight -= 1
+            if overloaded:
+                self.__limit = max(self.__min_limit, self.__limit / 2)
+            else:
+                average = self.__latency.get(key, latency)
+                average += self.__smoothing * (latency - average)
+                self.__latency[key] = average
+                # the baseline drifts up slowly so one lucky fast request does not pin it forever
+                self.__baseline[key] = min(self.__baseline.get(key, average) * 1.01, average)
+                if average > self.__baseline[key] * self.__latency_factor:
+                    self.__limit = max(self.__min_limit, self.__limit * 0.9)
+                else:
+                    self.__limit = min(self.__max_limit, self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+
 #-------------------------------------------------------------------------------
 
 class NetboxAPI:
     
     #-------------------------------------------------------------------------------
 
-    def __init__(self, config_file=None, input_data_file=None):
+    def __init__(self, config_file=None, input_data_file=None, page_size=1000, max_workers=8,
+                 timeout=(10, 300), retries=5, backoff=0.5, max_backoff=60, adaptive=True,
+                 log_level='info', log_mode='text', log_file=None, logger=None, metrics=None, projections=None,
+                 lazy_connect=False, probe=True):
+        self.__api = NETBOX_API
+        self.__depends = NETBOX_DEPENDS
+        self.__api_internal = NETBOX_API_INTERNAL
+        self.__page_size = page_size
+        self.__max_workers = max_workers
+        self.__projections = {} if projections is None else projections
+        self.__last_load_time = None
+        self.__timeout = timeout
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__limiter = AdaptiveLimiter(max_workers) if adaptive else None
+        self.__log = lib_netbox_log.NetboxLogger(log_level, log_mode, filename=log_file) if logger is None else logger
+        self.__metrics = lib_netbox_metrics.NetboxMetrics() if metrics is None else metrics
+
         if input_data_file is None and config_file is not None:
             config = mylib.readJSONfromFile(config_file)
             
             self.__url = config['url']
             self.__apikey = config['apikey']
-            self.__api = {'custom_fields': {'url_part': 'extras/custom-fields',            'desc': 'Custom Fields'},
-                          'vms':           {'url_part': 'virtualization/virtual-machines', 'desc': 'Virtual Machines'},
-                          'cluster_types': {'url_part': 'virtualization/cluster-types',    'desc': 'Cluster Types'},
-                          'clusters':      {'url_part': 'virtualization/clusters',         'desc': 'Clusters'},
-                          'ip_addresses':  {'url_part': 'ipam/ip-addresses',               'desc': 'IP Addresses'},
-                          'ip_ranges':     {'url_part': 'ipam/ip-ranges',                  'desc': 'IP Ranges'},
-                          'ip_prefixes':   {'url_part': 'ipam/prefixes',                   'desc': 'IP Prefixes'},
-                          'vlan_groups':   {'url_part': 'ipam/vlan-groups',                'desc': 'VLAN Groups'},
-                          'vlans':         {'url_part': 'ipam/vlans',                      'desc': 'VLANs'},
-                          'sites':         {'url_part': 'dcim/sites',                      'desc': 'Sites'},
-                          'locations':     {'url_part': 'dcim/locations',                  'desc': 'Locations'},
-                          'racks':         {'url_part': 'dcim/racks',                      'desc': 'Racks'},
-                          'owners':        {'url_part': 'tenancy/contacts',                'desc': 'Owners'},
-                          'manufacturers': {'url_part': 'dcim/manufacturers',              'desc': 'Manufacturers'},
-                          'platforms':     {'url_part': 'dcim/platforms',                  'desc': 'Platforms'},
-                          'device_roles':  {'url_part': 'dcim/device-roles',               'desc': 'Device Roles'},
-                          'device_types':  {'url_part': 'dcim/device-types',               'desc': 'Device Types'},
-                          'devices':       {'url_part': 'dcim/devices',                    'desc': 'Devices'}} 
             self.__cf = {}
-            self.__headers = {'Authorization': f'Token {self.__apikey}', 'Content-Type': 'application/json','Accept': 'application/json'}
+            self.__headers = {'Authorization': f'Token {self.__apikey}', 'Content-Type': 'application/json','Accept': 'application/json', 'Accept-Encoding': mylib.acceptEncoding()}
 
-            print(f'{mylib.nowDateTime()} - NetboxAPI: Connecting to "{self.__url}" - ...')
+            self.__log.info(f'Connecting to "{self.__url}" - ...')
             self.__netbox = rq.Session()
             self.__netbox.headers.update(self.__headers)
-            try:
-                self.__response_of_request = self.__netbox.get(f"{self.__url}", verify=False)
-                if self.__response_of_request.status_code == 200: 
-                    print(f'{mylib.nowDateTime()} - NetboxAPI: Connecting to "{self.__url}" - OK! (Code: {self.__response_of_request.status_code})\n')
-                else:
-                    print(f'{mylib.nowDateTime()} - NetboxAPI: Connecting to "{self.__url}" - Error!')
-                    if not isinstance(self.__response_of_request, dict):
-                        print(f'\nResponse Code: {self.__response_of_request.status_code}!')
-                        print(f'\nResponse JSON:')
-                        mylib.dumpJSONtoScreen(json.loads(self.__response_of_request.text))
-                    else:
-                        print(f'\nResponse:')
-                        mylib.dumpJSONtoScreen(self.__response_of_request)
-            except rq.exceptions.ConnectionError as e:
-                self.__response_of_request = None
-                print(f'{mylib.nowDateTime()} - NetboxAPI: Connecting to "{self.__url}" - Error!')
-                print(f'\nText of Exception:\n{e}!')
-                print(f'\nClose this program!')
-                exit()
+            self.__pool_size = 0
+            self.__pool_lock = threading.Lock()
+            self.__resizePool(max_workers)
+            self.__probe = probe
+            self.__response_of_request = None
+            self.__connected = False
+            self.__connect_lock = threading.Lock()
+            if not lazy_connect:
+                self.__connect()
         elif input_data_file is not None:
-            print(f'{mylib.nowDateTime()} - NetboxAPI: Work mode - Data from file "{input_data_file}"!\n')
+            self.__log.info(f'Work mode - Data from file "{input_data_file}"!')
             self.__input_data_file = input_data_file
             self.__netbox = None
 
     #-------------------------------------------------------------------------------
 
+    def __resizePool(self, max_workers):
+        # the connection pool and the limiter grow with the largest max_workers a call asked for
+        with self.__pool_lock:
+            if max_workers <= self.__pool_size:
+                return
+            old_adapter = getattr(self, '_NetboxAPI__adapter', None)
+            self.__pool_size = max_workers
+            self.__adapter = rq.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.__netbox.mount('http://', self.__adapter)
+            self.__netbox.mount('https://', self.__adapter)
+            if old_adapter is not None:
+                old_adapter.close()
+            if self.__limiter is not None and self.__limiter.getMaxLimit() < max_workers:
+                self.__limiter.setMaxLimit(max_workers)
+
+    def __connect(self):
+        # with lazy_connect the probe runs right before the first real request
+        with self.__connect_lock:
+            if self.__connected:
+                return
+            self.__connected = True
+            if not self.__probe:
+                self.__log.info(f'Connecting to "{self.__url}" - Skipped probe!')
+                return
+            self.__response_of_request = self.__send('GET', f"{self.__url}")
+            if self.__response_of_request.status_code == 200: 
+                self.__log.info(f'Connecting to "{self.__url}" - OK! (Code: {self.__response_of_request.status_code})')
+            elif not isinstance(self.__response_of_request, FailedResponse):
+                self.__log.error(f'Connecting to "{self.__url}" - Error (Code: {self.__response_of_request.status_code})!', response=self.__json(self.__response_of_request))
+            else:
+                e = self.__response_of_request.exception
+                self.__response_of_request = None
+                self.__log.error(f'Connecting to "{self.__url}" - Error: {e}! Close this program!')
+                self.__log.close()
+                exit()
+
+    #-------------------------------------------------------------------------------
+
     def __del__(self):
         if self.__netbox is not None:
             self.__netbox.close()
+        self.__log.flush()
 
     #-------------------------------------------------------------------------------
 
-    def __load(self, part):
-        print(f'{mylib.nowDateTime()} - NetBoxAPI: Get {self.__api[part]['desc']} from "{self.__url}" - ...')
-        temp_response = self.__netbox.get(f"{self.__url}/{self.__api[part]['url_part']}/?limit=0", verify=False).json()
-        data_to_return = temp_response.get('results', [])
-        print(f'{mylib.nowDateTime()} - NetBoxAPI: Get {self.__api[part]['desc']} from "{self.__url}" - OK ({len(data_to_return)})\n')
+    def __request(self, method, url, data=None, part=None):
+        if not self.__connected:
+            self.__connect()
+        return self.__send(method, url, data, part)
+
+    def __send(self, method, url, data=None, part=None):
+        request_sent = False
+        attempt = 0
+        while True:
+            if self.__limiter is not None:
+                self.__limiter.acquire()
+            start_time = time.monotonic()
+            try:
+                response = self.__netbox.request(method, url, data=data, timeout=self.__timeout, verify=False)
+            except rq.exceptions.RequestException as e:
+                latency = time.monotonic() - start_time
+                if self.__limiter is not None:
+                    self.__limiter.release((part, method), latency, overloaded=isinstance(e, rq.exceptions.Timeout))
+                self.__metrics.record(part, method, url, 0, 0 if data is None else len(data), 0, time.time() - latency, latency, attempt, f'{type(e).__name__}: {e}')
+                if not isinstance(e, (rq.exceptions.ConnectionError, rq.exceptions.Timeout)):
+                    return FailedResponse(e)
+                not_sent = isinstance(e, rq.exceptions.ConnectTimeout) or isinstance(getattr(e.args[0] if e.args else None, 'reason', None), urllib3.exceptions.NewConnectionError)
+                decision, request_sent = retryDecision(method, attempt, self.__retries, request_sent, not_sent=not_sent)
+                if decision != 'retry':
+                    return FailedResponse(e)
+                delay = retryDelay(attempt, self.__backoff, self.__max_backoff)
+            else:
+                latency = time.monotonic() - start_time
+                if self.__limiter is not None:
+                    self.__limiter.release((part, method), latency, overloaded=response.status_code in (429, 503))
+                self.__metrics.record(part, method, url, response.status_code, 0 if data is None else len(data), receivedBytes(response.headers, response.content, getattr(response.raw, 'tell', lambda: None)()), time.time() - latency, latency, attempt)
+                decision, request_sent = retryDecision(method, attempt, self.__retries, request_sent, response.status_code)
+                if decision == 'deleted':
+                    response.status_code = 204
+                if decision != 'retry':
+                    return response
+                delay = retryDelay(attempt, self.__backoff, self.__max_backoff, response.headers.get('Retry-After'))
+            self.__log.warning(f'{method} "{url}" - Retry {attempt+1}/{self.__retries} in {delay:.1f}s!')
+            time.sleep(delay)
+            attempt += 1
+
+    def getMetrics(self):
+        return self.__metrics
+
+    def __json(self, response):
+        try:
+            return mylib.jsonLoads(response.content)
+        except ValueError:
+            return {'detail': response.text}
+
+    #-------------------------------------------------------------------------------
+
+    def __projection(self, part, brief=None, fields=None, exclude=None):
+        projection = dict(self.__projections.get(part, {}))
+        for key, value in (('brief', brief), ('fields', fields), ('exclude', exclude)):
+            if value is not None:
+                projection[key] = value
+        return projection
+
+    def __iterate(self, part, page_size=None, params=None, brief=None, fields=None, exclude=None, filters=None):
+        api = self.__api[part] if part in self.__api else self.__api_internal[part]
+        projection = self.__projection(part, brief, fields, exclude)
+        if page_size is None:
+            page_size = self.__page_size
+        query = {'limit': page_size}
+        query.update(projectionQuery(projection))
+        if filters is not None:
+            query.update(filterQuery(filters))
+        if params is not None:
+            query.update(params)
+        next_url = f"{self.__url}/{api['url_part']}/?{urlencode(query, doseq=True)}"
+        count_of_items = 0
+        self.__log.info(f'Get {api['desc']} from "{self.__url}" - ...')
+        while next_url is not None:
+            temp_response = self.__request('GET', next_url, part=part)
+            if temp_response.status_code != 200:
+                self.__log.error(f'Get {api['desc']} from "{self.__url}" - Error (Code: {temp_response.status_code})!')
+                temp_response.raise_for_status()
+            temp_response = self.__json(temp_response)
+            page = temp_response.get('results', [])
+            count_of_items += len(page)
+            if len(projection) > 0:
+                page = [projectItem(item, projection) for item in page]
+            yield from page
+            next_url = temp_response.get('next')
+        self.__log.info(f'Get {api['desc']} from "{self.__url}" - OK ({count_of_items})')
+        self.__log.flush()
+
+    def iterCustomFields(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('custom_fields', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterVMs(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('vms', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterClusterTypes(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('cluster_types', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterClusters(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('clusters', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterIPAddresses(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('ip_addresses', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterIPRanges(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('ip_ranges', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterIPPrefixes(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('ip_prefixes', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterVlanGroups(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('vlan_groups', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterVlans(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('vlans', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterSites(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('sites', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterLocations(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('locations', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterRacks(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('racks', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterOwners(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('owners', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterManufacturers(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('manufacturers', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterPlatforms(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('platforms', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterDeviceRoles(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('device_roles', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterDeviceTypes(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('device_types', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    def iterDevices(self, page_size=None, brief=None, fields=None, exclude=None, filters=None):
+        return self.__iterate('devices', page_size, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    #-------------------------------------------------------------------------------
+
+    def __load(self, part, page_size=None, params=None, compact=False, refs=None, brief=None, fields=None, exclude=None, filters=None):
+        if compact:
+            data_to_return = lib_netbox_records.NetboxCompactPart(part, self.__iterate(part, page_size, params, brief, fields, exclude, filters), refs)
+        else:
+            data_to_return = list(self.__iterate(part, page_size, params, brief, fields, exclude, filters))
         return data_to_return
     
-    def loadCustomFields(self):
-        temp = self.__load('custom_fields')
+    def loadCustomFields(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('custom_fields', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
 
-    def loadVMs(self):
-        temp = self.__load('vms')
+    def loadVMs(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('vms', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadClusterTypes(self):
-        temp = self.__load('cluster_types')
+
+    def loadClusterTypes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('cluster_types', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
 
-    def loadClusters(self):
-        temp = self.__load('clusters')
+    def loadClusters(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('clusters', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
 
-    def loadIPAddresses(self):
-        temp = self.__load('ip_addresses')
+    def loadIPAddresses(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('ip_addresses', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
-        return result        
+        return result
 
-    def loadIPRanges(self):
-        temp = self.__load('ip_ranges')
+    def loadIPRanges(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('ip_ranges', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
 
-    def loadIPPrefixes(self):
-        temp = self.__load('ip_prefixes')
+    def loadIPPrefixes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('ip_prefixes', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadVlanGroups(self):
-        temp = self.__load('vlan_groups')
+
+    def loadVlanGroups(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('vlan_groups', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
 
-    def loadVlans(self):
-        temp = self.__load('vlans')
+    def loadVlans(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('vlans', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadSites(self):
-        temp = self.__load('sites')
+
+    def loadSites(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('sites', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadLocations(self):
-        temp = self.__load('locations')
+
+    def loadLocations(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('locations', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadRacks(self):
-        temp = self.__load('racks')
+
+    def loadRacks(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('racks', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadOwners(self):
-        temp = self.__load('owners')
+
+    def loadOwners(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('owners', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadManufacturers(self):
-        temp = self.__load('manufacturers')
+
+    def loadManufacturers(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('manufacturers', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadPlatforms(self):
-        temp = self.__load('platforms')
+
+    def loadPlatforms(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('platforms', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadDeviceRoles(self):
-        temp = self.__load('device_roles')
+
+    def loadDeviceRoles(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('device_roles', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadDeviceTypes(self):
-        temp = self.__load('device_types')
+
+    def loadDeviceTypes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('device_types', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
-    def loadDevices(self):
-        temp = self.__load('devices')
+
+    def loadDevices(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        temp = self.__load('devices', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
         result = temp
         return result
-    
+
     #-------------------------------------------------------------------------------
     
-    def __create(self, part, data_to_create):
-        result = {'list_of_good': [],
-                  'list_of_bad':  [],
-                  'dict_of_bad'  :{}}
+    def __results(self, action, part, data, sink=None, aggregate=True, progress=None, journal=None):
+        result = lib_netbox_sink.NetboxResultCollector(action, part, f'{action.title()} {self.__api[part]['desc']}', 1 if isinstance(data, dict) else len(data),
+                                                       sink, aggregate, progress, mylib.sortedIPs if part == 'ip_addresses' else sorted, journal)
+        data = result.pending(data, getObjectName)
+        if result.count_of_skipped > 0:
+            self.__log.info(f'{action.title()} {self.__api[part]['desc']} in "{self.__url}" - Skipped {result.count_of_skipped} objects already in the journal!')
+        return result, data
+
+    def __badResponse(self, temp_response):
+        if not isinstance(temp_response, dict):
+            temp_response = {'status_code': temp_response.status_code,
+                             'text': temp_response.text,
+                             'json': self.__json(temp_response)}
+        return temp_response
+
+    def __badChunk(self, action, part, result, chunk, first_index, len_of_data, temp_response, reason):
+        last_index = first_index + len(chunk) - 1
+        temp_response = self.__badResponse(temp_response)
+        self.__log.error(f'{action} {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - {reason} (Code: {temp_response['status_code']}), not retried!', response=temp_response)
+        self.__log.progress(f'{action} {self.__api[part]['desc']}', last_index, len_of_data)
+        for i, data in enumerate(chunk):
+            result.bad(getObjectName(data), data, temp_response, first_index+i)
+
+    def __create(self, part, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        result, data_to_create = self.__results('create', part, data_to_create, sink, aggregate, progress, journal)
         
         if len(data_to_create) > 0:
             def __subcreate(data, item_index=1, len_of_data=1):
-                if 'name' in data.keys():
-                    object_name = data['name']
-                elif 'address' in data.keys():
-                    object_name = data['address']
-                elif 'display' in data.keys():
-                    object_name = data['display']
-                elif 'model' in data.keys():
-                    object_name = data['model']
-                elif 'description' in data.keys():
-                    object_name = data['description']                  
-                elif 'id' in data.keys():
-                    object_name = f'Object with ID {data['id']}'
-                else:
-                    object_name = 'Unknown Object'
-                print(f'{mylib.nowDateTime()} - NetBoxAPI: Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
-                temp_response = self.__netbox.post(f"{self.__url}/{self.__api[part]['url_part']}/", data=json.dumps(data), verify=False).json()
+                object_name = getObjectName(data)
+                if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                    self.__log.debug(f'Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
+                temp_response = self.__json(self.__request('POST', f"{self.__url}/{self.__api[part]['url_part']}/", mylib.jsonDumpsBytes(data), part=part))
                 if temp_response.get('created'):
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!\n')
-                    result['list_of_good'].append(object_name)
+                    if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                        self.__log.debug(f'Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!')
+                    self.__log.progress(f'Create {self.__api[part]['desc']}', item_index, len_of_data)
+                    result.good(object_name, data, temp_response, item_index)
                 else:
-                    result['list_of_bad'].append(object_name)
-                    
-                    result['dict_of_bad'][object_name] = {}
-                    result['dict_of_bad'][object_name]['request']  = data
-                    
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!')
-                    
-                    if not isinstance(temp_response, dict):
-                        temp_response = {'status_code': temp_response.status_code,
-                                        'text': temp_response.text,
-                                        'json': json.loads(temp_response.text)}
-                        
-                        print(f'\nResponse Code: {temp_response['status_code']}!')
-                        print(f'\nResponse JSON:')
-                        mylib.dumpJSONtoScreen(temp_response['json'])
-                    
-                    else:
-                        print(f'\nResponse:')
-                        mylib.dumpJSONtoScreen(temp_response)
-
-                    print()
-                    print(f'\nData in request:')
-                    mylib.dumpJSONtoScreen(data)
-                    print()
-
-                    result['dict_of_bad'][object_name]['response'] = temp_response
+                    temp_response = self.__badResponse(temp_response)
+
+                    self.__log.error(f'Create {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!', response=temp_response, data_in_request=data)
+                    self.__log.progress(f'Create {self.__api[part]['desc']}', item_index, len_of_data)
+
+                    result.bad(object_name, data, temp_response, item_index)
+
+            def __subcreatechunk(chunk, first_index, len_of_data):
+                last_index = first_index + len(chunk) - 1
+                self.__log.debug(f'Create {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - ...')
+                temp_response = self.__request('POST', f"{self.__url}/{self.__api[part]['url_part']}/", mylib.jsonDumpsBytes(chunk), part=part)
+                if temp_response.status_code == 201:
+                    self.__log.debug(f'Create {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - OK ({last_index}/{len_of_data})!')
+                    self.__log.progress(f'Create {self.__api[part]['desc']}', last_index, len_of_data)
+                    result.goodChunk([getObjectName(data) for data in chunk], chunk, self.__json(temp_response), first_index)
+                elif temp_response.status_code == 429:
+                    # still throttled after the retries, sending the objects one by one would only add load
+                    self.__badChunk('Create', part, result, chunk, first_index, len_of_data, temp_response, 'Throttled')
+                elif 400 <= temp_response.status_code < 500:
+                    # NetBox rolls a rejected bulk create back as a whole, so the objects can be sent one by one
+                    self.__log.warning(f'Create {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - Error (Code: {temp_response.status_code}), retrying one by one!')
+                    for i, item_to_create in enumerate(chunk):
+                        __subcreate(item_to_create, first_index+i, len_of_data)
+                else:
+                    # a timeout or a 5xx may come after NetBox committed the chunk, sending it again could duplicate it
+                    self.__badChunk('Create', part, result, chunk, first_index, len_of_data, temp_response, 'Unknown outcome')
 
             if isinstance(data_to_create, dict):
                 __subcreate(data_to_create)
             elif isinstance(data_to_create, list):
-                for i, item_to_create in enumerate(data_to_create):
-                    __subcreate(item_to_create, i+1, len(data_to_create)) 
-        else:
-            print(f'{mylib.nowDateTime()} - NetBoxAPI: No Data {self.__api[part]['desc']} to Create in "{self.__url}"!\n')
+                if chunk_size is None or chunk_size < 2:
+                    for i, item_to_create in enumerate(data_to_create):
+                        __subcreate(item_to_create, i+1, len(data_to_create)) 
+                else:
+                    for i in range(0, len(data_to_create), chunk_size):
+                        __subcreatechunk(data_to_create[i:i+chunk_size], i+1, len(data_to_create))
+        elif result.count_of_skipped == 0:
+            self.__log.info(f'No Data {self.__api[part]['desc']} to Create in "{self.__url}"!')
         
-        result['list_of_good'] = sorted(set(result['list_of_good']))
-        result['list_of_bad']  = sorted(set(result['list_of_bad']))
-        result['dict_of_bad']  = mylib.sortDictByKey(result['dict_of_bad'])
+        if result.count_of_good + result.count_of_bad > 0:
+            self.__log.info(f'Create {self.__api[part]['desc']} in "{self.__url}" - Done (Good: {result.count_of_good}, Bad: {result.count_of_bad})!')
+        self.__log.flush()
         
-        return result
+        return result.finish()
     
-    def createCustomFields(self, data_to_create):
-        return(self.__create('custom_fields', data_to_create))
+    def createCustomFields(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('custom_fields', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createVMs(self, data_to_create):
-        return(self.__create('vms', data_to_create))
+    def createVMs(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('vms', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createClusterTypes(self, data_to_create):
-        return(self.__create('cluster_types', data_to_create))
+    def createClusterTypes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('cluster_types', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createClusters(self, data_to_create):
-        return(self.__create('clusters', data_to_create))
+    def createClusters(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('clusters', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createIPAddresses(self, data_to_create):
-        res = self.__create('ip_addresses', data_to_create)
-        res['list_of_good'] = mylib.sortedIPs(res['list_of_good'])
-        res['list_of_bad'] = mylib.sortedIPs(res['list_of_bad'])
-        res['dict_of_bad'] = {ip: res['dict_of_bad'][ip] for ip in res['list_of_bad']}
-        return res
+    def createIPAddresses(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('ip_addresses', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createIPRanges(self, data_to_create):
-        return(self.__create('ip_ranges', data_to_create))
+    def createIPRanges(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('ip_ranges', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createIPPrefixes(self, data_to_create):
-        return(self.__create('ip_prefixes', data_to_create))
+    def createIPPrefixes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('ip_prefixes', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createVlanGroups(self, data_to_create):
-        return(self.__create('vlan_groups', data_to_create))
+    def createVlanGroups(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('vlan_groups', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createVlans(self, data_to_create):
-        return(self.__create('vlans', data_to_create))
+    def createVlans(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('vlans', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createSites(self, data_to_create):
-        return(self.__create('sites', data_to_create))
+    def createSites(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('sites', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createLocations(self, data_to_create):
-        return(self.__create('locations', data_to_create))
+    def createLocations(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('locations', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createRacks(self, data_to_create):
-        return(self.__create('racks', data_to_create))
+    def createRacks(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('racks', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createOwners(self, data_to_create):
-        return(self.__create('owners', data_to_create))
+    def createOwners(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('owners', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createManufacturers(self, data_to_create):
-        return(self.__create('manufacturers', data_to_create))
+    def createManufacturers(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('manufacturers', data_to_create, chunk_size, sink, aggregate, progress, journal))
     
-    def createPlatforms(self, data_to_create):
-        return(self.__create('platforms', data_to_create))
+    def createPlatforms(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('platforms', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createDeviceRoles(self, data_to_create):
-        return(self.__create('device_roles', data_to_create))
+    def createDeviceRoles(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('device_roles', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createDeviceTypes(self, data_to_create):
-        return(self.__create('device_types', data_to_create))
+    def createDeviceTypes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('device_types', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
-    def createDevices(self, data_to_create):
-        return(self.__create('devices', data_to_create))
+    def createDevices(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__create('devices', data_to_create, chunk_size, sink, aggregate, progress, journal))
 
     #-------------------------------------------------------------------------------
 
-    def __update(self, part, data_to_update):
-        result = {'list_of_good': [],
-                  'list_of_bad':  [],
-                  'dict_of_bad'  :{}}
+    def __update(self, part, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        result, data_to_update = self.__results('update', part, data_to_update, sink, aggregate, progress, journal)
         
         if len(data_to_update) > 0:
             def __subupdate(data, item_index=1, len_of_data=1):
-                if 'name' in data.keys():
-                    object_name = data['name']
-                elif 'address' in data.keys():
-                    object_name = data['address']
-                elif 'display' in data.keys():
-                    object_name = data['display']
-                elif 'model' in data.keys():
-                    object_name = data['model']
-                elif 'description' in data.keys():
-                    object_name = data['description']                  
-                elif 'id' in data.keys():
-                    object_name = f'Object with ID {data['id']}'
-                else:
-                    object_name = 'Unknown Object'
-                print(f'{mylib.nowDateTime()} - NetBoxAPI: Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
-                temp_response = self.__netbox.patch(f"{self.__url}/{self.__api[part]['url_part']}/{data['id']}/", data=json.dumps(data), verify=False)
+                object_name = getObjectName(data)
+                if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                    self.__log.debug(f'Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
+                temp_response = self.__request('PATCH', f"{self.__url}/{self.__api[part]['url_part']}/{data['id']}/", mylib.jsonDumpsBytes(data), part=part)
                 if temp_response.status_code == 200:
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!\n')
-                    result['list_of_good'].append(object_name)
+                    if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                        self.__log.debug(f'Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!')
+                    self.__log.progress(f'Update {self.__api[part]['desc']}', item_index, len_of_data)
+                    result.good(object_name, data, index=item_index)
                 else:
-                    result['list_of_bad'].append(object_name)
-                    
-                    result['dict_of_bad'][object_name] = {}
-                    result['dict_of_bad'][object_name]['request']  = data
-                    
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!')
-                    
-                    if not isinstance(temp_response, dict):
-                        temp_response = {'status_code': temp_response.status_code,
-                                        'text': temp_response.text,
-                                        'json': json.loads(temp_response.text)}
-                        
-                        print(f'\nResponse Code: {temp_response['status_code']}!')
-                        print(f'\nResponse JSON:')
-                        mylib.dumpJSONtoScreen(temp_response['json'])
-                    
-                    else:
-                        print(f'\nResponse:')
-                        mylib.dumpJSONtoScreen(temp_response)
+                    temp_response = self.__badResponse(temp_response)
 
-                    print()
-                    print(f'\nData in request:')
-                    mylib.dumpJSONtoScreen(data)
-                    print()
+                    self.__log.error(f'Update {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!', response=temp_response, data_in_request=data)
+                    self.__log.progress(f'Update {self.__api[part]['desc']}', item_index, len_of_data)
 
-                    result['dict_of_bad'][object_name]['response'] = temp_response
+                    result.bad(object_name, data, temp_response, item_index)
                     
+            def __subupdatechunk(chunk, first_index, len_of_data):
+                last_index = first_index + len(chunk) - 1
+                self.__log.debug(f'Update {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - ...')
+                temp_response = self.__request('PATCH', f"{self.__url}/{self.__api[part]['url_part']}/", mylib.jsonDumpsBytes(chunk), part=part)
+                if temp_response.status_code == 200:
+                    self.__log.debug(f'Update {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - OK ({last_index}/{len_of_data})!')
+                    self.__log.progress(f'Update {self.__api[part]['desc']}', last_index, len_of_data)
+                    result.goodChunk([getObjectName(data) for data in chunk], chunk, first_index=first_index)
+                elif temp_response.status_code == 429:
+                    # still throttled after the retries, sending the objects one by one would only add load
+                    self.__badChunk('Update', part, result, chunk, first_index, len_of_data, temp_response, 'Throttled')
+                else:
+                    self.__log.warning(f'Update {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - Error (Code: {temp_response.status_code}), retrying one by one!')
+                    for i, item_to_update in enumerate(chunk):
+                        __subupdate(item_to_update, first_index+i, len_of_data)
+
             if isinstance(data_to_update, dict):
                 __subupdate(data_to_update)
             elif isinstance(data_to_update, list):
-                for i, item_to_create in enumerate(data_to_update):
-                    __subupdate(item_to_create, i+1, len(data_to_update))
-        else:
-            print(f'{mylib.nowDateTime()} - NetBoxAPI: No Data {self.__api[part]['desc']} to Update in "{self.__url}"!\n')
+                if chunk_size is None or chunk_size < 2:
+                    for i, item_to_create in enumerate(data_to_update):
+                        __subupdate(item_to_create, i+1, len(data_to_update))
+                else:
+                    for i in range(0, len(data_to_update), chunk_size):
+                        __subupdatechunk(data_to_update[i:i+chunk_size], i+1, len(data_to_update))
+        elif result.count_of_skipped == 0:
+            self.__log.info(f'No Data {self.__api[part]['desc']} to Update in "{self.__url}"!')
         
-        result['list_of_good'] = sorted(set(result['list_of_good']))
-        result['list_of_bad']  = sorted(set(result['list_of_bad']))
-        result['dict_of_bad']  = mylib.sortDictByKey(result['dict_of_bad'])
+        if result.count_of_good + result.count_of_bad > 0:
+            self.__log.info(f'Update {self.__api[part]['desc']} in "{self.__url}" - Done (Good: {result.count_of_good}, Bad: {result.count_of_bad})!')
+        self.__log.flush()
         
-        return result
+        return result.finish()
     
-    def updateCustomFields(self, data_to_update):
-        return(self.__update('custom_fields', data_to_update))
+    def updateCustomFields(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('custom_fields', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateVMs(self, data_to_update):
-        return(self.__update('vms', data_to_update))
+    def updateVMs(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('vms', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateClusterTypes(self, data_to_update):
-        return(self.__update('cluster_types', data_to_update))
+    def updateClusterTypes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('cluster_types', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateClusters(self, data_to_update):
-        return(self.__update('clusters', data_to_update))
+    def updateClusters(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('clusters', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateIPAddresses(self, data_to_update):
-        res = self.__update('ip_addresses', data_to_update)
-        res['list_of_good'] = mylib.sortedIPs(res['list_of_good'])
-        res['list_of_bad'] = mylib.sortedIPs(res['list_of_bad'])
-        res['dict_of_bad'] = {ip: res['dict_of_bad'][ip] for ip in res['list_of_bad']}
-        return res
+    def updateIPAddresses(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('ip_addresses', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateIPRanges(self, data_to_update):
-        return(self.__update('ip_ranges', data_to_update))
+    def updateIPRanges(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('ip_ranges', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateIPPrefixes(self, data_to_update):
-        return(self.__update('ip_prefixes', data_to_update))
+    def updateIPPrefixes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('ip_prefixes', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateVlanGroups(self, data_to_update):
-        return(self.__update('vlan_groups', data_to_update))
+    def updateVlanGroups(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('vlan_groups', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateVlans(self, data_to_update):
-        return(self.__update('vlans', data_to_update))
+    def updateVlans(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('vlans', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateSites(self, data_to_update):
-        return(self.__update('sites', data_to_update))
+    def updateSites(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('sites', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateLocations(self, data_to_update):
-        return(self.__update('locations', data_to_update))
+    def updateLocations(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('locations', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateRacks(self, data_to_update):
-        return(self.__update('racks', data_to_update))
+    def updateRacks(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('racks', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateOwners(self, data_to_update):
-        return(self.__update('owners', data_to_update))
+    def updateOwners(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('owners', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updateManufacturers(self, data_to_update):
-        return(self.__update('manufacturers', data_to_update))
+    def updateManufacturers(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('manufacturers', data_to_update, chunk_size, sink, aggregate, progress, journal))
     
-    def updatePlatforms(self, data_to_update):
-        return(self.__update('platforms', data_to_update))
+    def updatePlatforms(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('platforms', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateDeviceRoles(self, data_to_update):
-        return(self.__update('device_roles', data_to_update))
+    def updateDeviceRoles(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('device_roles', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateDeviceTypes(self, data_to_update):
-        return(self.__update('device_types', data_to_update))
+    def updateDeviceTypes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('device_types', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
-    def updateDevices(self, data_to_update):
-        return(self.__update('devices', data_to_update))
+    def updateDevices(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__update('devices', data_to_update, chunk_size, sink, aggregate, progress, journal))
 
     #-------------------------------------------------------------------------------
 
-    def __delete(self, part, data_to_delete):
-        result = {'list_of_good': [],
-                  'list_of_bad':  [],
-                  'dict_of_bad'  :{}}
+    def __delete(self, part, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        result, data_to_delete = self.__results('delete', part, data_to_delete, sink, aggregate, progress, journal)
         
         if len(data_to_delete) > 0:            
             def __subdelete(data, item_index=1, len_of_data=1):
-                if 'name' in data.keys():
-                    object_name = data['name']
-                elif 'address' in data.keys():
-                    object_name = data['address']
-                elif 'display' in data.keys():
-                    object_name = data['display']
-                elif 'model' in data.keys():
-                    object_name = data['model']
-                elif 'description' in data.keys():
-                    object_name = data['description']                  
-                elif 'id' in data.keys():
-                    object_name = f'Object with ID {data['id']}'
-                else:
-                    object_name = 'Unknown Object'
-                print(f'{mylib.nowDateTime()} - NetBoxAPI: Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
-                temp_response = self.__netbox.delete(f"{self.__url}/{self.__api[part]['url_part']}/{data['id']}", verify=False)
+                object_name = getObjectName(data)
+                if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                    self.__log.debug(f'Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - ...')
+                temp_response = self.__request('DELETE', f"{self.__url}/{self.__api[part]['url_part']}/{data['id']}", part=part)
                 if temp_response.status_code == 204:  
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!\n')
-                    result['list_of_good'].append(object_name)
+                    if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                        self.__log.debug(f'Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!')
+                    self.__log.progress(f'Delete {self.__api[part]['desc']}', item_index, len_of_data)
+                    result.good(object_name, data, index=item_index)
                 else:
-                    result['list_of_bad'].append(object_name)
-
-                    result['dict_of_bad'][object_name] = {}
-                    result['dict_of_bad'][object_name]['request']  = data
-                    
-                    print(f'{mylib.nowDateTime()} - NetBoxAPI: Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!')
-                    
-                    if not isinstance(temp_response, dict):
-                        temp_response = {'status_code': temp_response.status_code,
-                                        'text': temp_response.text,
-                                        'json': json.loads(temp_response.text)}
-                        
-                        print(f'\nResponse Code: {temp_response['status_code']}!')
-                        print(f'\nResponse JSON:')
-                        mylib.dumpJSONtoScreen(temp_response['json'])
-                    
-                    else:
-                        print(f'\nResponse:')
-                        mylib.dumpJSONtoScreen(temp_response)
-
-                    print()
-                    print(f'\nData in request:')
-                    mylib.dumpJSONtoScreen(data)
-                    print()
-
-                    result['dict_of_bad'][object_name]['response'] = temp_response
+                    temp_response = self.__badResponse(temp_response)
+
+                    self.__log.error(f'Delete {self.__api[part]['desc']} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!', response=temp_response, data_in_request=data)
+                    self.__log.progress(f'Delete {self.__api[part]['desc']}', item_index, len_of_data)
+
+                    result.bad(object_name, data, temp_response, item_index)
+
+            def __subdeletechunk(chunk, first_index, len_of_data):
+                last_index = first_index + len(chunk) - 1
+                self.__log.debug(f'Delete {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - ...')
+                temp_response = self.__request('DELETE', f"{self.__url}/{self.__api[part]['url_part']}/", mylib.jsonDumpsBytes([{'id': data['id']} for data in chunk]), part=part)
+                if temp_response.status_code == 204:
+                    self.__log.debug(f'Delete {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - OK ({last_index}/{len_of_data})!')
+                    self.__log.progress(f'Delete {self.__api[part]['desc']}', last_index, len_of_data)
+                    result.goodChunk([getObjectName(data) for data in chunk], chunk, first_index=first_index)
+                elif temp_response.status_code == 429:
+                    # still throttled after the retries, sending the objects one by one would only add load
+                    self.__badChunk('Delete', part, result, chunk, first_index, len_of_data, temp_response, 'Throttled')
+                else:
+                    self.__log.warning(f'Delete {self.__api[part]['desc']} objects {first_index}-{last_index} in "{self.__url}" - Error (Code: {temp_response.status_code}), retrying one by one!')
+                    for i, item_to_delete in enumerate(chunk):
+                        __subdelete(item_to_delete, first_index+i, len_of_data)
 
             if isinstance(data_to_delete, dict):
                 __subdelete(data_to_delete)
             elif isinstance(data_to_delete, list):
-                for i, item_to_create in enumerate(data_to_delete):
-                    __subdelete(item_to_create, i+1, len(data_to_delete))
-        else:
-            print(f'{mylib.nowDateTime()} - NetBoxAPI: No Data {self.__api[part]['desc']} to Delete in "{self.__url}"!\n')
+                if chunk_size is None or chunk_size < 2:
+                    for i, item_to_create in enumerate(data_to_delete):
+                        __subdelete(item_to_create, i+1, len(data_to_delete))
+                else:
+                    for i in range(0, len(data_to_delete), chunk_size):
+                        __subdeletechunk(data_to_delete[i:i+chunk_size], i+1, len(data_to_delete))
+        elif result.count_of_skipped == 0:
+            self.__log.info(f'No Data {self.__api[part]['desc']} to Delete in "{self.__url}"!')
         
-        result['list_of_good'] = sorted(set(result['list_of_good']))
-        result['list_of_bad']  = sorted(set(result['list_of_bad']))
-        result['dict_of_bad']  = mylib.sortDictByKey(result['dict_of_bad'])
+        if result.count_of_good + result.count_of_bad > 0:
+            self.__log.info(f'Delete {self.__api[part]['desc']} in "{self.__url}" - Done (Good: {result.count_of_good}, Bad: {result.count_of_bad})!')
+        self.__log.flush()
 
-        return result
+        return result.finish()
 
-    def deleteCustomFields(self, data_to_delete):
-        return(self.__delete('custom_fields', data_to_delete))
+    def deleteCustomFields(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('custom_fields', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteVMs(self, data_to_delete):
-        return(self.__delete('vms', data_to_delete))
+    def deleteVMs(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('vms', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteClusterTypes(self, data_to_delete):
-        return(self.__delete('cluster_types', data_to_delete))
+    def deleteClusterTypes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('cluster_types', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteClusters(self, data_to_delete):
-        return(self.__delete('clusters', data_to_delete))
+    def deleteClusters(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('clusters', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteIPAddresses(self, data_to_delete):    
-        res = self.__delete('ip_addresses', data_to_delete)
-        res['list_of_good'] = mylib.sortedIPs(res['list_of_good'])
-        res['list_of_bad'] = mylib.sortedIPs(res['list_of_bad'])
-        res['dict_of_bad'] = {ip: res['dict_of_bad'][ip] for ip in res['list_of_bad']}
-        return res
+    def deleteIPAddresses(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('ip_addresses', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteIPRanges(self, data_to_delete):
-        return(self.__delete('ip_ranges', data_to_delete))
+    def deleteIPRanges(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('ip_ranges', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteIPPrefixes(self, data_to_delete):
-        return(self.__delete('ip_prefixes', data_to_delete))
+    def deleteIPPrefixes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('ip_prefixes', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteVlanGroups(self, data_to_delete):
-        return(self.__delete('vlan_groups', data_to_delete))
+    def deleteVlanGroups(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('vlan_groups', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteVlans(self, data_to_delete):
-        return(self.__delete('vlans', data_to_delete))
+    def deleteVlans(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('vlans', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteSites(self, data_to_delete):
-        return(self.__delete('sites', data_to_delete))
+    def deleteSites(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('sites', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteLocations(self, data_to_delete):
-        return(self.__delete('locations', data_to_delete))
+    def deleteLocations(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('locations', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteRacks(self, data_to_delete):
-        return(self.__delete('racks', data_to_delete))
+    def deleteRacks(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('racks', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteOwners(self, data_to_delete):
-        return(self.__delete('owners', data_to_delete))
+    def deleteOwners(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('owners', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deleteManufacturers(self, data_to_delete):
-        return(self.__delete('manufacturers', data_to_delete))
+    def deleteManufacturers(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('manufacturers', data_to_delete, chunk_size, sink, aggregate, progress, journal))
     
-    def deletePlatforms(self, data_to_delete):
-        return(self.__delete('platforms', data_to_delete))
+    def deletePlatforms(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('platforms', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteDeviceRoles(self, data_to_delete):
-        return(self.__delete('device_roles', data_to_delete))
+    def deleteDeviceRoles(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('device_roles', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteDeviceTypes(self, data_to_delete):
-        return(self.__delete('device_types', data_to_delete))
+    def deleteDeviceTypes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('device_types', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
-    def deleteDevices(self, data_to_delete):
-        return(self.__delete('devices', data_to_delete))
+    def deleteDevices(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return(self.__delete('devices', data_to_delete, chunk_size, sink, aggregate, progress, journal))
 
     #-------------------------------------------------------------------------------
 
@@ -575,42 +997,119 @@ class NetboxAPI:
     
     #-------------------------------------------------------------------------------
 
-    def loadData(self):
+    def __loadDeletedIDs(self, since):
+        result = {}
+        for change in self.__iterate('object_changes', params={'action': 'delete', 'time_after': since}):
+            part = deletedObjectPart(change)
+            if part is not None:
+                result.setdefault(part, set()).add(change.get('changed_object_id'))
+        return result
+
+    def getLastLoadTime(self):
+        return self.__last_load_time
+
+    def loadData(self, parts=None, max_workers=None, snapshot=None, since=None, overlap=60, compact=False, projections=None, filters=None, lazy=False):
         result = None
+        parts_to_load = parts
+        if parts is None:
+            parts = list(self.__api.keys()) if snapshot is None else [part for part in self.__api if part in snapshot]
+        if max_workers is None:
+            max_workers = self.__max_workers
+        if projections is None:
+            projections = {}
+        if filters is None:
+            filters = {}
         if self.__netbox is not None:
-            if self.__response_of_request is not None:
-                if self.__response_of_request.status_code == 200:
-                    result = {}
-                    result['custom_fields'] = self.loadCustomFields()
-                    result['vms'] =           self.loadVMs()
-                    result['cluster_types'] = self.loadClusterTypes()
-                    result['clusters'] =      self.loadClusters()
-                    result['ip_addresses'] =  self.loadIPAddresses()
-                    result['ip_ranges'] =     self.loadIPRanges()
-                    result['ip_prefixes'] =   self.loadIPPrefixes()
-                    result['vlan_groups'] =   self.loadVlanGroups()
-                    result['vlans'] =         self.loadVlans()
-                    result['sites'] =         self.loadSites()
-                    result['locations'] =     self.loadLocations()
-                    result['racks'] =         self.loadRacks()
-                    result['owners'] =        self.loadOwners()
-                    result['manufacturers'] = self.loadManufacturers()
-                    result['platforms'] =     self.loadPlatforms()
-                    result['device_roles'] =  self.loadDeviceRoles()
-                    result['device_types'] =  self.loadDeviceTypes()
-                    result['devices'] =       self.loadDevices()
+            self.__connect()
+            self.__resizePool(min(max_workers, len(parts)))
+            if not self.__probe or self.__response_of_request is not None:
+                if not self.__probe or self.__response_of_request.status_code == 200:
+                    load_time = datetime.now(timezone.utc)
+                    refs = lib_netbox_records.NetboxReferences() if compact else None
+                    def __loadpart(part):
+                        return self.__load(part, compact=compact, refs=refs, filters=filters.get(part), **projections.get(part, {}))
+                    if snapshot is not None and since is not None:
+                        since = changedSince(since, overlap)
+                        deleted_ids = self.__loadDeletedIDs(since)
+                        def __loadpart(part):
+                            if part not in snapshot:
+                                return self.__load(part, compact=compact, refs=refs, filters=filters.get(part), **projections.get(part, {}))
+                            changed_data = self.__load(part, params={'last_updated__gte': since}, filters=filters.get(part), **projections.get(part, {}))
+                            merged_data = mergeChanges(snapshot[part], changed_data, deleted_ids.get(part, set()))
+                            return lib_netbox_records.NetboxCompactPart(part, merged_data, refs) if compact else merged_data
+                    if max_workers > 1 and len(parts) > 1:
+                        with ThreadPoolExecutor(max_workers=min(max_workers, len(parts))) as executor:
+                            futures = {part: executor.submit(__loadpart, part) for part in parts}
+                        result = {part: futures[part].result() for part in parts}
+                    else:
+                        result = {part: __loadpart(part) for part in parts}
+                    self.__last_load_time = load_time.isoformat()
                     return result
         else:
-            print(f'{mylib.nowDateTime()} - NetBoxAPI: Reading data from file "{self.__input_data_file}" - ...')
-            temp_data = mylib.readJSONfromFile(self.__input_data_file)
-            result = temp_data.copy()
-            print(f'{mylib.nowDateTime()} - NetBoxAPI: Reading data from file "{self.__input_data_file}" - OK!\n')
+            self.__log.info(f'Reading data from file "{self.__input_data_file}" - ...')
+            import lib_netbox_snapshot
+            import lib_netbox_store
+            if lib_netbox_snapshot.isSnapshotFile(self.__input_data_file):
+                temp_data = lib_netbox_snapshot.NetboxSnapshotFile(self.__input_data_file)
+            elif lib_netbox_store.isSnapshotStore(self.__input_data_file):
+                temp_data = lib_netbox_store.NetboxSnapshotStore(self.__input_data_file, read_only=True)
+            elif lazy:
+                temp_data = mylib.readJSONfromFileLazy(self.__input_data_file)
+            else:
+                temp_data = mylib.readJSONfromFile(self.__input_data_file)
+            if lazy and parts_to_load is None:
+                # a read-only mapping that decodes each part on first access, the file stays open
+                result = temp_data
+            else:
+                result = {part: temp_data[part] for part in (temp_data if parts_to_load is None else parts) if part in temp_data}
+                if hasattr(temp_data, 'close'):
+                    temp_data.close()
+            self.__log.info(f'Reading data from file "{self.__input_data_file}" - OK!')
         return result
     
     #-------------------------------------------------------------------------------
 
-    def uploadData(self, data_to_create, data_to_update, data_to_delete):
-        pass
+    def uploadData(self, data_to_create=None, data_to_update=None, data_to_delete=None, chunk_size=None, max_workers=None,
+                   sink=None, aggregate=True, progress=None, journal=None):
+        # parts of a wave run in parallel, they have to share one file
+        if isinstance(sink, str):
+            with lib_netbox_sink.NetboxJSONLinesSink(sink) as shared_sink:
+                return self.uploadData(data_to_create, data_to_update, data_to_delete, chunk_size, max_workers, shared_sink, aggregate, progress, journal)
+        if isinstance(journal, str):
+            with lib_netbox_sink.NetboxJournal(journal) as shared_journal:
+                return self.uploadData(data_to_create, data_to_update, data_to_delete, chunk_size, max_workers, sink, aggregate, progress, shared_journal)
+        result = None
+        if max_workers is None:
+            max_workers = self.__max_workers
+        if self.__netbox is not None:
+            self.__resizePool(min(max_workers, len(self.__api)))
+            result = {'create': {},
+                      'update': {},
+                      'delete': {}}
+            for action, data in (('create', data_to_create), ('update', data_to_update), ('delete', data_to_delete)):
+                if data is None:
+                    data = {}
+                for part in data.keys():
+                    if part not in self.__api:
+                        self.__log.warning(f'Unknown part "{part}" in data to {action.title()}, skipped!')
+                parts = [part for part in self.__api if len(data.get(part, [])) > 0]
+                waves = dependencyWaves(parts, self.__depends)
+                if action == 'delete':
+                    waves.reverse()
+                def __apply(part):
+                    return getattr(self, f'{action}{self.__api[part]['method']}')(data[part], chunk_size, sink, aggregate, progress, journal)
+                for wave in waves:
+                    if max_workers > 1 and len(wave) > 1:
+                        with ThreadPoolExecutor(max_workers=min(max_workers, len(wave))) as executor:
+                            futures = {part: executor.submit(__apply, part) for part in wave}
+                        for part in wave:
+                            result[action][part] = futures[part].result()
+                    else:
+                        for part in wave:
+                            result[action][part] = __apply(part)
+        else:
+            self.__log.info(f'Work mode - Data from file "{self.__input_data_file}", nothing to upload!')
+        return result
 
 #-------------------------------------------------------------------------------
 
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Async NetBox API
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import lib_netbox
+import lib_netbox_log
+import lib_netbox_metrics
+import lib_netbox_records
+import lib_netbox_sink
+import asyncio
+import time
+
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from lib_netbox import getObjectName
+
+#-------------------------------------------------------------------------------
+
+class AsyncResponse:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, status_code, headers, content, request_info=None, history=()):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.request_info = request_info
+        self.history = history
+        self.text = content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return mylib.jsonLoads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise aiohttp.ClientResponseError(self.request_info, self.history, status=self.status_code, message=self.text, headers=self.headers)
+
+#-------------------------------------------------------------------------------
+
+class AsyncNetboxAPI:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, config_file, page_size=1000, max_in_flight=256,
+                 timeout=(10, 300), retries=5, backoff=0.5, max_backoff=60,
+                 log_level='info', log_mode='text', log_file=None, logger=None, metrics=None, projections=None,
+                 probe=True):
+        if aiohttp is None:
+            raise ImportError('AsyncNetboxAPI requires the "aiohttp" package, install it with "pip install aiohttp"!')
+        self.__api = lib_netbox.NETBOX_API
+        self.__depends = lib_netbox.NETBOX_DEPENDS
+        self.__api_internal = lib_netbox.NETBOX_API_INTERNAL
+        self.__page_size = page_size
+        self.__max_in_flight = max_in_flight
+        self.__projections = {} if projections is None else projections
+        self.__probe = probe
+        self.__last_load_time = None
+        self.__timeout = timeout
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__log = lib_netbox_log.NetboxLogger(log_level, log_mode, filename=log_file) if logger is None else logger
+        self.__metrics = lib_netbox_metrics.NetboxMetrics() if metrics is None else metrics
+
+        config = mylib.readJSONfromFile(config_file)
+
+        self.__url = config['url']
+        self.__apikey = config['apikey']
+        self.__headers = {'Authorization': f'Token {self.__apikey}', 'Content-Type': 'application/json','Accept': 'application/json', 'Accept-Encoding': mylib.acceptEncoding()}
+        self.__netbox = None
+        self.__semaphore = None
+        self.__open_lock = asyncio.Lock()
+
+    #-------------------------------------------------------------------------------
+
+    async def open(self):
+        # called by "async with" or lazily by the first request, like the sync client connects
+        async with self.__open_lock:
+            if self.__netbox is not None:
+                return self
+            self.__log.info(f'Connecting to "{self.__url}" - ...')
+            self.__semaphore = asyncio.Semaphore(self.__max_in_flight)
+            self.__netbox = aiohttp.ClientSession(headers=self.__headers,
+                                                  connector=aiohttp.TCPConnector(limit=self.__max_in_flight, ssl=False),
+                                                  timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.__timeout[0], sock_read=self.__timeout[1]))
+            if not self.__probe:
+                self.__log.info(f'Connecting to "{self.__url}" - Skipped probe!')
+                return self
+            response = await self.__request('GET', f"{self.__url}")
+            if response.status_code != 200:
+                await self.close()
+                if isinstance(response, lib_netbox.FailedResponse):
+                    self.__log.error(f'Connecting to "{self.__url}" - Error: {response.exception}!')
+                    raise response.exception
+                self.__log.error(f'Connecting to "{self.__url}" - Error (Code: {response.status_code})!', response=self.__json(response))
+                response.raise_for_status()
+            self.__log.info(f'Connecting to "{self.__url}" - OK! (Code: {response.status_code})')
+        return self
+
+    async def close(self):
+        if self.__netbox is not None:
+            await self.__netbox.close()
+            self.__netbox = None
+        self.__log.flush()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    #-------------------------------------------------------------------------------
+
+    async def __request(self, method, url, data=None, part=None):
+        if self.__netbox is None:
+            await self.open()
+        request_sent = False
+        attempt = 0
+        body = data
+        while True:
+            async with self.__semaphore:
+                start_time = time.monotonic()
+                try:
+                    async with self.__netbox.request(method, url, data=body) as temp_response:
+                        response = AsyncResponse(temp_response.status, temp_response.headers, await temp_response.read(), temp_response.request_info, temp_response.history)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    latency = time.monotonic() - start_time
+                    self.__metrics.record(part, method, url, 0, 0 if body is None else len(body), 0, time.time() - latency, latency, attempt, f'{type(e).__name__}: {e}')
+                    decision, request_sent = lib_netbox.retryDecision(method, attempt, self.__retries, request_sent, not_sent=isinstance(e, aiohttp.ClientConnectorError))
+                    if decision != 'retry':
+                        return lib_netbox.FailedResponse(e)
+                    delay = lib_netbox.retryDelay(attempt, self.__backoff, self.__max_backoff)
+                else:
+                    latency = time.monotonic() - start_time
+                    self.__metrics.record(part, method, url, response.status_code, 0 if body is None else len(body), lib_netbox.receivedBytes(response.headers, response.content), time.time() - latency, latency, attempt)
+                    decision, request_sent = lib_netbox.retryDecision(method, attempt, self.__retries, request_sent, response.status_code)
+                    if decision == 'deleted':
+                        response.status_code = 204
+                    if decision != 'retry':
+                        return response
+                    delay = lib_netbox.retryDelay(attempt, self.__backoff, self.__max_backoff, response.headers.get('Retry-After'))
+            self.__log.warning(f'{method} "{url}" - Retry {attempt+1}/{self.__retries} in {delay:.1f}s!')
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def getMetrics(self):
+        return self.__metrics
+
+    def __json(self, response):
+        try:
+            return mylib.jsonLoads(response.content)
+        except ValueError:
+            return {'detail': response.text}
+
+    #-------------------------------------------------------------------------------
+
+    async def __page(self, part, url, desc):
+        temp_response = await self.__request('GET', url, part=part)
+        if temp_response.status_code != 200:
+            self.__log.error(f'Get {desc} from "{self.__url}" - Error (Code: {temp_response.status_code})!')
+            temp_response.raise_for_status()
+        return self.__json(temp_response)
+
+    async def __load(self, part, page_size=None, params=None, compact=False, refs=None, brief=None, fields=None, exclude=None, filters=None):
+        api = self.__api[part] if part in self.__api else self.__api_internal[part]
+        projection = dict(self.__projections.get(part, {}))
+        for key, value in (('brief', brief), ('fields', fields), ('exclude', exclude)):
+            if value is not None:
+                projection[key] = value
+        if page_size is None:
+            page_size = self.__page_size
+        query = {'limit': page_size}
+        query.update(lib_netbox.projectionQuery(projection))
+        if filters is not None:
+            query.update(lib_netbox.filterQuery(filters))
+        if params is not None:
+            query.update(params)
+        self.__log.info(f'Get {api['desc']} from "{self.__url}" - ...')
+        first_page = await self.__page(part, f"{self.__url}/{api['url_part']}/?{urlencode(query, doseq=True)}", api['desc'])
+        pages = [first_page]
+        next_url = first_page.get('next')
+        if next_url is not None and isinstance(first_page.get('count'), int):
+            # the total is known after the first page, so the other pages are fetched concurrently
+            limit = int(parse_qs(urlsplit(next_url).query).get('limit', [len(first_page.get('results', []))])[0])
+            offsets = range(len(first_page.get('results', [])), first_page['count'], max(1, limit))
+            pages.extend(await asyncio.gather(*(self.__page(part, f"{self.__url}/{api['url_part']}/?{urlencode({**query, 'limit': limit, 'offset': offset}, doseq=True)}", api['desc'])
+                                                 for offset in offsets)))
+        else:
+            while next_url is not None:
+                pages.append(await self.__page(part, next_url, api['desc']))
+                next_url = pages[-1].get('next')
+        items = (item for page in pages for item in page.get('results', []))
+        if len(projection) > 0:
+            items = (lib_netbox.projectItem(item, projection) for item in items)
+        result = lib_netbox_records.NetboxCompactPart(part, items, refs) if compact else list(items)
+        self.__log.info(f'Get {api['desc']} from "{self.__url}" - OK ({len(result)})')
+        self.__log.flush()
+        return result
+
+    #-------------------------------------------------------------------------------
+
+    def __badResponse(self, temp_response):
+        if not isinstance(temp_response, dict):
+            temp_response = {'status_code': temp_response.status_code,
+                             'text': temp_response.text,
+                             'json': self.__json(temp_response)}
+        return temp_response
+
+    async def __apply(self, action, part, data_to_apply, chunk_size, method, success_code, single_url, chunk_body, sink=None, aggregate=True, progress=None, journal=None):
+        desc = self.__api[part]['desc']
+        url = f"{self.__url}/{self.__api[part]['url_part']}/"
+        result = lib_netbox_sink.NetboxResultCollector(action.lower(), part, f'{action} {desc}', 1 if isinstance(data_to_apply, dict) else len(data_to_apply),
+                                                       sink, aggregate, progress, mylib.sortedIPs if part == 'ip_addresses' else sorted, journal)
+        data_to_apply = result.pending(data_to_apply, getObjectName)
+        if result.count_of_skipped > 0:
+            self.__log.info(f'{action} {desc} in "{self.__url}" - Skipped {result.count_of_skipped} objects already in the journal!')
+
+        async def __subapply(data, item_index=1, len_of_data=1):
+            object_name = getObjectName(data)
+            if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                self.__log.debug(f'{action} {desc} object "{object_name}" in "{self.__url}" - ...')
+            temp_response = await self.__request(method, single_url(url, data), None if method == 'DELETE' else mylib.jsonDumpsBytes(data), part)
+            if action == 'Create':
+                # create keeps the decoded body as the response, like NetboxAPI does
+                temp_response = self.__json(temp_response)
+                success = bool(temp_response.get('created'))
+            else:
+                success = temp_response.status_code == success_code
+            if success:
+                if self.__log.isEnabled(lib_netbox_log.DEBUG):
+                    self.__log.debug(f'{action} {desc} object "{object_name}" in "{self.__url}" - OK ({item_index}/{len_of_data})!')
+                result.good(object_name, data, temp_response if action == 'Create' else None, item_index)
+                self.__log.progress(f'{action} {desc}', result.count_of_good + result.count_of_bad, len_of_data)
+                return
+            temp_response = self.__badResponse(temp_response)
+            self.__log.error(f'{action} {desc} object "{object_name}" in "{self.__url}" - Error ({item_index}/{len_of_data})!', response=temp_response, data_in_request=data)
+            result.bad(object_name, data, temp_response, item_index)
+            self.__log.progress(f'{action} {desc}', result.count_of_good + result.count_of_bad, len_of_data)
+
+        async def __subapplychunk(chunk, first_index, len_of_data):
+            last_index = first_index + len(chunk) - 1
+            self.__log.debug(f'{action} {desc} objects {first_index}-{last_index} in "{self.__url}" - ...')
+            temp_response = await self.__request(method, url, mylib.jsonDumpsBytes(chunk_body(chunk)), part)
+            if temp_response.status_code == success_code:
+                self.__log.debug(f'{action} {desc} objects {first_index}-{last_index} in "{self.__url}" - OK ({last_index}/{len_of_data})!')
+                result.goodChunk([getObjectName(data) for data in chunk], chunk, self.__json(temp_response) if action == 'Create' else None, first_index)
+                self.__log.progress(f'{action} {desc}', result.count_of_good + result.count_of_bad, len_of_data)
+                return
+            if temp_response.status_code == 429 or (action == 'Create' and not 400 <= temp_response.status_code < 500):
+                # a timeout or a 5xx may come after NetBox committed the chunk, sending it again could duplicate it,
+                # a 429 that outlived the retries would only be repeated one by one against a throttling server
+                reason = 'Throttled' if temp_response.status_code == 429 else 'Unknown outcome'
+                temp_response = self.__badResponse(temp_response)
+                self.__log.error(f'{action} {desc} objects {first_index}-{last_index} in "{self.__url}" - {reason} (Code: {temp_response['status_code']}), not retried!', response=temp_response)
+                for i, data in enumerate(chunk):
+                    result.bad(getObjectName(data), data, temp_response, first_index+i)
+                self.__log.progress(f'{action} {desc}', result.count_of_good + result.count_of_bad, len_of_data)
+                return
+            self.__log.warning(f'{action} {desc} objects {first_index}-{last_index} in "{self.__url}" - Error (Code: {temp_response.status_code}), retrying one by one!')
+            await asyncio.gather(*(__subapply(data, first_index+i, len_of_data) for i, data in enumerate(chunk)))
+
+        if len(data_to_apply) > 0:
+            if isinstance(data_to_apply, dict):
+                await __subapply(data_to_apply)
+            elif isinstance(data_to_apply, list):
+                if chunk_size is None or chunk_size < 2:
+                    await asyncio.gather(*(__subapply(data, i+1, len(data_to_apply)) for i, data in enumerate(data_to_apply)))
+                else:
+                    await asyncio.gather(*(__subapplychunk(data_to_apply[i:i+chunk_size], i+1, len(data_to_apply))
+                                           for i in range(0, len(data_to_apply), chunk_size)))
+            self.__log.info(f'{action} {desc} in "{self.__url}" - Done (Good: {result.count_of_good}, Bad: {result.count_of_bad})!')
+        elif result.count_of_skipped == 0:
+            self.__log.info(f'No Data {desc} to {action} in "{self.__url}"!')
+        self.__log.flush()
+        return result.finish()
+
+    async def __create(self, part, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__apply('Create', part, data_to_create, chunk_size, 'POST', 201,
+                                  lambda url, data: url,
+                                  lambda chunk: chunk,
+                                  sink, aggregate, progress, journal)
+
+    async def __update(self, part, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__apply('Update', part, data_to_update, chunk_size, 'PATCH', 200,
+                                  lambda url, data: f"{url}{data['id']}/",
+                                  lambda chunk: chunk,
+                                  sink, aggregate, progress, journal)
+
+    async def __delete(self, part, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__apply('Delete', part, data_to_delete, chunk_size, 'DELETE', 204,
+                                  lambda url, data: f"{url}{data['id']}",
+                                  lambda chunk: [{'id': data['id']} for data in chunk],
+                                  sink, aggregate, progress, journal)
+
+    #-------------------------------------------------------------------------------
+
+    async def loadCustomFields(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('custom_fields', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadVMs(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('vms', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadClusterTypes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('cluster_types', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadClusters(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('clusters', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadIPAddresses(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('ip_addresses', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadIPRanges(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('ip_ranges', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadIPPrefixes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('ip_prefixes', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadVlanGroups(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('vlan_groups', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadVlans(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('vlans', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadSites(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('sites', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadLocations(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('locations', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadRacks(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('racks', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadOwners(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('owners', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadManufacturers(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('manufacturers', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadPlatforms(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('platforms', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadDeviceRoles(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('device_roles', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadDeviceTypes(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('device_types', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    async def loadDevices(self, page_size=None, compact=False, brief=None, fields=None, exclude=None, filters=None):
+        return await self.__load('devices', page_size, compact=compact, brief=brief, fields=fields, exclude=exclude, filters=filters)
+
+    #-------------------------------------------------------------------------------
+
+    async def createCustomFields(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('custom_fields', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createVMs(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('vms', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createClusterTypes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('cluster_types', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createClusters(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('clusters', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createIPAddresses(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('ip_addresses', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createIPRanges(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('ip_ranges', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createIPPrefixes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('ip_prefixes', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createVlanGroups(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('vlan_groups', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createVlans(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('vlans', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createSites(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('sites', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createLocations(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('locations', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createRacks(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('racks', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createOwners(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('owners', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createManufacturers(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('manufacturers', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createPlatforms(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('platforms', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createDeviceRoles(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('device_roles', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createDeviceTypes(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('device_types', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    async def createDevices(self, data_to_create, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__create('devices', data_to_create, chunk_size, sink, aggregate, progress, journal)
+
+    #-------------------------------------------------------------------------------
+
+    async def updateCustomFields(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('custom_fields', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateVMs(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('vms', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateClusterTypes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('cluster_types', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateClusters(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('clusters', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateIPAddresses(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('ip_addresses', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateIPRanges(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('ip_ranges', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateIPPrefixes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('ip_prefixes', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateVlanGroups(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('vlan_groups', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateVlans(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('vlans', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateSites(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('sites', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateLocations(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('locations', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateRacks(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('racks', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateOwners(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('owners', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateManufacturers(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('manufacturers', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updatePlatforms(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('platforms', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateDeviceRoles(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('device_roles', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateDeviceTypes(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('device_types', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    async def updateDevices(self, data_to_update, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__update('devices', data_to_update, chunk_size, sink, aggregate, progress, journal)
+
+    #-------------------------------------------------------------------------------
+
+    async def deleteCustomFields(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('custom_fields', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteVMs(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('vms', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteClusterTypes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('cluster_types', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteClusters(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('clusters', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteIPAddresses(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('ip_addresses', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteIPRanges(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('ip_ranges', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteIPPrefixes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('ip_prefixes', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteVlanGroups(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('vlan_groups', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteVlans(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('vlans', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteSites(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('sites', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteLocations(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('locations', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteRacks(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('racks', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteOwners(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('owners', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteManufacturers(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('manufacturers', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deletePlatforms(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('platforms', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteDeviceRoles(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('device_roles', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteDeviceTypes(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('device_types', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    async def deleteDevices(self, data_to_delete, chunk_size=None, sink=None, aggregate=True, progress=None, journal=None):
+        return await self.__delete('devices', data_to_delete, chunk_size, sink, aggregate, progress, journal)
+
+    #-------------------------------------------------------------------------------
+
+    async def __loadDeletedIDs(self, since):
+        result = {}
+        for change in await self.__load('object_changes', params={'action': 'delete', 'time_after': since}):
+            part = lib_netbox.deletedObjectPart(change)
+            if part is not None:
+                result.setdefault(part, set()).add(change.get('changed_object_id'))
+        return result
+
+    def getLastLoadTime(self):
+        return self.__last_load_time
+
+    async def loadData(self, parts=None, snapshot=None, since=None, overlap=60, compact=False, projections=None, filters=None):
+        if parts is None:
+            parts = list(self.__api.keys()) if snapshot is None else [part for part in self.__api if part in snapshot]
+        load_time = datetime.now(timezone.utc)
+        if projections is None:
+            projections = {}
+        if filters is None:
+            filters = {}
+        refs = lib_netbox_records.NetboxReferences() if compact else None
+        deleted_ids = None
+        if snapshot is not None and since is not None:
+            since = lib_netbox.changedSince(since, overlap)
+            deleted_ids = await self.__loadDeletedIDs(since)
+        async def __loadpart(part):
+            if deleted_ids is None or part not in snapshot:
+                return await self.__load(part, compact=compact, refs=refs, filters=filters.get(part), **projections.get(part, {}))
+            changed_data = await self.__load(part, params={'last_updated__gte': since}, filters=filters.get(part), **projections.get(part, {}))
+            merged_data = lib_netbox.mergeChanges(snapshot[part], changed_data, deleted_ids.get(part, set()))
+            return lib_netbox_records.NetboxCompactPart(part, merged_data, refs) if compact else merged_data
+        result = dict(zip(parts, await asyncio.gather(*(__loadpart(part) for part in parts))))
+        self.__last_load_time = load_time.isoformat()
+        return result
+
+    async def uploadData(self, data_to_create=None, data_to_update=None, data_to_delete=None, chunk_size=None,
+                         sink=None, aggregate=True, progress=None, journal=None):
+        if isinstance(sink, str):
+            with lib_netbox_sink.NetboxJSONLinesSink(sink) as shared_sink:
+                return await self.uploadData(data_to_create, data_to_update, data_to_delete, chunk_size, shared_sink, aggregate, progress, journal)
+        if isinstance(journal, str):
+            with lib_netbox_sink.NetboxJournal(journal) as shared_journal:
+                return await self.uploadData(data_to_create, data_to_update, data_to_delete, chunk_size, sink, aggregate, progress, shared_journal)
+        result = {'create': {},
+                  'update': {},
+                  'delete': {}}
+        for action, data in (('create', data_to_create), ('update', data_to_update), ('delete', data_to_delete)):
+            if data is None:
+                data = {}
+            for part in data.keys():
+                if part not in self.__api:
+                    self.__log.warning(f'Unknown part "{part}" in data to {action.title()}, skipped!')
+            parts = [part for part in self.__api if len(data.get(part, [])) > 0]
+            waves = lib_netbox.dependencyWaves(parts, self.__depends)
+            if action == 'delete':
+                waves.reverse()
+            for wave in waves:
+                results = await asyncio.gather(*(getattr(self, f'{action}{self.__api[part]['method']}')(data[part], chunk_size, sink, aggregate, progress, journal) for part in wave))
+                result[action].update(zip(wave, results))
+        return result
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
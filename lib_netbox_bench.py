@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Benchmarks
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_netbox
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+ENDPOINTS = {part: (api['url_part'], api['object_type']) for part, api in lib_netbox.NETBOX_API.items()}
+
+OBJECT_CHANGES = lib_netbox.NETBOX_API_INTERNAL['object_changes']['url_part']
+
+SCENARIOS = ('load', 'load_serial', 'create', 'update', 'delete')
+
+#-------------------------------------------------------------------------------
+
+def datasetSizes(size):
+    large, medium, small = size, max(1, size // 10), max(1, size // 100)
+    return {'custom_fields': small,  'vms':          large,  'cluster_types': small,  'clusters':      medium,
+            'ip_addresses':  large,  'ip_ranges':    medium, 'ip_prefixes':   medium, 'vlan_groups':   small,
+            'vlans':         medium, 'sites':        small,  'locations':     small,  'racks':         medium,
+            'owners':        medium, 'manufacturers': small, 'platforms':     small,  'device_roles':  small,
+            'device_types':  small,  'devices':      large}
+
+def syntheticObject(part, i, sizes):
+    def __ref(ref_part, index):
+        index = index % sizes[ref_part] + 1
+        return {'id': index, 'url': f'/api/{ENDPOINTS[ref_part][0]}/{index}/', 'display': f'{ref_part}-{index}', 'name': f'{ref_part}-{index}'}
+    status = {'value': 'active', 'label': 'Active'}
+    octets = f'{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}'
+    result = {'name': f'{part}-{i+1}', 'slug': f'{part.replace('_', '-')}-{i+1}', 'description': f'Synthetic {part} object {i+1}'}
+    if part == 'custom_fields':
+        result.update({'type': {'value': 'text', 'label': 'Text'}, 'object_types': ['dcim.device', 'virtualization.virtualmachine']})
+    elif part == 'clusters':
+        result.update({'type': __ref('cluster_types', i), 'status': status, 'site': __ref('sites', i)})
+    elif part == 'vms':
+        result.update({'cluster': __ref('clusters', i), 'status': status, 'vcpus': 4, 'memory': 8192, 'custom_fields': {'owner': None}})
+    elif part == 'ip_addresses':
+        result = {'address': f'10.{octets}/16', 'status': status, 'dns_name': f'host-{i+1}.example.com',
+                  'assigned_object_type': 'virtualization.vminterface', 'assigned_object_id': i + 1, 'custom_fields': {}}
+    elif part == 'ip_ranges':
+        result = {'start_address': f'172.16.{i & 255}.1/24', 'end_address': f'172.16.{i & 255}.100/24', 'status': status, 'size': 100}
+    elif part == 'ip_prefixes':
+        result = {'prefix': f'10.{(i >> 8) & 255}.{i & 255}.0/24', 'status': status, 'site': __ref('sites', i), 'vlan': __ref('vlans', i)}
+    elif part == 'vlans':
+        result.update({'vid': i % 4094 + 1, 'group': __ref('vlan_groups', i), 'status': status})
+    elif part == 'locations':
+        result.update({'site': __ref('sites', i)})
+    elif part == 'racks':
+        result.update({'site': __ref('sites', i), 'location': __ref('locations', i), 'u_height': 42})
+    elif part == 'platforms':
+        result.update({'manufacturer': __ref('manufacturers', i)})
+    elif part == 'device_types':
+        result = {'model': f'Model {i+1}', 'slug': f'model-{i+1}', 'manufacturer': __ref('manufacturers', i), 'u_height': 1}
+    elif part == 'devices':
+        result.update({'site': __ref('sites', i), 'rack': __ref('racks', i), 'role': __ref('device_roles', i),
+                       'device_type': __ref('device_types', i), 'platform': __ref('platforms', i), 'status': status,
+                       'custom_fields': {'owner': None}})
+    return result
+
+#-------------------------------------------------------------------------------
+
+class FakeNetboxServer:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, size=1000, sizes=None, latency=0.0, error_rate=0.0, max_page_size=1000, seed=1):
+        self.sizes = datasetSizes(size)
+        if sizes is not None:
+            self.sizes.update(sizes)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_page_size = max_page_size
+        self.random = random.Random(seed)
+        self.tables = {url_part: {} for url_part, object_type in ENDPOINTS.values()}
+        self.tables[OBJECT_CHANGES] = {}
+        self.next_id = {url_part: 1 for url_part in self.tables}
+        self.injected = []
+        self.lock = threading.Lock()
+        stamp = time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())
+        for part, (url_part, object_type) in ENDPOINTS.items():
+            for i in range(self.sizes[part]):
+                self.addObject(url_part, syntheticObject(part, i, self.sizes), stamp)
+        self.__server = None
+        self.__thread = None
+
+    #-------------------------------------------------------------------------------
+
+    def addObject(self, url_part, data, stamp=None):
+        with self.lock:
+            object_id = self.next_id[url_part]
+            self.next_id[url_part] += 1
+        result = dict(data)
+        result['id'] = object_id
+        result['url'] = f'/api/{url_part}/{object_id}/'
+        result['display'] = str(data.get('name', data.get('address', data.get('prefix', data.get('model', object_id)))))
+        result['created'] = result['last_updated'] = stamp if stamp is not None else time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())
+        self.tables[url_part][object_id] = result
+        return result
+
+    def deleteObject(self, url_part, object_id):
+        del self.tables[url_part][object_id]
+        object_type = next(object_type for value, object_type in ENDPOINTS.values() if value == url_part)
+        self.addObject(OBJECT_CHANGES, {'action': {'value': 'delete', 'label': 'Deleted'}, 'changed_object_type': object_type,
+                                        'changed_object_id': object_id, 'time': time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())})
+
+    def injectErrors(self, code, count=1, method=None, headers=None):
+        # answered in order before the random error_rate, method None matches any request
+        with self.lock:
+            self.injected.extend([(method, code, headers)] * count)
+
+    def nextError(self, method):
+        with self.lock:
+            for i, (error_method, code, headers) in enumerate(self.injected):
+                if error_method is None or error_method == method:
+                    del self.injected[i]
+                    return code, headers
+        return None
+
+    #-------------------------------------------------------------------------------
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.__server.server_address[1]}/api'
+
+    def start(self, port=0):
+        self.__server = ThreadingHTTPServer(('127.0.0.1', port), _FakeNetboxHandler, bind_and_activate=False)
+        self.__server.request_queue_size = 1024
+        self.__server.server_bind()
+        self.__server.server_activate()
+        self.__server.daemon_threads = True
+        self.__server.fake = self
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def writeConfig(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'url': self.url, 'apikey': '0' * 40}, f)
+
+#-------------------------------------------------------------------------------
+
+class _FakeNetboxHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    #-------------------------------------------------------------------------------
+
+    def log_message(self, format, *args):
+        pass
+
+    def __send(self, code, data=None, headers=None):
+        body = b'' if data is None else json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        if len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, 1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def __prepare(self):
+        fake = self.server.fake
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length)) if length > 0 else None
+        if fake.latency > 0:
+            time.sleep(fake.latency)
+        injected = fake.nextError(self.command)
+        if injected is not None:
+            self.__send(injected[0], {'detail': 'Injected error.'}, injected[1])
+            return None
+        if fake.error_rate > 0 and fake.random.random() < fake.error_rate:
+            self.__send(503, {'detail': 'Injected error.'}, {'Retry-After': '0'})
+            return None
+        split = urlsplit(self.path)
+        match = re.match(r'^/api/?(.*?)/?(?:/(\d+))?/?$', split.path)
+        url_part, object_id = match.group(1), int(match.group(2)) if match.group(2) else None
+        if url_part != '' and url_part not in fake.tables:
+            self.__send(404, {'detail': 'Not found.'})
+            return None
+        return fake, url_part, object_id, parse_qs(split.query), body
+
+    #-------------------------------------------------------------------------------
+
+    def do_GET(self):
+        prepared = self.__prepare()
+        if prepared is None:
+            return
+        fake, url_part, object_id, query, body = prepared
+        if url_part == '':
+            return self.__send(200, {app: f'/api/{app}/' for app in sorted({url_part.split('/')[0] for url_part in fake.tables})})
+        table = fake.tables[url_part]
+        if object_id is not None:
+            return self.__send(200, table[object_id]) if object_id in table else self.__send(404, {'detail': 'Not found.'})
+        limit = int(query.pop('limit', ['50'])[0])
+        offset = int(query.pop('offset', ['0'])[0])
+        limit = fake.max_page_size if limit == 0 else min(limit, fake.max_page_size)
+        items = list(table.values())
+        for key, values in query.items():
+            if key in ('brief', 'fields', 'exclude', 'omit', 'ordering'):
+                continue
+            if key.endswith('__gte') or key == 'time_after':
+                field = 'time' if key == 'time_after' else key[:-5]
+                items = [item for item in items if str(item.get(field, '')) >= values[0]]
+            else:
+                items = [item for item in items if str(item[key].get('id', item[key].get('value')) if isinstance(item.get(key), dict) else item.get(key)) in values]
+        page = items[offset:offset+limit]
+        projection = {'brief':   query.get('brief', [''])[0] in ('1', 'true', 'True'),
+                      'fields':  [field for value in query.get('fields', []) for field in value.split(',')],
+                      'exclude': [field for key in ('exclude', 'omit') for value in query.get(key, []) for field in value.split(',')]}
+        if any(projection.values()):
+            page = [lib_netbox.projectItem(item, projection) for item in page]
+        next_url = None
+        if offset + limit < len(items):
+            next_url = f'http://{self.headers['Host']}/api/{url_part}/?{urlencode({'limit': limit, 'offset': offset + limit, **query}, doseq=True)}'
+        self.__send(200, {'count': len(items), 'next': next_url, 'previous': None, 'results': page})
+
+    def do_POST(self):
+        prepared = self.__prepare()
+        if prepared is None:
+            return
+        fake, url_part, object_id, query, body = prepared
+        items = body if isinstance(body, list) else [body]
+        errors = [{} if isinstance(item, dict) and len(item) > 0 else {'detail': 'Empty object.'} for item in items]
+        if any(len(error) > 0 for error in errors):
+            return self.__send(400, errors if isinstance(body, list) else errors[0])
+        created = [fake.addObject(url_part, item) for item in items]
+        self.__send(201, created if isinstance(body, list) else created[0])
+
+    def do_PATCH(self):
+        prepared = self.__prepare()
+        if prepared is None:
+            return
+        fake, url_part, object_id, query, body = prepared
+        table = fake.tables[url_part]
+        items = body if isinstance(body, list) else [dict(body, id=object_id)]
+        if any(item.get('id') not in table for item in items):
+            return self.__send(400 if isinstance(body, list) else 404, {'detail': 'Not found.'})
+        stamp = time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())
+        updated = []
+        for item in items:
+            table[item['id']].update(item)
+            table[item['id']]['last_updated'] = stamp
+            updated.append(table[item['id']])
+        self.__send(200, updated if isinstance(body, list) else updated[0])
+
+    def do_DELETE(self):
+        prepared = self.__prepare()
+        if prepared is None:
+            return
+        fake, url_part, object_id, query, body = prepared
+        table = fake.tables[url_part]
+        ids = [item['id'] for item in body] if isinstance(body, list) else [object_id]
+        if any(item not in table for item in ids):
+            return self.__send(404, {'detail': 'Not found.'})
+        for item in ids:
+            fake.deleteObject(url_part, item)
+        self.__send(204)
+
+#-------------------------------------------------------------------------------
+
+def _serve(options, queue, stop_event):
+    server = FakeNetboxServer(**options).start()
+    queue.put(server.url)
+    stop_event.wait()
+    server.stop()
+
+def _percentile(values, quantile):
+    if len(values) == 0:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(quantile * len(values)))]
+
+def runScenario(scenario, config_file, size=1000, page_size=1000, chunk_size=None, max_workers=8, trace_memory=True):
+    netbox = lib_netbox.NetboxAPI(config_file, page_size=page_size, max_workers=max_workers, log_mode='quiet')
+    latencies = []
+    netbox.getMetrics().addSpanCallback(lambda span: latencies.append(span['latency']))
+    if scenario in ('update', 'delete'):
+        objects = netbox.loadDevices() if scenario == 'update' else netbox.loadIPAddresses()
+    latencies.clear()
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    if scenario == 'load':
+        result = netbox.loadData(max_workers=max_workers)
+        count = sum(len(items) for items in result.values())
+    elif scenario == 'load_serial':
+        result = netbox.loadData(max_workers=1)
+        count = sum(len(items) for items in result.values())
+    elif scenario == 'create':
+        result = netbox.createSites([{'name': f'bench-site-{i+1}', 'slug': f'bench-site-{i+1}', 'status': 'active'} for i in range(size)], chunk_size)
+        count = len(result['list_of_good'])
+    elif scenario == 'update':
+        result = netbox.updateDevices([{'id': item['id'], 'name': item['name'], 'description': 'Updated by benchmark'} for item in objects], chunk_size)
+        count = len(result['list_of_good'])
+    elif scenario == 'delete':
+        result = netbox.deleteIPAddresses([{'id': item['id'], 'address': item['address']} for item in objects], chunk_size)
+        count = len(result['list_of_good'])
+    else:
+        raise ValueError(f'Unknown scenario "{scenario}", expected one of: {', '.join(SCENARIOS)}!')
+    seconds = time.perf_counter() - start_time
+    peak_memory = None
+    if trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'scenario':           scenario,
+            'objects':            count,
+            'seconds':            round(seconds, 3),
+            'objects_per_second': round(count / seconds, 1) if seconds > 0 else None,
+            'requests':           len(latencies),
+            'p50_ms':             None if len(latencies) == 0 else round(_percentile(latencies, 0.5) * 1000, 2),
+            'p99_ms':             None if len(latencies) == 0 else round(_percentile(latencies, 0.99) * 1000, 2),
+            'peak_memory_mb':     None if peak_memory is None else round(peak_memory / 2 ** 20, 1)}
+
+def _startServer(options):
+    # the fake server runs in its own process so it neither shares the GIL nor shows up in peak memory
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    stop_event = context.Event()
+    process = context.Process(target=_serve, args=(options, queue, stop_event), daemon=True)
+    process.start()
+    url = queue.get(timeout=600)
+    config_file = os.path.join(tempfile.mkdtemp(prefix='netbox_bench_'), 'config.json')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'apikey': '0' * 40}, f)
+    return process, stop_event, config_file
+
+def _stopServer(process, stop_event, config_file):
+    stop_event.set()
+    process.join(10)
+    os.remove(config_file)
+    os.rmdir(os.path.dirname(config_file))
+
+def runBenchmarks(scenarios=SCENARIOS, size=1000, latency=0.0, error_rate=0.0, page_size=1000, chunk_size=None, max_workers=8, trace_memory=True):
+    process, stop_event, config_file = _startServer({'size': size, 'latency': latency, 'error_rate': error_rate})
+    result = []
+    try:
+        for scenario in scenarios:
+            result.append(runScenario(scenario, config_file, size, page_size, chunk_size, max_workers, trace_memory))
+    finally:
+        _stopServer(process, stop_event, config_file)
+    return result
+
+#-------------------------------------------------------------------------------
+
+def importTime(module, runs=10):
+    # every run is a fresh interpreter, the best run is the least disturbed by the rest of the machine
+    code = f'import time; start_time = time.perf_counter(); import {module}; print(time.perf_counter() - start_time)'
+    timings = []
+    for i in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+def runStartupBenchmarks(latency=0.0, runs=10):
+    result = [{'step': f'import {module}', 'ms': round(importTime(module, runs) * 1000, 2)} for module in ('lib_nspylib', 'lib_netbox')]
+    process, stop_event, config_file = _startServer({'size': 10, 'latency': latency})
+    try:
+        for step, options in (('NetboxAPI() with probe', {}),
+                              ('NetboxAPI(lazy_connect=True)', {'lazy_connect': True}),
+                              ('NetboxAPI(probe=False)', {'probe': False})):
+            timings = []
+            for i in range(runs):
+                start_time = time.perf_counter()
+                lib_netbox.NetboxAPI(config_file, log_mode='quiet', **options)
+                timings.append(time.perf_counter() - start_time)
+            result.append({'step': step, 'ms': round(min(timings) * 1000, 2)})
+    finally:
+        _stopServer(process, stop_event, config_file)
+    return result
+
+#-------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark NetboxAPI against a local fake NetBox server.')
+    parser.add_argument('scenarios', nargs='*', metavar='scenario', help=f'scenarios to run: {', '.join(SCENARIOS)} (default: all)')
+    parser.add_argument('--size', type=int, default=1000, help='objects in the largest parts of the synthetic dataset')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency per request, seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 503')
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--max-workers', type=int, default=8)
+    parser.add_argument('--no-memory', action='store_true', help='do not trace peak memory (tracing slows the run down)')
+    parser.add_argument('--json', default=None, help='write results to this file to compare versions')
+    parser.add_argument('--startup', action='store_true', help='measure import and constructor time instead of the scenarios')
+    parser.add_argument('--runs', type=int, default=10, help='repetitions of every startup step, the best one is reported')
+    args = parser.parse_args()
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f'unknown scenario "{scenario}"')
+
+    if args.startup:
+        result = runStartupBenchmarks(args.latency, args.runs)
+        print(f'{'step':<32} {'ms':>10}')
+        for row in result:
+            print(f'{row['step']:<32} {row['ms']:>10}')
+        if args.json is not None:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'options': vars(args), 'results': result}, f, indent=4)
+        return
+
+    result = runBenchmarks(args.scenarios or SCENARIOS, args.size, args.latency, args.error_rate, args.page_size, args.chunk_size, args.max_workers, not args.no_memory)
+    columns = ('scenario', 'objects', 'seconds', 'objects_per_second', 'requests', 'p50_ms', 'p99_ms', 'peak_memory_mb')
+    print(' '.join(f'{column:>18}' for column in columns))
+    for row in result:
+        print(' '.join(f'{str(row[column]):>18}' for column in columns))
+    if args.json is not None:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'results': result}, f, indent=4)
+
+if __name__ == '__main__':
+    main()
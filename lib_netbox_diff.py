@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Diff
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import lib_netbox
+import hashlib
+
+from collections.abc import Mapping
+
+NATURAL_KEYS = {'custom_fields': ('name',),
+                'vms':           ('name', 'cluster'),
+                'cluster_types': ('slug',),
+                'clusters':      ('name',),
+                'ip_addresses':  ('address', 'vrf'),
+                'ip_ranges':     ('start_address', 'end_address', 'vrf'),
+                'ip_prefixes':   ('prefix', 'vrf'),
+                'vlan_groups':   ('slug',),
+                'vlans':         ('vid', 'group'),
+                'sites':         ('slug',),
+                'locations':     ('slug', 'site'),
+                'racks':         ('name', 'location'),
+                'owners':        ('name',),
+                'manufacturers': ('slug',),
+                'platforms':     ('slug',),
+                'device_roles':  ('slug',),
+                'device_types':  ('slug', 'manufacturer'),
+                'devices':       ('name', 'site')}
+
+NAME_FIELDS = ('name', 'address', 'display', 'model', 'description')
+
+# isinstance() against the abstract Mapping is slow, plain values are sorted out by type first
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+#-------------------------------------------------------------------------------
+
+def _keyValue(value):
+    if type(value) in _SCALAR_TYPES:
+        return value
+    if isinstance(value, Mapping):
+        if 'id' in value:
+            return value['id']
+        if 'value' in value:
+            return value['value']
+        return tuple(sorted((key, _keyValue(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_keyValue(item) for item in value)
+    return value
+
+def naturalKey(item, key_fields):
+    key = []
+    for field in key_fields:
+        value = item.get(field)
+        key.append(value if type(value) in _SCALAR_TYPES else _keyValue(value))
+    return tuple(key)
+
+def canonicalValue(value, shape=None):
+    # NetBox answers with nested objects where the desired state usually holds an id or a choice value
+    if type(value) in _SCALAR_TYPES:
+        return value
+    if type(value) is dict or isinstance(value, Mapping):
+        if isinstance(shape, Mapping) and 'id' not in shape:
+            return {key: canonicalValue(value.get(key), shape[key]) for key in shape}
+        if 'id' in value:
+            return value['id']
+        if 'value' in value and 'label' in value:
+            return value['value']
+        return {key: canonicalValue(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        item_shape = shape[0] if isinstance(shape, (list, tuple)) and len(shape) > 0 else None
+        items = [canonicalValue(item, item_shape) for item in value]
+        # tags and other many-to-many fields come back in any order
+        if all(type(item) is int for item in items) or all(type(item) is str for item in items):
+            return sorted(items)
+        return sorted(items, key=lambda item: mylib.jsonDumpsBytes(item, sort_keys=True))
+    return value
+
+def canonicalItem(item, fields, shape=None):
+    result = {}
+    for field in fields:
+        value = item.get(field)
+        result[field] = value if type(value) in _SCALAR_TYPES else canonicalValue(value, None if shape is None else shape.get(field))
+    return result
+
+def _nameOf(item):
+    # keeps the name the create/update/delete methods show in their logs
+    field = next((field for field in NAME_FIELDS if field in item.keys()), None)
+    return {} if field is None else {field: item[field]}
+
+def contentHash(canonical_item):
+    return hashlib.blake2b(mylib.jsonDumpsBytes(canonical_item, sort_keys=True), digest_size=16).digest()
+
+#-------------------------------------------------------------------------------
+
+def diffPart(part, desired, current, fields=None, key_fields=None, delete=True):
+    if key_fields is None:
+        key_fields = NATURAL_KEYS[part]
+    to_create = []
+    to_update = []
+    to_delete = []
+
+    by_key = {}
+    by_id = {}
+    duplicate_ids = set()
+    for item in current:
+        key = naturalKey(item, key_fields)
+        if key in by_key:
+            duplicate_ids.update((by_key[key]['id'], item['id']))
+        else:
+            by_key[key] = item
+        by_id[item['id']] = item
+
+    matched_ids = set()
+    seen_keys = set()
+    for item in desired:
+        if item.get('id') is not None:
+            current_item = by_id.get(item['id'])
+            key = None
+        else:
+            key = naturalKey(item, key_fields)
+            if key in seen_keys:
+                # two desired objects for one key cannot both be applied, choosing one silently would hide the other
+                raise ValueError(f'Desired "{part}" has more than one object with key {dict(zip(key_fields, key))}!')
+            seen_keys.add(key)
+            current_item = by_key.get(key)
+        if current_item is None:
+            to_create.append({field: value for field, value in item.items() if field != 'id'})
+            continue
+        matched_ids.add(current_item['id'])
+        managed = [field for field in item.keys() if field != 'id'] if fields is None else [field for field in fields if field in item.keys()]
+        desired_canonical = canonicalItem(item, managed)
+        current_canonical = canonicalItem(current_item, managed, item)
+        if contentHash(desired_canonical) == contentHash(current_canonical):
+            continue
+        update = {'id': current_item['id']}
+        update.update(_nameOf(item))
+        update.update({field: item[field] for field in managed if desired_canonical[field] != current_canonical[field]})
+        to_update.append(update)
+
+    if delete:
+        for item in current:
+            # objects that share a natural key are ambiguous, they are never deleted
+            if item['id'] in matched_ids or item['id'] in duplicate_ids:
+                continue
+            to_delete.append({'id': item['id'], **_nameOf(item)})
+    return to_create, to_update, to_delete
+
+def diffData(desired, current, fields=None, key_fields=None, delete=True):
+    if fields is None:
+        fields = {}
+    if key_fields is None:
+        key_fields = {}
+    result = {'create': {},
+              'update': {},
+              'delete': {}}
+    for part in lib_netbox.NETBOX_API:
+        if part not in desired:
+            continue
+        to_create, to_update, to_delete = diffPart(part, desired[part], current.get(part, []), fields.get(part), key_fields.get(part), delete)
+        for action, items in (('create', to_create), ('update', to_update), ('delete', to_delete)):
+            if len(items) > 0:
+                result[action][part] = items
+    return result
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
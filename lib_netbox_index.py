@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Inventory Index
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import ipaddress
+import heapq
+
+from bisect import bisect_left, bisect_right
+
+#-------------------------------------------------------------------------------
+
+class NetboxInventoryIndex:
+    __key_fields = ('name', 'slug', 'address')
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, data=None):
+        self.__objects = {}
+        self.__keys = {}
+        self.__refs = {}
+        self.__forward = {}
+        if data is not None:
+            for part, items in data.items():
+                self.addObjects(part, items)
+
+    #-------------------------------------------------------------------------------
+
+    def __keysOf(self, part, data):
+        for field in self.__key_fields:
+            if field == 'address':
+                value = data.get('address', data.get('prefix', data.get('start_address')))
+            else:
+                value = data.get(field)
+            if isinstance(value, str):
+                yield (field, value)
+                if field == 'address' and '/' in value:
+                    yield (field, value.split('/')[0])
+
+    def __refsOf(self, part, data):
+        for field in data.keys():
+            value = data[field]
+            if isinstance(value, dict) and isinstance(value.get('id'), int):
+                yield (field, value['id'])
+                for subfield, subvalue in value.items():
+                    if isinstance(subvalue, dict) and isinstance(subvalue.get('id'), int):
+                        yield (f'{field}.{subfield}', subvalue['id'])
+                        if field == 'assigned_object':
+                            yield (subfield, subvalue['id'])
+            elif isinstance(value, list):
+                for subvalue in value:
+                    if isinstance(subvalue, dict) and isinstance(subvalue.get('id'), int):
+                        yield (field, subvalue['id'])
+
+    #-------------------------------------------------------------------------------
+
+    def addObject(self, part, data):
+        object_id = data.get('id')
+        if object_id is None:
+            return
+        if object_id in self.__objects.get(part, {}):
+            self.removeObject(part, object_id)
+        self.__objects.setdefault(part, {})[object_id] = data
+        forward = []
+        for field, value in self.__keysOf(part, data):
+            self.__keys.setdefault((part, field), {}).setdefault(value, {})[object_id] = None
+            forward.append(('key', field, value))
+        for field, ref_id in self.__refsOf(part, data):
+            self.__refs.setdefault((part, field), {}).setdefault(ref_id, {})[object_id] = None
+            forward.append(('ref', field, ref_id))
+        self.__forward[(part, object_id)] = forward
+
+    def addObjects(self, part, items):
+        for data in items:
+            self.addObject(part, data)
+
+    def removeObject(self, part, object_id):
+        data = self.__objects.get(part, {}).pop(object_id, None)
+        for kind, field, value in self.__forward.pop((part, object_id), []):
+            table = self.__keys if kind == 'key' else self.__refs
+            ids = table.get((part, field), {}).get(value)
+            if ids is not None:
+                ids.pop(object_id, None)
+                if len(ids) == 0:
+                    del table[(part, field)][value]
+        return data
+
+    def updateObject(self, part, data):
+        old_data = self.getById(part, data.get('id'))
+        if old_data is None:
+            return
+        new_data = dict(old_data.toDict() if hasattr(old_data, 'toDict') else old_data)
+        for field, value in data.items():
+            old_value = new_data.get(field)
+            if isinstance(old_value, dict) and 'id' in old_value and isinstance(value, int):
+                value = {'id': value}
+            elif isinstance(old_value, list) and isinstance(value, list) and all(isinstance(item, int) for item in value):
+                value = [{'id': item} for item in value]
+            new_data[field] = value
+        self.addObject(part, new_data)
+
+    #-------------------------------------------------------------------------------
+
+    def applyResult(self, part, action, data, result):
+        # names are not unique, the index follows the ids the collector saw succeed
+        key = 'list_of_created' if action == 'create' else 'list_of_good_ids'
+        if key not in result:
+            raise ValueError(f'Result of {action} "{part}" has no "{key}", the call must run with aggregate=True!')
+        if action == 'create':
+            self.addObjects(part, result[key])
+            return
+        if isinstance(data, dict):
+            data = [data]
+        good_ids = set(result[key])
+        for item in data:
+            if item.get('id') not in good_ids:
+                continue
+            if action == 'update':
+                self.updateObject(part, item)
+            elif action == 'delete':
+                self.removeObject(part, item['id'])
+
+    def applyUpload(self, data_to_create, data_to_update, data_to_delete, result):
+        for action, data in (('create', data_to_create), ('update', data_to_update), ('delete', data_to_delete)):
+            for part, part_result in result.get(action, {}).items():
+                self.applyResult(part, action, (data or {}).get(part, []), part_result)
+
+    #-------------------------------------------------------------------------------
+
+    def parts(self):
+        return list(self.__objects.keys())
+
+    def countOf(self, part):
+        return len(self.__objects.get(part, {}))
+
+    def getById(self, part, object_id):
+        return self.__objects.get(part, {}).get(object_id)
+
+    def __find(self, part, field, value):
+        objects = self.__objects.get(part, {})
+        return [objects[object_id] for object_id in self.__keys.get((part, field), {}).get(value, {})]
+
+    def findByName(self, part, name):
+        return self.__find(part, 'name', name)
+
+    def findBySlug(self, part, slug):
+        return self.__find(part, 'slug', slug)
+
+    def findByAddress(self, part, address):
+        return self.__find(part, 'address', address)
+
+    def findByRef(self, part, field, ref_id):
+        objects = self.__objects.get(part, {})
+        return [objects[object_id] for object_id in self.__refs.get((part, field), {}).get(ref_id, {})]
+
+    #-------------------------------------------------------------------------------
+
+    def locationsOfSite(self, site_id):
+        return self.findByRef('locations', 'site', site_id)
+
+    def racksOfSite(self, site_id):
+        return self.findByRef('racks', 'site', site_id)
+
+    def racksOfLocation(self, location_id):
+        return self.findByRef('racks', 'location', location_id)
+
+    def devicesOfSite(self, site_id):
+        return self.findByRef('devices', 'site', site_id)
+
+    def devicesOfRack(self, rack_id):
+        return self.findByRef('devices', 'rack', rack_id)
+
+    def devicesOfType(self, device_type_id):
+        return self.findByRef('devices', 'device_type', device_type_id)
+
+    def vmsOfCluster(self, cluster_id):
+        return self.findByRef('vms', 'cluster', cluster_id)
+
+    def ipsOfVM(self, vm_id):
+        return self.findByRef('ip_addresses', 'virtual_machine', vm_id)
+
+    def ipsOfDevice(self, device_id):
+        return self.findByRef('ip_addresses', 'device', device_id)
+
+    def vlansOfGroup(self, vlan_group_id):
+        return self.findByRef('vlans', 'group', vlan_group_id)
+
+#-------------------------------------------------------------------------------
+
+def _vrfId(data):
+    vrf = data.get('vrf')
+    return vrf.get('id') if isinstance(vrf, dict) else vrf
+
+def _ipVersion(address):
+    return 6 if ':' in address else 4
+
+def _parseNetwork(prefix):
+    address, _, length = prefix.partition('/')
+    version = _ipVersion(address)
+    bits = 32 if version == 4 else 128
+    length = int(length) if length else bits
+    start = mylib.ipToInt(address) >> (bits - length) << (bits - length)
+    return version, start, start + (1 << (bits - length)) - 1, length
+
+def _parseAddress(address):
+    # the mask of an IP address ("10.0.5.7/16") is the size of its network, not part of the lookup
+    address = address.partition('/')[0]
+    return _ipVersion(address), mylib.ipToInt(address)
+
+def _intToIP(value, version):
+    return str(ipaddress.IPv4Address(value) if version == 4 else ipaddress.IPv6Address(value))
+
+#-------------------------------------------------------------------------------
+
+class _IntervalTree:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, items):
+        # centered interval tree over (start, end, data): a point query visits one node per level
+        # and only touches the ranges it returns
+        self.__nodes = []
+        self.__root = self.__build(sorted(items, key=lambda item: item[0]))
+
+    def __build(self, items):
+        if len(items) == 0:
+            return -1
+        center = items[len(items) // 2][0]
+        left, here, right = [], [], []
+        for item in items:
+            if item[1] < center:
+                left.append(item)
+            elif item[0] > center:
+                right.append(item)
+            else:
+                here.append(item)
+        by_end = sorted(here, key=lambda item: item[1])
+        node = len(self.__nodes)
+        self.__nodes.append([center, [item[0] for item in here], here, [item[1] for item in by_end], by_end, -1, -1])
+        self.__nodes[node][5] = self.__build(left)
+        self.__nodes[node][6] = self.__build(right)
+        return node
+
+    #-------------------------------------------------------------------------------
+
+    def containing(self, value):
+        result = []
+        node = self.__root
+        while node >= 0:
+            center, starts, by_start, ends, by_end, left, right = self.__nodes[node]
+            if value < center:
+                result.extend(by_start[:bisect_right(starts, value)])
+                node = left
+            else:
+                result.extend(by_end[bisect_left(ends, value):])
+                node = right if value > center else -1
+        result.sort(key=lambda item: item[0])
+        return result
+
+#-------------------------------------------------------------------------------
+
+class NetboxIPAMIndex:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, data=None, prefixes=None, ranges=None, addresses=None):
+        if data is not None:
+            prefixes = data.get('ip_prefixes', []) if prefixes is None else prefixes
+            ranges = data.get('ip_ranges', []) if ranges is None else ranges
+            addresses = data.get('ip_addresses', []) if addresses is None else addresses
+        self.__prefixes = {}
+        self.__prefix_lengths = {}
+        self.__prefix_starts = {}
+        self.__range_trees = {}
+        self.__range_merged = {}
+        self.__address_ints = {}
+        self.__address_objects = {}
+
+        prefix_list = {}
+        for data in prefixes or []:
+            version, start, end, length = _parseNetwork(data['prefix'])
+            scope = (_vrfId(data), version)
+            self.__prefixes.setdefault(scope, {}).setdefault(length, {}).setdefault(start, []).append(data)
+            prefix_list.setdefault(scope, []).append((start, length, end, data))
+        for scope, items in prefix_list.items():
+            items.sort(key=lambda item: (item[0], item[1]))
+            self.__prefix_starts[scope] = ([item[0] for item in items], items)
+            self.__prefix_lengths[scope] = sorted(self.__prefixes[scope].keys(), reverse=True)
+
+        range_list = {}
+        for data in ranges or []:
+            version = _ipVersion(data['start_address'])
+            scope = (_vrfId(data), version)
+            range_list.setdefault(scope, []).append((mylib.ipToInt(data['start_address']), mylib.ipToInt(data['end_address']), data))
+        for scope, items in range_list.items():
+            self.__range_trees[scope] = _IntervalTree(items)
+            # the union of the ranges as sorted, disjoint intervals for the free address search
+            starts, ends = [], []
+            for start, end, data in sorted(items, key=lambda item: item[0]):
+                if len(ends) > 0 and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self.__range_merged[scope] = (starts, ends)
+
+        address_list = {}
+        for data in addresses or []:
+            version = _ipVersion(data['address'])
+            scope = (_vrfId(data), version)
+            address_list.setdefault(scope, []).append((mylib.ipToInt(data['address']), data))
+        for scope, items in address_list.items():
+            items.sort(key=lambda item: item[0])
+            self.__address_ints[scope] = [item[0] for item in items]
+            self.__address_objects[scope] = [item[1] for item in items]
+
+    #-------------------------------------------------------------------------------
+
+    def prefixesContaining(self, address, vrf=None):
+        version, value = _parseAddress(address)
+        scope = (vrf, version)
+        bits = 32 if version == 4 else 128
+        result = []
+        for prefix_length in self.__prefix_lengths.get(scope, []):
+            network = value >> (bits - prefix_length) << (bits - prefix_length)
+            result.extend(self.__prefixes[scope][prefix_length].get(network, []))
+        return result
+
+    def longestPrefixMatch(self, address, vrf=None):
+        version, value = _parseAddress(address)
+        scope = (vrf, version)
+        bits = 32 if version == 4 else 128
+        for prefix_length in self.__prefix_lengths.get(scope, []):
+            network = value >> (bits - prefix_length) << (bits - prefix_length)
+            found = self.__prefixes[scope][prefix_length].get(network)
+            if found:
+                return found[0]
+        return None
+
+    def childPrefixes(self, prefix, vrf=None, direct=False):
+        version, start, end, length = _parseNetwork(prefix)
+        starts, items = self.__prefix_starts.get((vrf, version), ([], []))
+        result, parents = [], []
+        for i in range(bisect_left(starts, start), bisect_right(starts, end)):
+            child_start, child_length, child_end, data = items[i]
+            if child_length <= length:
+                continue
+            if direct:
+                while len(parents) > 0 and parents[-1] < child_start:
+                    parents.pop()
+                if len(parents) > 0:
+                    continue
+                parents.append(child_end)
+            result.append(data)
+        return result
+
+    def rangesContaining(self, address, vrf=None):
+        version, value = _parseAddress(address)
+        tree = self.__range_trees.get((vrf, version))
+        return [] if tree is None else [item[2] for item in tree.containing(value)]
+
+    def addressesInPrefix(self, prefix, vrf=None):
+        version, start, end, length = _parseNetwork(prefix)
+        scope = (vrf, version)
+        ints = self.__address_ints.get(scope, [])
+        return self.__address_objects.get(scope, [])[bisect_left(ints, start):bisect_right(ints, end)]
+
+    def __usedIntervals(self, scope, first, last, exclude_ranges):
+        ints = self.__address_ints.get(scope, [])
+        addresses = ((value, value) for value in ints[bisect_left(ints, first):bisect_right(ints, last)])
+        if not exclude_ranges:
+            return addresses
+        starts, ends = self.__range_merged.get(scope, ([], []))
+        ranges = ((starts[i], ends[i]) for i in range(bisect_left(ends, first), bisect_right(starts, last)))
+        return heapq.merge(addresses, ranges)
+
+    def nextFreeAddresses(self, prefix, count=1, vrf=None, exclude_ranges=False, is_pool=None):
+        version, start, end, length = _parseNetwork(prefix)
+        bits = 32 if version == 4 else 128
+        if is_pool is None:
+            found = self.__prefixes.get((vrf, version), {}).get(length, {}).get(start, [])
+            is_pool = len(found) > 0 and bool(found[0].get('is_pool'))
+        first, last = start, end
+        if version == 4 and length < 31 and not is_pool:
+            first, last = start + 1, end - 1
+        elif version == 6 and length < 127 and not is_pool:
+            first = start + 1
+        result = []
+        candidate = first
+        for used_start, used_end in self.__usedIntervals((vrf, version), first, last, exclude_ranges):
+            while candidate < used_start and candidate <= last and len(result) < count:
+                result.append(f'{_intToIP(candidate, version)}/{length}')
+                candidate += 1
+            if len(result) >= count or candidate > last:
+                return result
+            candidate = max(candidate, used_end + 1)
+        while candidate <= last and len(result) < count:
+            result.append(f'{_intToIP(candidate, version)}/{length}')
+            candidate += 1
+        return result
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
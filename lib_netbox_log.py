@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Logging
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import sys
+import json
+import time
+import threading
+
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+QUIET   = 100
+
+LEVELS = {'debug':   DEBUG,
+          'info':    INFO,
+          'warning': WARNING,
+          'error':   ERROR,
+          'quiet':   QUIET}
+
+MODES = ('text', 'json', 'progress', 'quiet')
+
+#-------------------------------------------------------------------------------
+
+class NetboxLogger:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, level='info', mode='text', stream=None, filename=None, buffer_size=100, flush_interval=1.0, progress_interval=0.2):
+        if mode not in MODES:
+            raise ValueError(f'Unknown log mode "{mode}", expected one of: {', '.join(MODES)}!')
+        self.mode = mode
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        if mode == 'quiet':
+            self.level = max(self.level, ERROR)
+        elif mode == 'progress':
+            self.level = max(self.level, WARNING)
+        self.__own_stream = stream is None and filename is not None
+        self.__stream = open(filename, 'a', encoding='utf-8') if self.__own_stream else (sys.stdout if stream is None else stream)
+        self.__buffer_size = buffer_size
+        self.__flush_interval = flush_interval
+        self.__progress_interval = progress_interval
+        self.__buffer = []
+        self.__last_flush = time.monotonic()
+        self.__progress = {}
+        self.__progress_shown = False
+        self.__second = None
+        self.__time_text = None
+        self.__lock = threading.Lock()
+
+    #-------------------------------------------------------------------------------
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if self.__stream is None:
+            return
+        self.flush()
+        if self.__own_stream:
+            self.__stream.close()
+        self.__stream = None
+
+    #-------------------------------------------------------------------------------
+
+    def isEnabled(self, level):
+        return (LEVELS[level] if isinstance(level, str) else level) >= self.level
+
+    def __timestamp(self, now):
+        # formatting the time once per second is enough for log lines
+        second = int(now)
+        if second != self.__second:
+            self.__second = second
+            self.__time_text = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        return self.__time_text
+
+    def __format(self, level, message, fields):
+        now = time.time()
+        if self.mode == 'json':
+            record = {'time': f'{self.__timestamp(now)}.{int(now * 1000) % 1000:03d}',
+                      'level': next(name for name, value in LEVELS.items() if value == level),
+                      'message': message}
+            record.update(fields)
+            return json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        text = f'{self.__timestamp(now)} - NetBoxAPI: {message}\n'
+        details = ''.join(f'\n{key.replace('_', ' ').title()}:\n{json.dumps(value, indent=4, ensure_ascii=False, default=str)}\n'
+                          for key, value in fields.items() if isinstance(value, (dict, list)))
+        return text if len(details) == 0 else f'{text}{details}\n'
+
+    #-------------------------------------------------------------------------------
+
+    def log(self, level, message, **fields):
+        if level < self.level or self.__stream is None:
+            return
+        with self.__lock:
+            self.__buffer.append(self.__format(level, message, fields))
+            if level >= WARNING or len(self.__buffer) >= self.__buffer_size or time.monotonic() - self.__last_flush >= self.__flush_interval:
+                self.__flush()
+
+    def debug(self, message, **fields):
+        self.log(DEBUG, message, **fields)
+
+    def info(self, message, **fields):
+        self.log(INFO, message, **fields)
+
+    def warning(self, message, **fields):
+        self.log(WARNING, message, **fields)
+
+    def error(self, message, **fields):
+        self.log(ERROR, message, **fields)
+
+    #-------------------------------------------------------------------------------
+
+    def progress(self, task, done, total):
+        if self.mode != 'progress' or self.__stream is None:
+            return
+        with self.__lock:
+            now = time.monotonic()
+            if done < total and now - self.__progress.get(task, 0) < self.__progress_interval:
+                return
+            self.__progress[task] = now
+            width = 30
+            filled = width * done // total if total > 0 else width
+            self.__buffer.append(f'\r{task}: [{'#' * filled}{'.' * (width - filled)}] {done}/{total}')
+            self.__progress_shown = done < total
+            if done >= total:
+                self.__buffer.append('\n')
+                del self.__progress[task]
+            self.__flush()
+
+    #-------------------------------------------------------------------------------
+
+    def __flush(self):
+        if len(self.__buffer) > 0:
+            if self.__progress_shown and not self.__buffer[0].startswith('\r'):
+                # do not glue a log line to an unfinished progress bar
+                self.__buffer.insert(0, '\n')
+                self.__progress_shown = False
+            self.__stream.write(''.join(self.__buffer))
+            self.__stream.flush()
+            self.__buffer.clear()
+        self.__last_flush = time.monotonic()
+
+    def flush(self):
+        if self.__stream is None:
+            return
+        with self.__lock:
+            self.__flush()
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
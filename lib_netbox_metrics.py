@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Metrics
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import threading
+
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+#-------------------------------------------------------------------------------
+
+class NetboxMetrics:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.__buckets = tuple(sorted(buckets))
+        self.__series = {}
+        self.__callbacks = []
+        self.__lock = threading.Lock()
+
+    #-------------------------------------------------------------------------------
+
+    def addSpanCallback(self, callback):
+        self.__callbacks.append(callback)
+
+    def removeSpanCallback(self, callback):
+        self.__callbacks.remove(callback)
+
+    def reset(self):
+        with self.__lock:
+            self.__series = {}
+
+    #-------------------------------------------------------------------------------
+
+    def record(self, part, method, url, status_code, bytes_out, bytes_in, start_time, latency, attempt=0, error=None):
+        with self.__lock:
+            series = self.__series.setdefault((part, method), {'requests':     0,
+                                                               'errors':       0,
+                                                               'retries':      0,
+                                                               'status_codes': {},
+                                                               'bytes_out':    0,
+                                                               'bytes_in':     0,
+                                                               'latency_sum':  0.0,
+                                                               'latency_min':  None,
+                                                               'latency_max':  0.0,
+                                                               'buckets':      [0] * (len(self.__buckets) + 1)})
+            series['requests'] += 1
+            series['errors'] += 1 if error is not None or status_code >= 400 else 0
+            series['retries'] += 1 if attempt > 0 else 0
+            series['status_codes'][status_code] = series['status_codes'].get(status_code, 0) + 1
+            series['bytes_out'] += bytes_out
+            series['bytes_in'] += bytes_in
+            series['latency_sum'] += latency
+            series['latency_min'] = latency if series['latency_min'] is None else min(series['latency_min'], latency)
+            series['latency_max'] = max(series['latency_max'], latency)
+            series['buckets'][bisect_left(self.__buckets, latency)] += 1
+        if len(self.__callbacks) > 0:
+            span = {'part':        part,
+                    'method':      method,
+                    'url':         url,
+                    'status_code': status_code,
+                    'bytes_out':   bytes_out,
+                    'bytes_in':    bytes_in,
+                    'start_time':  start_time,
+                    'latency':     latency,
+                    'attempt':     attempt,
+                    'error':       error}
+            for callback in list(self.__callbacks):
+                callback(span)
+
+    #-------------------------------------------------------------------------------
+
+    def __quantile(self, series, quantile):
+        # linear interpolation inside the histogram bucket, clamped to the observed min/max
+        rank = quantile * series['requests']
+        seen = 0
+        for i, count in enumerate(series['buckets']):
+            if count > 0 and seen + count >= rank:
+                lower = self.__buckets[i - 1] if i > 0 else 0.0
+                upper = self.__buckets[i] if i < len(self.__buckets) else series['latency_max']
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(max(value, series['latency_min']), series['latency_max'])
+            seen += count
+        return series['latency_max']
+
+    def toDict(self):
+        result = {}
+        with self.__lock:
+            for (part, method), series in sorted(self.__series.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.__buckets + (float('inf'),), series['buckets']):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                result.setdefault(part, {})[method] = {'requests':     series['requests'],
+                                                       'errors':       series['errors'],
+                                                       'retries':      series['retries'],
+                                                       'status_codes': dict(sorted(series['status_codes'].items())),
+                                                       'bytes_out':    series['bytes_out'],
+                                                       'bytes_in':     series['bytes_in'],
+                                                       'latency':      {'sum':     series['latency_sum'],
+                                                                        'avg':     series['latency_sum'] / series['requests'],
+                                                                        'min':     series['latency_min'],
+                                                                        'max':     series['latency_max'],
+                                                                        'p50':     self.__quantile(series, 0.5),
+                                                                        'p90':     self.__quantile(series, 0.9),
+                                                                        'p99':     self.__quantile(series, 0.99),
+                                                                        'buckets': buckets}}
+        return result
+
+    def toPrometheus(self, prefix='netbox_api'):
+        lines = [f'# HELP {prefix}_requests_total HTTP requests sent to NetBox.',
+                 f'# TYPE {prefix}_requests_total counter']
+        data = self.toDict()
+        def __labels(part, method, **extra):
+            labels = {'part': part if part is not None else '', 'method': method, **extra}
+            return ','.join(f'{key}="{value}"' for key, value in labels.items())
+        for part, methods in data.items():
+            for method, series in methods.items():
+                for status_code, count in series['status_codes'].items():
+                    lines.append(f'{prefix}_requests_total{{{__labels(part, method, code=status_code)}}} {count}')
+        for name, key, help_text in (('retries_total', 'retries', 'HTTP requests that were retries of a failed attempt.'),
+                                     ('bytes_sent_total', 'bytes_out', 'Request body bytes sent to NetBox.'),
+                                     ('bytes_received_total', 'bytes_in', 'Response body bytes received from NetBox, as sent over the network before decompression.')):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for part, methods in data.items():
+                for method, series in methods.items():
+                    lines.append(f'{prefix}_{name}{{{__labels(part, method)}}} {series[key]}')
+        lines.append(f'# HELP {prefix}_request_duration_seconds Latency of HTTP requests sent to NetBox.')
+        lines.append(f'# TYPE {prefix}_request_duration_seconds histogram')
+        for part, methods in data.items():
+            for method, series in methods.items():
+                for bound, count in series['latency']['buckets'].items():
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{__labels(part, method, le='+Inf' if bound == float('inf') else bound)}}} {count}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{{{__labels(part, method)}}} {series['latency']['sum']}')
+                lines.append(f'{prefix}_request_duration_seconds_count{{{__labels(part, method)}}} {series['requests']}')
+        return '\n'.join(lines) + '\n'
+
+    def writePrometheus(self, filename, prefix='netbox_api'):
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.toPrometheus(prefix))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Compact Records
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import sys
+import json
+
+from collections.abc import Sequence
+
+_DERIVED = object()
+_MISSING = object()
+
+#-------------------------------------------------------------------------------
+
+class NetboxReferences:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self):
+        self.objects = {}
+        self.values = {}
+
+    #-------------------------------------------------------------------------------
+
+    def endpointOf(self, part, field, value, object_type=None):
+        url = value.get('url')
+        if isinstance(url, str) and url.endswith(f'/{value['id']}/'):
+            return sys.intern(url[:-len(f'{value['id']}/')])
+        # a polymorphic field without urls still names the model of each value in its "*_type" sibling
+        if isinstance(object_type, str):
+            return sys.intern(object_type)
+        return sys.intern(f'{part}.{field}')
+
+    def addObject(self, endpoint, value):
+        objects = self.objects.setdefault(endpoint, {})
+        if value['id'] not in objects:
+            objects[value['id']] = {key: self.shareValue(subvalue) for key, subvalue in value.items()}
+        return value['id']
+
+    def getObject(self, endpoint, object_id):
+        return self.objects.get(endpoint, {}).get(object_id)
+
+    def shareValue(self, value):
+        if isinstance(value, str):
+            return sys.intern(value) if len(value) <= 64 else value
+        if isinstance(value, dict) and len(value) <= 8 and all(isinstance(subvalue, (str, int, float, bool, type(None))) for subvalue in value.values()):
+            key = json.dumps(value, sort_keys=True)
+            if key not in self.values:
+                self.values[key] = {subkey: self.shareValue(subvalue) for subkey, subvalue in value.items()}
+            return self.values[key]
+        return value
+
+#-------------------------------------------------------------------------------
+
+class NetboxReference:
+    __slots__ = ('endpoint', 'id')
+
+    def __init__(self, endpoint, object_id):
+        self.endpoint = endpoint
+        self.id = object_id
+
+    def __repr__(self):
+        return f'NetboxReference({self.endpoint!r}, {self.id!r})'
+
+#-------------------------------------------------------------------------------
+
+class NetboxRecord:
+    __slots__ = ('_extra',)
+    _part = None
+    _fields = {}
+    _endpoints = {}
+    _url_prefixes = {}
+    _refs = None
+
+    #-------------------------------------------------------------------------------
+
+    @classmethod
+    def fromDict(cls, data):
+        record = cls.__new__(cls)
+        setslot = object.__setattr__
+        extra = None
+        for slot in cls._fields.values():
+            setslot(record, slot, _MISSING)
+        for key, value in data.items():
+            if key in cls._fields:
+                setslot(record, cls._fields[key], cls._compactValue(key, value, data))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        setslot(record, '_extra', extra)
+        return record
+
+    @classmethod
+    def _compactReference(cls, key, value, object_type):
+        # a bare id is kept for the endpoint the field met first, polymorphic fields (assigned_object, scope)
+        # keep the endpoint of every other value next to its id
+        refs = cls._refs
+        endpoint = refs.endpointOf(cls._part, key, value, object_type)
+        object_id = refs.addObject(endpoint, value)
+        if cls._endpoints.setdefault(key, endpoint) == endpoint:
+            return object_id
+        return NetboxReference(endpoint, object_id)
+
+    @classmethod
+    def _compactValue(cls, key, value, data):
+        if isinstance(value, dict) and isinstance(value.get('id'), int):
+            return cls._compactReference(key, value, data.get(f'{key}_type'))
+        if isinstance(value, list) and len(value) > 0 and all(isinstance(item, dict) and isinstance(item.get('id'), int) for item in value):
+            return tuple(cls._compactReference(key, item, None) for item in value)
+        object_id = data.get('id')
+        if key in ('url', 'display_url') and isinstance(value, str) and object_id is not None and value.endswith(f'/{object_id}/'):
+            prefix = value[:-len(f'{object_id}/')]
+            if cls._url_prefixes.setdefault(key, prefix) == prefix:
+                return _DERIVED
+        return cls._refs.shareValue(value)
+
+    #-------------------------------------------------------------------------------
+
+    def refId(self, key):
+        value = getattr(self, self._fields[key]) if key in self._fields else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        if isinstance(value, tuple):
+            return [item.id if isinstance(item, NetboxReference) else item for item in value]
+        return value.id if isinstance(value, NetboxReference) else value
+
+    def __resolve(self, key, value):
+        if isinstance(value, NetboxReference):
+            return dict(self._refs.getObject(value.endpoint, value.id))
+        return dict(self._refs.getObject(self._endpoints[key], value))
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            value = getattr(self, self._fields[key])
+            if value is _DERIVED:
+                return f'{self._url_prefixes[key]}{self['id']}/'
+            if value is not _MISSING:
+                if key in self._endpoints and isinstance(value, (int, NetboxReference)):
+                    return self.__resolve(key, value)
+                if key in self._endpoints and isinstance(value, tuple):
+                    return [self.__resolve(key, item) for item in value]
+                if isinstance(value, dict):
+                    return dict(value)
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        result = [key for key, slot in self._fields.items() if getattr(self, slot) is not _MISSING]
+        if self._extra is not None:
+            result.extend(self._extra.keys())
+        return result
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def toDict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{type(self).__name__} is read-only, use toDict() to get an editable copy!')
+
+    def __repr__(self):
+        return f'{type(self).__name__}(id={self.get('id')!r}, display={self.get('display', self.get('name'))!r})'
+
+#-------------------------------------------------------------------------------
+
+def makeRecordClass(part, fields, refs):
+    fields = {key: f'_f{i}' for i, key in enumerate(fields)}
+    class_name = ''.join(word.title() for word in part.split('_')) + 'Record'
+    return type(class_name, (NetboxRecord,), {'__slots__': tuple(fields.values()),
+                                              '_part': part,
+                                              '_fields': fields,
+                                              '_endpoints': {},
+                                              '_url_prefixes': {},
+                                              '_refs': refs})
+
+#-------------------------------------------------------------------------------
+
+class NetboxCompactPart(Sequence):
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, part, items=(), refs=None):
+        self.part = part
+        self.refs = NetboxReferences() if refs is None else refs
+        self.__record_class = None
+        self.__records = []
+        self.extend(items)
+
+    #-------------------------------------------------------------------------------
+
+    def append(self, item):
+        if isinstance(item, NetboxRecord):
+            if type(item)._refs is self.refs and (self.__record_class is None or isinstance(item, self.__record_class)):
+                self.__record_class = type(item)
+                self.__records.append(item)
+                return
+            item = item.toDict()
+        if self.__record_class is None:
+            self.__record_class = makeRecordClass(self.part, item.keys(), self.refs)
+        self.__records.append(self.__record_class.fromDict(item))
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __getitem__(self, index):
+        return self.__records[index]
+
+    def __len__(self):
+        return len(self.__records)
+
+    def toList(self):
+        return [record.toDict() for record in self.__records]
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
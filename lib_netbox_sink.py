@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Result Sinks
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import hashlib
+import os
+import threading
+
+#-------------------------------------------------------------------------------
+
+class NetboxJSONLinesSink:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, filename, mode='a', buffer_size=1000):
+        self.__file = open(filename, f'{mode}b')
+        self.__buffer_size = buffer_size
+        self.__buffer = []
+        self.__lock = threading.Lock()
+
+    def __call__(self, record):
+        line = mylib.jsonDumpsBytes(record) + b'\n'
+        with self.__lock:
+            self.__buffer.append(line)
+            if len(self.__buffer) >= self.__buffer_size:
+                self.__flush()
+
+    #-------------------------------------------------------------------------------
+
+    def __flush(self):
+        if self.__file is not None and len(self.__buffer) > 0:
+            self.__file.write(b''.join(self.__buffer))
+            self.__file.flush()
+        self.__buffer.clear()
+
+    def flush(self):
+        with self.__lock:
+            self.__flush()
+
+    def close(self):
+        with self.__lock:
+            if self.__file is None:
+                return
+            self.__flush()
+            self.__file.close()
+            self.__file = None
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+#-------------------------------------------------------------------------------
+
+class NetboxJournal:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        self.__keys = set()
+        torn = False
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                for line in f:
+                    torn = not line.endswith(b'\n')
+                    try:
+                        self.__keys.add(mylib.jsonLoads(line)['key'])
+                    except (ValueError, KeyError, TypeError):
+                        # the last line may be cut short by the crash we are recovering from
+                        continue
+        if torn:
+            with open(filename, 'ab') as f:
+                f.write(b'\n')
+        self.__sink = NetboxJSONLinesSink(filename, 'a', buffer_size=1)
+        self.__lock = threading.Lock()
+
+    #-------------------------------------------------------------------------------
+
+    @staticmethod
+    def itemKey(action, part, data):
+        return f'{action}:{part}:{hashlib.sha1(mylib.jsonDumpsBytes(data, sort_keys=True)).hexdigest()}'
+
+    def isDone(self, action, part, data):
+        return self.itemKey(action, part, data) in self.__keys
+
+    def done(self, action, part, data, object_name, created=None):
+        key = self.itemKey(action, part, data)
+        with self.__lock:
+            if key in self.__keys:
+                return
+            self.__keys.add(key)
+        record = {'key': key, 'name': object_name}
+        if isinstance(created, dict) and 'id' in created:
+            record['id'] = created['id']
+        self.__sink(record)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    #-------------------------------------------------------------------------------
+
+    def close(self):
+        self.__sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+#-------------------------------------------------------------------------------
+
+class NetboxResultCollector:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, action, part, task, total, sink=None, aggregate=True, progress=None, sort=sorted, journal=None):
+        self.__action = action
+        self.__part = part
+        self.__task = task
+        self.__total = total
+        # a file name opens a JSON lines sink that lives for this call only
+        self.__own_sink = isinstance(sink, str)
+        self.__sink = NetboxJSONLinesSink(sink) if self.__own_sink else sink
+        self.__aggregate = aggregate
+        self.__progress = progress
+        self.__sort = sort
+        self.__own_journal = isinstance(journal, str)
+        self.__journal = NetboxJournal(journal) if self.__own_journal else journal
+        self.count_of_good = 0
+        self.count_of_bad = 0
+        self.count_of_skipped = 0
+        self.__list_of_good = []
+        self.__list_of_bad = []
+        self.__dict_of_bad = {}
+        self.__list_of_created = [] if action == 'create' else None
+        self.__list_of_good_ids = [] if action in ('update', 'delete') else None
+
+    #-------------------------------------------------------------------------------
+
+    def __emit(self, object_name, ok, index, data, response, skipped=False):
+        record = {'action': self.__action,
+                  'part':   self.__part,
+                  'name':   object_name,
+                  'ok':     ok,
+                  'index':  index}
+        if skipped:
+            record['skipped'] = True
+        if not ok:
+            record['request'] = data
+        if response is not None:
+            record['response'] = response
+        self.__sink(record)
+
+    def __notify(self):
+        if self.__progress is not None:
+            self.__progress(self.__task, self.count_of_good + self.count_of_bad, self.__total)
+
+    def good(self, object_name, data=None, created=None, index=None, notify=True, skipped=False):
+        self.count_of_good += 1
+        if self.__aggregate:
+            self.__list_of_good.append(object_name)
+            if self.__list_of_created is not None and created is not None:
+                self.__list_of_created.append(created)
+            if self.__list_of_good_ids is not None and isinstance(data, dict) and 'id' in data:
+                self.__list_of_good_ids.append(data['id'])
+        if self.__journal is not None and data is not None and not skipped:
+            self.__journal.done(self.__action, self.__part, data, object_name, created)
+        if self.__sink is not None:
+            self.__emit(object_name, True, index, data, created, skipped)
+        if notify:
+            self.__notify()
+
+    def goodChunk(self, object_names, chunk, created=None, first_index=None):
+        for i, (object_name, data) in enumerate(zip(object_names, chunk)):
+            self.good(object_name, data, None if created is None or i >= len(created) else created[i],
+                      None if first_index is None else first_index + i, notify=False)
+        self.__notify()
+
+    def bad(self, object_name, data, response, index=None):
+        self.count_of_bad += 1
+        if self.__aggregate:
+            self.__list_of_bad.append(object_name)
+            self.__dict_of_bad[object_name] = {'request':  data,
+                                               'response': response}
+        if self.__sink is not None:
+            self.__emit(object_name, False, index, data, response)
+        self.__notify()
+
+    def pending(self, data, get_name):
+        # items the journal already holds count as good and are not sent again
+        if self.__journal is None:
+            return data
+        if isinstance(data, dict):
+            if not self.__journal.isDone(self.__action, self.__part, data):
+                return data
+            self.count_of_skipped += 1
+            self.good(get_name(data), data, notify=False, skipped=True)
+            return {}
+        result = []
+        for item in data:
+            if self.__journal.isDone(self.__action, self.__part, item):
+                self.count_of_skipped += 1
+                self.good(get_name(item), item, notify=False, skipped=True)
+            else:
+                result.append(item)
+        if self.count_of_skipped > 0:
+            self.__notify()
+        return result
+
+    #-------------------------------------------------------------------------------
+
+    def finish(self):
+        if self.__own_journal:
+            self.__journal.close()
+        if self.__own_sink:
+            self.__sink.close()
+        elif self.__sink is not None and hasattr(self.__sink, 'flush'):
+            self.__sink.flush()
+        result = {'count_of_good': self.count_of_good,
+                  'count_of_bad':  self.count_of_bad}
+        if self.__journal is not None:
+            result['count_of_skipped'] = self.count_of_skipped
+        if self.__aggregate:
+            result['list_of_good'] = self.__sort(set(self.__list_of_good))
+            result['list_of_bad']  = self.__sort(set(self.__list_of_bad))
+            result['dict_of_bad']  = {object_name: self.__dict_of_bad[object_name] for object_name in result['list_of_bad']}
+            if self.__list_of_created is not None:
+                result['list_of_created'] = self.__list_of_created
+            if self.__list_of_good_ids is not None:
+                result['list_of_good_ids'] = self.__list_of_good_ids
+        return result
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Snapshot File
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from itertools import islice
+
+# layout: magic | zlib NDJSON blocks ... | id indexes | zlib JSON index | footer (index offset, index length, magic)
+SNAPSHOT_MAGIC = b'NBSNAP\x00\x01'
+FOOTER_MAGIC = b'NBSNAPIX'
+FOOTER = struct.Struct('<QQ8s')
+VERSION = 1
+
+#-------------------------------------------------------------------------------
+
+def isSnapshotFile(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+    except OSError:
+        return False
+
+#-------------------------------------------------------------------------------
+
+class NetboxSnapshotWriter:
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, filename, block_size=1000, level=6):
+        self.__filename = filename
+        self.__block_size = block_size
+        self.__level = level
+        # written next to the target and renamed over it on close, the old snapshot stays intact until then
+        self.__temp_filename = f'{filename}.{os.getpid()}.{threading.get_ident()}.tmp'
+        self.__file = open(self.__temp_filename, 'xb')
+        self.__file.write(SNAPSHOT_MAGIC)
+        self.__parts = {}
+
+    def __del__(self):
+        # a writer that was never closed did not get all its parts, it must not look complete
+        self.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    #-------------------------------------------------------------------------------
+
+    def __writeBlock(self, data):
+        offset = self.__file.tell()
+        data = zlib.compress(data, self.__level)
+        self.__file.write(data)
+        return offset, len(data)
+
+    def writePart(self, part, items):
+        if part in self.__parts:
+            raise ValueError(f'Part "{part}" is already in snapshot "{self.__filename}"!')
+        blocks = []
+        ids = array('q')
+        id_blocks = array('I')
+        count = 0
+        items = iter(items)
+        while True:
+            batch = list(islice(items, self.__block_size))
+            if len(batch) == 0:
+                break
+            for item in batch:
+                object_id = item.get('id')
+                if isinstance(object_id, int):
+                    ids.append(object_id)
+                    id_blocks.append(len(blocks))
+            offset, length = self.__writeBlock(b'\n'.join(mylib.jsonDumpsBytes(item) for item in batch) + b'\n')
+            blocks.append([offset, length, len(batch)])
+            count += len(batch)
+        # ids sorted once per part, the reader finds the block of an id with bisect
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        offset, length = self.__writeBlock(array('q', (ids[i] for i in order)).tobytes() + array('I', (id_blocks[i] for i in order)).tobytes())
+        self.__parts[part] = {'count':  count,
+                              'blocks': blocks,
+                              'ids':    [offset, length, len(ids)]}
+        return count
+
+    def writeData(self, data):
+        result = {}
+        for part, items in data.items():
+            result[part] = self.writePart(part, items)
+        return result
+
+    def close(self):
+        if getattr(self, '_NetboxSnapshotWriter__file', None) is None:
+            return
+        index = {'version':    VERSION,
+                 'codec':      'zlib',
+                 'block_size': self.__block_size,
+                 'parts':      self.__parts}
+        offset, length = self.__writeBlock(mylib.jsonDumpsBytes(index))
+        self.__file.write(FOOTER.pack(offset, length, FOOTER_MAGIC))
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__file.close()
+        self.__file = None
+        os.replace(self.__temp_filename, self.__filename)
+
+    def abort(self):
+        if getattr(self, '_NetboxSnapshotWriter__file', None) is None:
+            return
+        self.__file.close()
+        self.__file = None
+        try:
+            os.remove(self.__temp_filename)
+        except OSError:
+            pass
+
+#-------------------------------------------------------------------------------
+
+class NetboxSnapshotFile(Mapping):
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        self.__filename = filename
+        self.__file = open(filename, 'rb')
+        self.__mm = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(self.__mm) < len(SNAPSHOT_MAGIC) + FOOTER.size:
+            self.close()
+            raise ValueError(f'File "{filename}" is not a NetBox snapshot!')
+        offset, length, magic = FOOTER.unpack(self.__mm[-FOOTER.size:])
+        if magic != FOOTER_MAGIC:
+            self.close()
+            raise ValueError(f'Snapshot "{filename}" has no footer, it was not closed properly!')
+        index = mylib.jsonLoads(zlib.decompress(self.__mm[offset:offset+length]))
+        if index.get('version') != VERSION:
+            self.close()
+            raise ValueError(f'Snapshot "{filename}" has unsupported version {index.get('version')}!')
+        self.__parts = index['parts']
+        self.__ids = {}
+        self.__cache = {}
+        self.__lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if getattr(self, '_NetboxSnapshotFile__mm', None) is not None:
+            self.__mm.close()
+            self.__file.close()
+            self.__mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    #-------------------------------------------------------------------------------
+
+    def __block(self, part, block_index):
+        offset, length, count = self.__parts[part]['blocks'][block_index]
+        return [mylib.jsonLoads(line) for line in zlib.decompress(self.__mm[offset:offset+length]).splitlines()]
+
+    def __idIndex(self, part):
+        with self.__lock:
+            if part not in self.__ids:
+                offset, length, count = self.__parts[part]['ids']
+                data = zlib.decompress(self.__mm[offset:offset+length])
+                ids = array('q')
+                ids.frombytes(data[:count * ids.itemsize])
+                id_blocks = array('I')
+                id_blocks.frombytes(data[count * ids.itemsize:])
+                self.__ids[part] = (ids, id_blocks)
+            return self.__ids[part]
+
+    #-------------------------------------------------------------------------------
+
+    def __getitem__(self, part):
+        # decoded once and kept, like a part of the dict loadData returns
+        if part not in self.__parts:
+            raise KeyError(part)
+        with self.__lock:
+            if part not in self.__cache:
+                self.__cache[part] = list(self.iterPart(part))
+            return self.__cache[part]
+
+    def __contains__(self, part):
+        return part in self.__parts
+
+    def __iter__(self):
+        return iter(self.__parts)
+
+    def __len__(self):
+        return len(self.__parts)
+
+    def countOf(self, part):
+        return self.__parts[part]['count'] if part in self.__parts else 0
+
+    #-------------------------------------------------------------------------------
+
+    def iterPart(self, part):
+        for block_index in range(len(self.__parts[part]['blocks'])):
+            yield from self.__block(part, block_index)
+
+    def getById(self, part, object_id):
+        if part not in self.__parts:
+            return None
+        ids, id_blocks = self.__idIndex(part)
+        position = bisect_left(ids, object_id)
+        if position == len(ids) or ids[position] != object_id:
+            return None
+        return next((item for item in self.__block(part, id_blocks[position]) if item.get('id') == object_id), None)
+
+#-------------------------------------------------------------------------------
+
+def writeSnapshot(filename, data, block_size=1000, level=6):
+    with NetboxSnapshotWriter(filename, block_size, level) as writer:
+        return writer.writeData(data)
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+#-------------------------------------------------------------------------------
+# Name:        Inventory Tools - Snapshot Store
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     30.05.2025
+# Copyright:   (c) Nikolay Sisyukin 2025
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import lib_nspylib as mylib
+import sqlite3
+
+from pathlib import Path
+
+from collections.abc import Mapping
+from itertools import islice
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+#-------------------------------------------------------------------------------
+
+def isSnapshotStore(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+#-------------------------------------------------------------------------------
+
+class NetboxSnapshotStore(Mapping):
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, filename, batch_size=5000, read_only=False):
+        self.__filename = filename
+        self.__batch_size = batch_size
+        self.__parts = {}
+        self.__read_only = read_only
+        self.__db = None
+        if read_only:
+            # a reader must not touch the file, it may sit on a read-only share or be in use by a writer
+            self.__db = sqlite3.connect(f'{Path(filename).absolute().as_uri()}?mode=ro', uri=True, check_same_thread=False)
+            return
+        self.__db = sqlite3.connect(filename, check_same_thread=False)
+        self.__db.executescript('''
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS parts   (part TEXT PRIMARY KEY, position INTEGER, count INTEGER);
+            CREATE TABLE IF NOT EXISTS objects (part TEXT, id INTEGER, position INTEGER, name TEXT, slug TEXT, address TEXT, data TEXT,
+                                                PRIMARY KEY (part, id));
+            CREATE TABLE IF NOT EXISTS refs    (part TEXT, id INTEGER, field TEXT, ref_id INTEGER);
+            CREATE INDEX IF NOT EXISTS objects_position ON objects (part, position);
+            CREATE INDEX IF NOT EXISTS objects_name     ON objects (part, name);
+            CREATE INDEX IF NOT EXISTS objects_slug     ON objects (part, slug);
+            CREATE INDEX IF NOT EXISTS objects_address  ON objects (part, address);
+            CREATE INDEX IF NOT EXISTS refs_ref_id      ON refs (part, field, ref_id);
+            CREATE INDEX IF NOT EXISTS refs_id          ON refs (part, id);
+        ''')
+
+    #-------------------------------------------------------------------------------
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if getattr(self, '_NetboxSnapshotStore__db', None) is not None:
+            if not self.__read_only:
+                # WAL speeds up writing, a closed snapshot is left as one file that readers can open read-only
+                try:
+                    self.__db.execute('PRAGMA journal_mode = DELETE')
+                except sqlite3.OperationalError:
+                    pass
+            self.__db.close()
+            self.__db = None
+
+    #-------------------------------------------------------------------------------
+
+    def __refs(self, part, item):
+        for field, value in item.items():
+            if isinstance(value, dict) and isinstance(value.get('id'), int):
+                yield (part, item['id'], field, value['id'])
+                for subfield, subvalue in value.items():
+                    if isinstance(subvalue, dict) and isinstance(subvalue.get('id'), int):
+                        yield (part, item['id'], f'{field}.{subfield}', subvalue['id'])
+            elif isinstance(value, list):
+                for subvalue in value:
+                    if isinstance(subvalue, dict) and isinstance(subvalue.get('id'), int):
+                        yield (part, item['id'], field, subvalue['id'])
+
+    def __row(self, part, position, item):
+        address = item.get('address', item.get('prefix', item.get('start_address')))
+        return (part, item.get('id'), position, item.get('name'), item.get('slug'), address,
+                mylib.jsonDumps(item))
+
+    #-------------------------------------------------------------------------------
+
+    def writePart(self, part, items):
+        self.__parts.pop(part, None)
+        with self.__db:
+            self.__db.execute('DELETE FROM objects WHERE part = ?', (part,))
+            self.__db.execute('DELETE FROM refs WHERE part = ?', (part,))
+            count = 0
+            items = iter(items)
+            while True:
+                batch = list(islice(items, self.__batch_size))
+                if len(batch) == 0:
+                    break
+                self.__db.executemany('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                      (self.__row(part, count + i, item) for i, item in enumerate(batch)))
+                self.__db.executemany('INSERT INTO refs VALUES (?, ?, ?, ?)',
+                                      (ref for item in batch for ref in self.__refs(part, item)))
+                count += len(batch)
+            position = self.__db.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM parts').fetchone()[0]
+            self.__db.execute('INSERT INTO parts VALUES (?, ?, ?) ON CONFLICT (part) DO UPDATE SET count = excluded.count',
+                              (part, position, count))
+        return count
+
+    def writeData(self, data):
+        result = {}
+        for part, items in data.items():
+            result[part] = self.writePart(part, items)
+        return result
+
+    #-------------------------------------------------------------------------------
+
+    def __getitem__(self, part):
+        # decoded once and kept, like a part of the dict loadData returns
+        if part not in self.__parts:
+            if part not in self:
+                raise KeyError(part)
+            self.__parts[part] = list(self.iterPart(part))
+        return self.__parts[part]
+
+    def __contains__(self, part):
+        return self.__db.execute('SELECT 1 FROM parts WHERE part = ?', (part,)).fetchone() is not None
+
+    def __iter__(self):
+        return iter([row[0] for row in self.__db.execute('SELECT part FROM parts ORDER BY position')])
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM parts').fetchone()[0]
+
+    def countOf(self, part):
+        row = self.__db.execute('SELECT count FROM parts WHERE part = ?', (part,)).fetchone()
+        return 0 if row is None else row[0]
+
+    #-------------------------------------------------------------------------------
+
+    def iterPart(self, part):
+        for row in self.__db.execute('SELECT data FROM objects WHERE part = ? ORDER BY position', (part,)):
+            yield mylib.jsonLoads(row[0])
+
+    def getById(self, part, object_id):
+        row = self.__db.execute('SELECT data FROM objects WHERE part = ? AND id = ?', (part, object_id)).fetchone()
+        return None if row is None else mylib.jsonLoads(row[0])
+
+    def __find(self, part, column, value):
+        return [mylib.jsonLoads(row[0]) for row in self.__db.execute(f'SELECT data FROM objects WHERE part = ? AND {column} = ? ORDER BY position', (part, value))]
+
+    def findByName(self, part, name):
+        return self.__find(part, 'name', name)
+
+    def findBySlug(self, part, slug):
+        return self.__find(part, 'slug', slug)
+
+    def findByAddress(self, part, address):
+        return self.__find(part, 'address', address)
+
+    def findByRef(self, part, field, ref_id):
+        return [mylib.jsonLoads(row[0]) for row in self.__db.execute('''SELECT objects.data FROM refs
+                                                                   JOIN objects ON objects.part = refs.part AND objects.id = refs.id
+                                                                   WHERE refs.part = ? AND refs.field = ? AND refs.ref_id = ?
+                                                                   ORDER BY objects.position''', (part, field, ref_id))]
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This is a library module and should not be run directly.')
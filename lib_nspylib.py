@@ -14,22 +14,24 @@ MB = 2 ** 20  #  1MB in bytes
 GB = 2 ** 30  #  1GB in bytes
 TB = 2 ** 40  #  1TB in bytes
 
-import os, sys, json, codecs, requests, urllib3, ssl, smtplib, ipaddress, base64, zlib
-import xml.etree.ElementTree as xml
-
-from xml.etree.ElementInclude import include
-
-from requests.auth import HTTPBasicAuth
-
-from re import A
+import os, sys, re, json, mmap, codecs, urllib3, ipaddress, socket, struct
 
+from array import array
+from collections.abc import Mapping, Sequence
 from datetime import datetime as dt
-from time import time
 
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.message import EmailMessage
-from email.utils import formatdate
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
 
 urllib3.disable_warnings()
 
@@ -43,20 +45,20 @@ def nowDateTime(sp=None):
 
     now = dt.now()
     
-    year = str(now.year).rjust(4, '0')
-    month = str(now.month).rjust(2, '0')
-    day = str(now.day).rjust(2, '0')
-    hour = str(now.hour).rjust(2, '0')
-    minute = str(now.minute).rjust(2, '0')
-    second = str(now.second).rjust(2, '0')
-    
-    now = f'{year}{sp1}{month}{sp1}{day}{sp2}{hour}{sp3}{minute}{sp3}{second}'
+    now = f'{now.year:04d}{sp1}{now.month:02d}{sp1}{now.day:02d}{sp2}{now.hour:02d}{sp3}{now.minute:02d}{sp3}{now.second:02d}'
 
     return now
 
 #-------------------------------------------------------------------------------
 
 def sendEmail(subject, mail, recipients, sender, password, server, port, ssl_mode=False):
+    # mail helpers are imported on first use, most callers never send mail
+    import ssl, smtplib
+
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from email.utils import formatdate
+
     date = f'{dt.now():%Y-%m-%d %H:%M:%S}'
 
     header_of_mail = '<html>\n<body style="font-family: Arial !important;">'
@@ -97,6 +99,8 @@ def sendEmailFromConfigParam(conf_filename, title, message, recipients):
 #-------------------------------------------------------------------------------
 
 def readXMLfromFile(filename):
+    import xml.etree.ElementTree as xml
+
     # find
     # findall
     tree = xml.parse(filename)
@@ -125,11 +129,13 @@ def is_valid_json(s: str) -> bool:
 #-------------------------------------------------------------------------------
 
 def jsonToBase64(text):
+    import base64
     return base64.b64encode(json.dumps(text).encode('utf-8')).decode('utf-8')
 
 #-------------------------------------------------------------------------------
 
 def base64ToJson(base64_data):
+    import base64
     return json.loads(base64.b64decode(base64_data).decode('utf-8'))
 
 #-------------------------------------------------------------------------------
@@ -146,15 +152,173 @@ def base64JoinFromMany(base64_data_parts):
     return ''.join(base64_data_parts)
 #-------------------------------------------------------------------------------
 
+def _jsonDefault(value):
+    if hasattr(value, 'toDict'):
+        return value.toDict()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (Sequence, set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def jsonLoads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def jsonDumpsBytes(data, indent=None, sort_keys=False):
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        option |= orjson.OPT_INDENT_2 if indent == 2 else 0
+        option |= orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(data, default=_jsonDefault, option=option)
+    return jsonDumps(data, indent, sort_keys).encode('utf-8')
+
+def jsonDumps(data, indent=None, sort_keys=False):
+    if orjson is not None and indent in (None, 2):
+        return jsonDumpsBytes(data, indent, sort_keys).decode('utf-8')
+    separators = (',', ':') if indent is None else None
+    return json.dumps(data, ensure_ascii=False, indent=indent, separators=separators, sort_keys=sort_keys, default=_jsonDefault)
+
+def acceptEncoding():
+    return 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
+#-------------------------------------------------------------------------------
+
 def readJSONfromFile(filename, enc='UTF-8'):
     with open(filename, 'r', encoding=enc) as f:
-        return json.load(f)
+        return jsonLoads(f.read())
 
 #-------------------------------------------------------------------------------
 
-def dumpJSONtoFile(filename, data, mode='w'):
-    with open(filename, mode, encoding="UTF-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+class LazyJSONFile(Mapping):
+    __token = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+    __scalar = re.compile(rb'[^,}\]\s]+')
+    __separator = re.compile(r'[\s,]*')
+
+    def __init__(self, filename, cache=True, chunk_size=MB):
+        self.__filename = filename
+        self.__cache = {} if cache else None
+        self.__chunk_size = chunk_size
+        self.__file = open(filename, 'rb')
+        self.__mm = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__index = self.__indexTopLevel()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if getattr(self, '_LazyJSONFile__mm', None) is not None:
+            self.__mm.close()
+            self.__file.close()
+            self.__mm = None
+
+    def __skipSpaces(self, pos):
+        while self.__mm[pos:pos+1] in (b' ', b'\t', b'\r', b'\n'):
+            pos += 1
+        return pos
+
+    def __indexTopLevel(self):
+        mm = self.__mm
+        index = {}
+        start = self.__skipSpaces(0)
+        if mm[start:start+1] != b'{':
+            raise ValueError(f'File "{self.__filename}" does not contain a JSON object!')
+        # json.dump(indent=N) puts top-level keys at exactly N spaces after a newline
+        indent = re.compile(rb'\{\n( +)"').match(mm, start)
+        if indent is not None:
+            keys = list(re.finditer(rb'\n' + indent.group(1) + rb'("(?:[^"\\]|\\.)*")\s*:\s*', mm))
+            end_of_object = mm.rfind(b'}')
+            for i, key in enumerate(keys):
+                value_end = keys[i+1].start() if i+1 < len(keys) else end_of_object
+                while mm[value_end-1:value_end] in (b' ', b'\t', b'\r', b'\n', b','):
+                    value_end -= 1
+                index[json.loads(key.group(1))] = (key.end(), value_end)
+            return index
+        depth, expecting, key, value_start = 0, 'key', None, None
+        for token in self.__token.finditer(mm, start):
+            char = mm[token.start()]
+            if char == 0x22:
+                if depth != 1:
+                    continue
+                if expecting == 'key':
+                    key = json.loads(token.group())
+                    value_start = self.__skipSpaces(mm.find(b':', token.end()) + 1)
+                    if mm[value_start] in (0x7b, 0x5b):
+                        expecting = 'value'
+                    elif mm[value_start] == 0x22:
+                        expecting = 'string'
+                    else:
+                        index[key] = (value_start, self.__scalar.match(mm, value_start).end())
+                elif expecting == 'string':
+                    index[key] = (token.start(), token.end())
+                    expecting = 'key'
+            elif char in (0x7b, 0x5b):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1 and expecting == 'value':
+                    index[key] = (value_start, token.end())
+                    expecting = 'key'
+                elif depth == 0:
+                    break
+        return index
+
+    def __getitem__(self, key):
+        if self.__cache is not None and key in self.__cache:
+            return self.__cache[key]
+        start, end = self.__index[key]
+        value = jsonLoads(self.__mm[start:end])
+        if self.__cache is not None:
+            self.__cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.__index)
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def iterItems(self, key):
+        start, end = self.__index[key]
+        if self.__mm[start:start+1] != b'[':
+            raise ValueError(f'Value of "{key}" in file "{self.__filename}" is not a JSON array!')
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        pos, buffer, offset = start + 1, '', 0
+        while True:
+            offset = self.__separator.match(buffer, offset).end()
+            if buffer.startswith(']', offset):
+                return
+            try:
+                item, next_offset = decoder.raw_decode(buffer, offset)
+                if next_offset < len(buffer) or pos >= end:
+                    yield item
+                    offset = next_offset
+                    continue
+            except json.JSONDecodeError:
+                if pos >= end:
+                    raise
+            buffer = buffer[offset:] + utf8.decode(self.__mm[pos:min(pos + self.__chunk_size, end)])
+            pos, offset = min(pos + self.__chunk_size, end), 0
+
+#-------------------------------------------------------------------------------
+
+def readJSONfromFileLazy(filename, cache=True):
+    return LazyJSONFile(filename, cache=cache)
+
+#-------------------------------------------------------------------------------
+
+def dumpJSONtoFile(filename, data, mode='w', compact=False):
+    if compact:
+        with open(filename, f'{mode}b') as f:
+            f.write(jsonDumpsBytes(data))
+    else:
+        with open(filename, mode, encoding="UTF-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4, default=_jsonDefault)
 
 #-------------------------------------------------------------------------------
 
@@ -225,18 +389,73 @@ def ipToInt(ip):
     try:
         if '/' in ip:
             ip = ip.split('/')[0]
-        ip_obj = ipaddress.ip_address(ip)
-        if isinstance(ip_obj, ipaddress.IPv4Address):
-            return int(ipaddress.IPv4Address(ip))
-        elif isinstance(ip_obj, ipaddress.IPv6Address):
-            return int(ipaddress.IPv6Address(ip))
+        return int(ipaddress.ip_address(ip))
     except:
         return 0
 
 #-------------------------------------------------------------------------------
 
-def sortedIPs(ip_list):
-    return sorted(ip_list, key=ipToInt)
+def ipsToPacked(ip_list):
+    # the family column keeps 0.0.0.1 and ::1 apart, entries that do not parse at all get family 0 and value 0
+    family, hi, lo = array('B'), array('Q'), array('Q')
+    inet_pton, AF_INET, AF_INET6, unpack = socket.inet_pton, socket.AF_INET, socket.AF_INET6, struct.Struct('!QQ').unpack
+    from_bytes = int.from_bytes
+    for ip in ip_list:
+        try:
+            address = ip.partition('/')[0]
+            if ':' in address:
+                family_value, (hi_value, lo_value) = 6, unpack(inet_pton(AF_INET6, address))
+            else:
+                family_value, hi_value, lo_value = 4, 0, from_bytes(inet_pton(AF_INET, address), 'big')
+        except Exception:
+            # inet_pton rejects forms ipaddress still reads, like scoped IPv6 "fe80::1%eth0"
+            try:
+                address = ipaddress.ip_address(ip.partition('/')[0])
+                family_value, value = address.version, int(address)
+            except Exception:
+                family_value, value = 0, 0
+            hi_value, lo_value = value >> 64, value & 0xFFFFFFFFFFFFFFFF
+        family.append(family_value)
+        hi.append(hi_value)
+        lo.append(lo_value)
+    return family, hi, lo
+
+def packedSortOrder(family, hi, lo):
+    # ordered by the integer value like ipToInt, equal values keep their input order
+    if not any(hi):
+        return sorted(range(len(lo)), key=lo.__getitem__)
+    keys = [hi_value << 64 | lo_value for hi_value, lo_value in zip(hi, lo)]
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+def packedUniqueOrder(family, hi, lo):
+    # 0.0.0.1 and ::1 share a value, they need not be neighbours after sorting
+    result = []
+    seen = set()
+    for i in packedSortOrder(family, hi, lo):
+        key = (family[i], hi[i], lo[i])
+        if family[i] == 0 or key not in seen:
+            result.append(i)
+            seen.add(key)
+    return result
+
+def packedRangeFilter(family, hi, lo, first, last):
+    range_family = 6 if ':' in first else 4
+    first, last = ipToInt(first), ipToInt(last)
+    first_hi, first_lo, last_hi, last_lo = first >> 64, first & 0xFFFFFFFFFFFFFFFF, last >> 64, last & 0xFFFFFFFFFFFFFFFF
+    return [i for i in range(len(lo)) if family[i] == range_family and (first_hi, first_lo) <= (hi[i], lo[i]) <= (last_hi, last_lo)]
+
+#-------------------------------------------------------------------------------
+
+def sortedIPs(ip_list, unique=False):
+    ip_list = list(ip_list)
+    family, hi, lo = ipsToPacked(ip_list)
+    order = packedUniqueOrder(family, hi, lo) if unique else packedSortOrder(family, hi, lo)
+    return [ip_list[i] for i in order]
+
+def filterIPsByRange(ip_list, first, last):
+    ip_list = list(ip_list)
+    family, hi, lo = ipsToPacked(ip_list)
+    return [ip_list[i] for i in packedRangeFilter(family, hi, lo, first, last)]
 
 #-------------------------------------------------------------------------------
 
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+
+import lib_netbox
+import lib_netbox_bench
+
+#-------------------------------------------------------------------------------
+
+class NetboxServerTestCase(unittest.TestCase):
+    size = 100
+    sizes = None
+    max_page_size = 1000
+
+    def setUp(self):
+        self.server = lib_netbox_bench.FakeNetboxServer(self.size, self.sizes, max_page_size=self.max_page_size).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.directory.name, 'config_netbox.json')
+        self.server.writeConfig(self.config_file)
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def api(self, **kwargs):
+        kwargs.setdefault('log_mode', 'quiet')
+        kwargs.setdefault('backoff', 0)
+        return lib_netbox.NetboxAPI(self.config_file, **kwargs)
+
+    def table(self, part):
+        return self.server.tables[lib_netbox.NETBOX_API[part]['url_part']]
+
+    def requestsOf(self, api, part, method):
+        return api.getMetrics().toDict().get(part, {}).get(method, {}).get('requests', 0)
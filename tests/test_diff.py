@@ -0,0 +1,30 @@
+import unittest
+
+import lib_netbox_diff
+
+#-------------------------------------------------------------------------------
+
+class TestDiffPart(unittest.TestCase):
+
+    def setUp(self):
+        self.current = [{'id': 1, 'name': 'dc-1', 'slug': 'dc-1', 'description': ''},
+                        {'id': 2, 'name': 'dc-2', 'slug': 'dc-2', 'description': ''}]
+
+    def test_diff(self):
+        desired = [{'name': 'dc-1', 'slug': 'dc-1', 'description': 'main'},
+                   {'name': 'dc-3', 'slug': 'dc-3'}]
+        to_create, to_update, to_delete = lib_netbox_diff.diffPart('sites', desired, self.current)
+        self.assertEqual(to_create, [{'name': 'dc-3', 'slug': 'dc-3'}])
+        self.assertEqual(to_update, [{'id': 1, 'name': 'dc-1', 'description': 'main'}])
+        self.assertEqual(to_delete, [{'id': 2, 'name': 'dc-2'}])
+
+    def test_duplicate_desired_key(self):
+        desired = [{'name': 'dc-1', 'slug': 'dc-1', 'description': 'a'},
+                   {'name': 'dc-1', 'slug': 'dc-1', 'description': 'b'}]
+        with self.assertRaises(ValueError):
+            lib_netbox_diff.diffPart('sites', desired, self.current)
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+import lib_netbox_index
+import lib_nspylib as mylib
+import lib_netbox_sink
+
+#-------------------------------------------------------------------------------
+
+def _result(action, part, good, bad=(), aggregate=True):
+    collector = lib_netbox_sink.NetboxResultCollector(action, part, action, len(good) + len(bad), aggregate=aggregate)
+    for item in good:
+        collector.good(item.get('name'), item)
+    for item in bad:
+        collector.bad(item.get('name'), item, {'status_code': 400})
+    return collector.finish()
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxInventoryIndex(unittest.TestCase):
+
+    def setUp(self):
+        # two sites share a name, only the update of the first one succeeds
+        self.index = lib_netbox_index.NetboxInventoryIndex({'sites': [{'id': 1, 'name': 'dc', 'slug': 'dc-1'},
+                                                                      {'id': 2, 'name': 'dc', 'slug': 'dc-2'}]})
+
+    def test_apply_update_by_id(self):
+        good = [{'id': 1, 'name': 'dc', 'slug': 'dc-one'}]
+        bad = [{'id': 2, 'name': 'dc', 'slug': 'dc-two'}]
+        self.index.applyResult('sites', 'update', good + bad, _result('update', 'sites', good, bad))
+        self.assertEqual(self.index.getById('sites', 1)['slug'], 'dc-one')
+        self.assertEqual(self.index.getById('sites', 2)['slug'], 'dc-2')
+
+    def test_apply_delete_by_id(self):
+        good = [{'id': 2, 'name': 'dc'}]
+        bad = [{'id': 1, 'name': 'dc'}]
+        self.index.applyResult('sites', 'delete', good + bad, _result('delete', 'sites', good, bad))
+        self.assertEqual(self.index.findByName('sites', 'dc'), [self.index.getById('sites', 1)])
+        self.assertIsNone(self.index.getById('sites', 2))
+
+    def test_apply_without_aggregate(self):
+        good = [{'id': 1, 'name': 'dc', 'slug': 'dc-one'}]
+        with self.assertRaises(ValueError):
+            self.index.applyResult('sites', 'update', good, _result('update', 'sites', good, aggregate=False))
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxIPAMIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = lib_netbox_index.NetboxIPAMIndex(prefixes=[{'id': 1, 'prefix': '10.0.0.0/8'},
+                                                                {'id': 2, 'prefix': '10.0.0.0/16'},
+                                                                {'id': 3, 'prefix': '10.0.5.0/24'},
+                                                                {'id': 4, 'prefix': '10.0.5.0/26'},
+                                                                {'id': 5, 'prefix': '10.0.5.64/26'},
+                                                                {'id': 6, 'prefix': '2001:db8::/32'}],
+                                                      ranges=[{'id': 7, 'start_address': '10.0.5.1/16', 'end_address': '10.0.5.10/16'}])
+
+    def test_longest_prefix_match_ignores_mask(self):
+        self.assertEqual(self.index.longestPrefixMatch('10.0.5.7/16')['id'], 4)
+        self.assertEqual(self.index.longestPrefixMatch('10.0.5.70')['id'], 5)
+        self.assertEqual(self.index.longestPrefixMatch('2001:db8::1/128')['id'], 6)
+        self.assertIsNone(self.index.longestPrefixMatch('192.168.0.1/24'))
+
+    def test_prefixes_containing_ignores_mask(self):
+        self.assertEqual(sorted(item['id'] for item in self.index.prefixesContaining('10.0.5.7/16')), [1, 2, 3, 4])
+        self.assertEqual(sorted(item['id'] for item in self.index.prefixesContaining('10.1.0.1/32')), [1])
+
+    def test_ranges_containing(self):
+        self.assertEqual([item['id'] for item in self.index.rangesContaining('10.0.5.7/16')], [7])
+        self.assertEqual(self.index.rangesContaining('10.0.5.11/16'), [])
+
+    def test_overlapping_ranges(self):
+        generator = random.Random(1)
+        base = mylib.ipToInt('10.0.0.0')
+        ints = []
+        for i in range(300):
+            start = base + generator.randrange(0, 2000)
+            ints.append((start, start + generator.randrange(0, 300), i))
+        ranges = [{'id': i, 'start_address': lib_netbox_index._intToIP(start, 4), 'end_address': lib_netbox_index._intToIP(end, 4)} for start, end, i in ints]
+        index = lib_netbox_index.NetboxIPAMIndex(ranges=ranges)
+        for value in range(base, base + 2500, 7):
+            found = index.rangesContaining(lib_netbox_index._intToIP(value, 4))
+            expected = sorted((start, i) for start, end, i in ints if start <= value <= end)
+            self.assertEqual(sorted((mylib.ipToInt(item['start_address']), item['id']) for item in found), expected)
+            self.assertEqual([mylib.ipToInt(item['start_address']) for item in found], [start for start, i in expected])
+
+    def test_next_free_addresses(self):
+        index = lib_netbox_index.NetboxIPAMIndex(prefixes=[{'id': 1, 'prefix': '192.168.0.0/28'}],
+                                                 ranges=[{'id': 1, 'start_address': '192.168.0.3/28', 'end_address': '192.168.0.5/28'},
+                                                         {'id': 2, 'start_address': '192.168.0.4/28', 'end_address': '192.168.0.7/28'},
+                                                         {'id': 3, 'start_address': '192.168.0.20/24', 'end_address': '192.168.0.30/24'}],
+                                                 addresses=[{'id': 1, 'address': '192.168.0.1/28'},
+                                                            {'id': 2, 'address': '192.168.0.9/28'}])
+        self.assertEqual(index.nextFreeAddresses('192.168.0.0/28', 3), ['192.168.0.2/28', '192.168.0.3/28', '192.168.0.4/28'])
+        self.assertEqual(index.nextFreeAddresses('192.168.0.0/28', 3, exclude_ranges=True), ['192.168.0.2/28', '192.168.0.8/28', '192.168.0.10/28'])
+        self.assertEqual(len(index.nextFreeAddresses('192.168.0.0/28', 100, exclude_ranges=True)), 14 - 2 - 5)
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
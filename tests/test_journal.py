@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import lib_netbox_sink
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'journal.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reopen(self):
+        with lib_netbox_sink.NetboxJournal(self.filename) as journal:
+            journal.done('create', 'sites', {'name': 'a'}, 'a', {'id': 1})
+            journal.done('create', 'sites', {'name': 'a'}, 'a', {'id': 1})
+            self.assertEqual(len(journal), 1)
+        with lib_netbox_sink.NetboxJournal(self.filename) as journal:
+            self.assertEqual(len(journal), 1)
+            self.assertTrue(journal.isDone('create', 'sites', {'name': 'a'}))
+            self.assertFalse(journal.isDone('update', 'sites', {'name': 'a'}))
+            self.assertFalse(journal.isDone('create', 'sites', {'name': 'b'}))
+
+    def test_key_ignores_field_order(self):
+        self.assertEqual(lib_netbox_sink.NetboxJournal.itemKey('create', 'sites', {'name': 'a', 'slug': 'a'}),
+                         lib_netbox_sink.NetboxJournal.itemKey('create', 'sites', {'slug': 'a', 'name': 'a'}))
+
+    def test_torn_last_line(self):
+        with lib_netbox_sink.NetboxJournal(self.filename) as journal:
+            journal.done('create', 'sites', {'name': 'a'}, 'a')
+        with open(self.filename, 'ab') as f:
+            f.write(b'{"key": "create:sites:')
+        with lib_netbox_sink.NetboxJournal(self.filename) as journal:
+            self.assertEqual(len(journal), 1)
+            journal.done('create', 'sites', {'name': 'b'}, 'b')
+        with lib_netbox_sink.NetboxJournal(self.filename) as journal:
+            self.assertEqual(len(journal), 2)
+            self.assertTrue(journal.isDone('create', 'sites', {'name': 'b'}))
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxJournal(NetboxServerTestCase):
+    sizes = {'sites': 5}
+
+    def test_rerun_skips_done_items(self):
+        journal = os.path.join(self.directory.name, 'journal.jsonl')
+        data = [{'name': f'new-{i}', 'slug': f'new-{i}'} for i in range(6)]
+        api = self.api()
+        result = api.createSites(data[:4], chunk_size=2, journal=journal)
+        self.assertEqual((result['count_of_good'], result['count_of_skipped']), (4, 0))
+        result = api.createSites(data, chunk_size=2, journal=journal)
+        self.assertEqual((result['count_of_good'], result['count_of_bad'], result['count_of_skipped']), (6, 0, 4))
+        self.assertEqual(self.requestsOf(api, 'sites', 'POST'), 3)
+        self.assertEqual(len(self.table('sites')), 11)
+
+    def test_failed_items_are_retried(self):
+        journal = os.path.join(self.directory.name, 'journal.jsonl')
+        data = [{'name': f'new-{i}', 'slug': f'new-{i}'} for i in range(3)]
+        api = self.api(retries=0)
+        self.server.injectErrors(502, 1, 'POST')
+        result = api.createSites(data, chunk_size=3, journal=journal)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (0, 3))
+        result = api.createSites(data, chunk_size=3, journal=journal)
+        self.assertEqual((result['count_of_good'], result['count_of_skipped']), (3, 0))
+        self.assertEqual(len(self.table('sites')), 8)
@@ -0,0 +1,24 @@
+import asyncio
+import unittest
+
+import aiohttp
+
+import lib_netbox_async
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestAsyncErrors(NetboxServerTestCase):
+    sizes = {'sites': 5}
+
+    def test_raise_for_status(self):
+        self.server.injectErrors(404, count=10, method='GET')
+        async def run():
+            async with lib_netbox_async.AsyncNetboxAPI(self.config_file, log_mode='quiet', backoff=0, probe=False) as api:
+                await api.loadSites()
+        with self.assertRaises(aiohttp.ClientResponseError) as context:
+            asyncio.run(run())
+        self.assertEqual(context.exception.status, 404)
+        self.assertIn('404', str(context.exception))
+        self.assertIn('/api/dcim/sites/', str(context.exception.request_info.url))
@@ -0,0 +1,87 @@
+import unittest
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+def _sites(first, count):
+    return [{'name': f'new-{i}', 'slug': f'new-{i}'} for i in range(first, first + count)]
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxBulk(NetboxServerTestCase):
+    sizes = {'sites': 10}
+
+    def test_create_chunks(self):
+        api = self.api()
+        result = api.createSites(_sites(0, 10), chunk_size=4)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (10, 0))
+        self.assertEqual(sorted(item['name'] for item in result['list_of_created']), sorted(item['name'] for item in _sites(0, 10)))
+        self.assertEqual(self.requestsOf(api, 'sites', 'POST'), 3)
+        self.assertEqual(len(self.table('sites')), 20)
+
+    def test_create_rejected_chunk_one_by_one(self):
+        api = self.api()
+        data = _sites(0, 10)
+        data[2] = {}
+        result = api.createSites(data, chunk_size=5)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (9, 1))
+        self.assertEqual(self.requestsOf(api, 'sites', 'POST'), 2 + 5)
+        self.assertEqual(len(self.table('sites')), 19)
+
+    def test_create_throttled_chunk_not_replayed(self):
+        api = self.api(retries=1)
+        self.server.injectErrors(429, 2, 'POST', {'Retry-After': '0'})
+        result = api.createSites(_sites(0, 5), chunk_size=5)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (0, 5))
+        self.assertEqual(self.requestsOf(api, 'sites', 'POST'), 2)
+        self.assertEqual(len(self.table('sites')), 10)
+
+    def test_create_unknown_outcome_not_replayed(self):
+        api = self.api(retries=0)
+        self.server.injectErrors(502, 1, 'POST')
+        result = api.createSites(_sites(0, 5), chunk_size=5)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (0, 5))
+        self.assertEqual(self.requestsOf(api, 'sites', 'POST'), 1)
+
+    def test_update_chunks(self):
+        api = self.api()
+        result = api.updateSites([{'id': i, 'name': f'sites-{i}', 'description': 'updated'} for i in range(1, 11)], chunk_size=4)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (10, 0))
+        self.assertEqual(self.requestsOf(api, 'sites', 'PATCH'), 3)
+        self.assertTrue(all(item['description'] == 'updated' for item in self.table('sites').values()))
+
+    def test_update_rejected_chunk_one_by_one(self):
+        api = self.api()
+        data = [{'id': i, 'name': f'sites-{i}', 'description': 'updated'} for i in (1, 2, 99, 3)]
+        result = api.updateSites(data, chunk_size=4)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (3, 1))
+        self.assertEqual(result['list_of_good_ids'], [1, 2, 3])
+        self.assertEqual(self.requestsOf(api, 'sites', 'PATCH'), 1 + 4)
+
+    def test_update_throttled_chunk_not_replayed(self):
+        api = self.api(retries=1)
+        self.server.injectErrors(429, 2, 'PATCH', {'Retry-After': '0'})
+        result = api.updateSites([{'id': i, 'description': 'updated'} for i in range(1, 5)], chunk_size=4)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (0, 4))
+        self.assertEqual(self.requestsOf(api, 'sites', 'PATCH'), 2)
+
+    def test_delete_chunks(self):
+        api = self.api()
+        result = api.deleteSites([{'id': i, 'name': f'sites-{i}'} for i in range(1, 8)], chunk_size=3)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (7, 0))
+        self.assertEqual(self.requestsOf(api, 'sites', 'DELETE'), 3)
+        self.assertEqual(sorted(self.table('sites')), [8, 9, 10])
+
+    def test_delete_rejected_chunk_one_by_one(self):
+        api = self.api()
+        result = api.deleteSites([{'id': i, 'name': f'sites-{i}'} for i in (1, 99, 2)], chunk_size=3)
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (2, 1))
+        self.assertEqual(result['list_of_bad'], ['sites-99'])
+        self.assertEqual(self.requestsOf(api, 'sites', 'DELETE'), 1 + 3)
+        self.assertNotIn(1, self.table('sites'))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+
+from collections.abc import Mapping
+
+import lib_netbox
+import lib_netbox_snapshot
+import lib_netbox_store
+import lib_nspylib as mylib
+
+#-------------------------------------------------------------------------------
+
+class TestLoadDataFromFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data = {'sites': [{'id': i, 'name': f'dc-{i}', 'slug': f'dc-{i}'} for i in range(1, 4)],
+                     'racks': [{'id': 1, 'name': 'rack-1', 'site': {'id': 1}}]}
+        self.files = {'json':     os.path.join(self.directory.name, 'data.json'),
+                      'snapshot': os.path.join(self.directory.name, 'data.nbsnap'),
+                      'store':    os.path.join(self.directory.name, 'data.db')}
+        mylib.dumpJSONtoFile(self.files['json'], self.data)
+        lib_netbox_snapshot.writeSnapshot(self.files['snapshot'], self.data)
+        store = lib_netbox_store.NetboxSnapshotStore(self.files['store'])
+        store.writeData(self.data)
+        store.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def __api(self, kind):
+        return lib_netbox.NetboxAPI(input_data_file=self.files[kind], log_mode='quiet')
+
+    def test_dict_by_default(self):
+        for kind in self.files:
+            with self.subTest(kind=kind):
+                data = self.__api(kind).loadData()
+                self.assertIs(type(data), dict)
+                self.assertEqual(data, self.data)
+                data['vms'] = []
+                self.assertEqual(json.loads(json.dumps(data.copy()))['racks'], self.data['racks'])
+
+    def test_parts(self):
+        for kind in self.files:
+            with self.subTest(kind=kind):
+                data = self.__api(kind).loadData(parts=['racks', 'vms'])
+                self.assertEqual(data, {'racks': self.data['racks']})
+                self.assertEqual(self.__api(kind).loadData(parts=['sites'], lazy=True), {'sites': self.data['sites']})
+
+    def test_lazy(self):
+        for kind in self.files:
+            with self.subTest(kind=kind):
+                data = self.__api(kind).loadData(lazy=True)
+                self.assertIsInstance(data, Mapping)
+                self.assertEqual(sorted(data), ['racks', 'sites'])
+                self.assertEqual(data['sites'], self.data['sites'])
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+import lib_netbox
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+def _stamp(value):
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+#-------------------------------------------------------------------------------
+
+class TestMergeChanges(unittest.TestCase):
+
+    def test_merge(self):
+        old_data = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}, {'id': 3, 'name': 'c'}]
+        result = lib_netbox.mergeChanges(old_data, [{'id': 2, 'name': 'B'}, {'id': 4, 'name': 'd'}], {3})
+        self.assertEqual(result, [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'B'}, {'id': 4, 'name': 'd'}])
+        self.assertEqual(old_data[1]['name'], 'b')
+
+    def test_changed_since(self):
+        self.assertEqual(lib_netbox.changedSince('2025-05-30T10:00:00', 60), '2025-05-30T09:59:00+00:00')
+        self.assertEqual(lib_netbox.changedSince(datetime(2025, 5, 30, 10, tzinfo=timezone.utc), 0), '2025-05-30T10:00:00+00:00')
+
+#-------------------------------------------------------------------------------
+
+class TestIncrementalLoad(NetboxServerTestCase):
+    sizes = {'sites': 6, 'racks': 3}
+
+    def setUp(self):
+        super().setUp()
+        # everything the server holds was changed long before the first load
+        for part in ('sites', 'racks'):
+            for item in self.table(part).values():
+                item['last_updated'] = '2000-01-01T00:00:00.000000Z'
+        self.urls = []
+
+    def __firstLoad(self, api):
+        first = api.loadData(parts=['sites', 'racks'])
+        api.getMetrics().addSpanCallback(lambda span: self.urls.append(span['url']))
+        return first
+
+    def test_update_delete_and_create(self):
+        api = self.api()
+        first = self.__firstLoad(api)
+        self.table('sites')[2].update(name='renamed', last_updated=_stamp(datetime.now(timezone.utc)))
+        self.server.deleteObject('dcim/sites', 3)
+        new_site = self.server.addObject('dcim/sites', {'name': 'added', 'slug': 'added'})
+
+        second = api.loadData(parts=['sites', 'racks'], snapshot=first, since=api.getLastLoadTime())
+        sites = {item['id']: item for item in second['sites']}
+        self.assertEqual(sorted(sites), [1, 2, 4, 5, 6, new_site['id']])
+        self.assertEqual(sites[2]['name'], 'renamed')
+        self.assertEqual(sites[1], first['sites'][0])
+        self.assertEqual(second['racks'], first['racks'])
+        self.assertEqual(len(first['sites']), 6)
+        # only changes and deletions are asked for, not whole parts
+        self.assertTrue(any('extras/object-changes' in url for url in self.urls))
+        self.assertTrue(all('last_updated__gte' in url for url in self.urls if '/dcim/' in url))
+
+    def test_overlap_window(self):
+        api = self.api()
+        first = self.__firstLoad(api)
+        since = api.getLastLoadTime()
+        # a change committed shortly before the first load finished, but not seen by it
+        late = datetime.fromisoformat(since) - timedelta(seconds=30)
+        self.table('sites')[4].update(name='late', last_updated=_stamp(late))
+
+        without_overlap = api.loadData(parts=['sites'], snapshot=first, since=since, overlap=0)
+        self.assertEqual(next(item for item in without_overlap['sites'] if item['id'] == 4)['name'], 'sites-4')
+        with_overlap = api.loadData(parts=['sites'], snapshot=first, since=since, overlap=60)
+        self.assertEqual(next(item for item in with_overlap['sites'] if item['id'] == 4)['name'], 'late')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxPaging(NetboxServerTestCase):
+    sizes = {'sites': 7}
+
+    def test_pages(self):
+        api = self.api(page_size=3)
+        sites = api.loadSites()
+        self.assertEqual([site['id'] for site in sites], list(range(1, 8)))
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 3)
+
+    def test_exact_pages(self):
+        api = self.api()
+        self.assertEqual(len(api.loadSites(page_size=7)), 7)
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 1)
+
+    def test_server_page_limit(self):
+        self.server.max_page_size = 2
+        api = self.api(page_size=1000)
+        self.assertEqual(len(api.loadSites()), 7)
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 4)
+
+    def test_empty_page(self):
+        api = self.api(page_size=3)
+        self.assertEqual(api.loadSites(filters={'slug': 'missing'}), [])
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 1)
+
+    def test_iterate_lazily(self):
+        api = self.api(page_size=3)
+        sites = api.iterSites()
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 0)
+        self.assertEqual(next(sites)['id'], 1)
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 1)
+        self.assertEqual(len(list(sites)), 6)
+        self.assertEqual(self.requestsOf(api, 'sites', 'GET'), 3)
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import unittest
+
+import lib_netbox
+import lib_netbox_async
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestReceivedBytes(unittest.TestCase):
+
+    def test_wire_count(self):
+        self.assertEqual(lib_netbox.receivedBytes({'Content-Length': '10', 'Content-Encoding': 'gzip'}, b'x' * 50, 12), 12)
+
+    def test_content_length_of_encoded_body(self):
+        self.assertEqual(lib_netbox.receivedBytes({'Content-Length': '10', 'Content-Encoding': 'gzip'}, b'x' * 50), 10)
+
+    def test_plain_body(self):
+        self.assertEqual(lib_netbox.receivedBytes({}, b'x' * 50), 50)
+        self.assertEqual(lib_netbox.receivedBytes({'Content-Length': 'bad', 'Content-Encoding': 'gzip'}, b'x' * 50), 50)
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxBytesIn(NetboxServerTestCase):
+    sizes = {'sites': 200}
+
+    def decodedSize(self):
+        # the single page as JSON, the fake server gzips it on the wire
+        return len(json.dumps({'count': 200, 'next': None, 'previous': None, 'results': self.table('sites')}).encode('utf-8'))
+
+    def test_sync_counts_compressed_bytes(self):
+        api = self.api()
+        sites = api.loadSites()
+        self.assertEqual(len(sites), 200)
+        bytes_in = api.getMetrics().toDict()['sites']['GET']['bytes_in']
+        self.assertGreater(bytes_in, 0)
+        self.assertLess(bytes_in, self.decodedSize() / 2)
+
+    def test_async_counts_compressed_bytes(self):
+        async def run():
+            async with lib_netbox_async.AsyncNetboxAPI(self.config_file, log_mode='quiet', backoff=0) as api:
+                sites = await api.loadSites()
+                return len(sites), api.getMetrics().toDict()['sites']['GET']['bytes_in']
+        count, bytes_in = asyncio.run(run())
+        self.assertEqual(count, 200)
+        self.assertGreater(bytes_in, 0)
+        self.assertLess(bytes_in, self.decodedSize() / 2)
+
+    def test_sync_and_async_agree(self):
+        api = self.api()
+        api.loadSites()
+        sync_bytes = api.getMetrics().toDict()['sites']['GET']['bytes_in']
+        async def run():
+            async with lib_netbox_async.AsyncNetboxAPI(self.config_file, log_mode='quiet', backoff=0) as api:
+                await api.loadSites()
+                return api.getMetrics().toDict()['sites']['GET']['bytes_in']
+        self.assertEqual(asyncio.run(run()), sync_bytes)
@@ -0,0 +1,151 @@
+import threading
+import time
+import unittest
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import requests
+
+import lib_netbox
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestRetryRules(unittest.TestCase):
+
+    def test_retry_delay(self):
+        self.assertEqual(lib_netbox.retryDelay(0, 0.5, 60, '2'), 2.0)
+        self.assertEqual(lib_netbox.retryDelay(0, 0.5, 60, format_datetime(datetime.now(timezone.utc) - timedelta(seconds=10), usegmt=True)), 0.0)
+        self.assertAlmostEqual(lib_netbox.retryDelay(0, 0.5, 60, format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)), 30, delta=1.5)
+        for attempt, low, high in ((0, 0.25, 0.5), (3, 2, 4), (10, 30, 60)):
+            for i in range(20):
+                self.assertTrue(low <= lib_netbox.retryDelay(attempt, 0.5, 60, 'invalid') <= high)
+
+    def test_retry_decision(self):
+        decision = lib_netbox.retryDecision
+        # idempotent methods are retried on 429 and 5xx gateway errors and on any network error
+        self.assertEqual(decision('GET', 0, 5, False, 503), ('retry', True))
+        self.assertEqual(decision('GET', 0, 5, False, 429), ('retry', False))
+        self.assertEqual(decision('PATCH', 0, 5, False, 502), ('retry', True))
+        self.assertEqual(decision('GET', 0, 5, False, 400), ('done', True))
+        self.assertEqual(decision('GET', 5, 5, False, 503), ('done', True))
+        self.assertEqual(decision('GET', 0, 5, False), ('retry', True))
+        # a POST is only retried when NetBox surely did not process it
+        self.assertEqual(decision('POST', 0, 5, False, 429), ('retry', False))
+        self.assertEqual(decision('POST', 0, 5, False, 503), ('retry', True))
+        self.assertEqual(decision('POST', 0, 5, False, 502), ('done', True))
+        self.assertEqual(decision('POST', 0, 5, False, 504), ('done', True))
+        self.assertEqual(decision('POST', 0, 5, False), ('fail', True))
+        self.assertEqual(decision('POST', 0, 5, False, not_sent=True), ('retry', False))
+        # a DELETE that was sent before may have already removed the object
+        self.assertEqual(decision('DELETE', 1, 5, True, 404), ('deleted', True))
+        self.assertEqual(decision('DELETE', 0, 5, False, 404), ('done', True))
+
+#-------------------------------------------------------------------------------
+
+class TestRetries(NetboxServerTestCase):
+    sizes = {'sites': 5}
+
+    def __series(self, api, part, method):
+        return api.getMetrics().toDict()[part][method]
+
+    def test_get_retried(self):
+        api = self.api(page_size=2)
+        self.server.injectErrors(503, 2, 'GET', {'Retry-After': '0'})
+        self.assertEqual(len(api.loadSites()), 5)
+        series = self.__series(api, 'sites', 'GET')
+        self.assertEqual((series['requests'], series['retries'], series['status_codes']), (5, 2, {200: 3, 503: 2}))
+
+    def test_get_gives_up(self):
+        api = self.api(retries=2)
+        self.server.injectErrors(502, 3, 'GET')
+        with self.assertRaises(requests.HTTPError):
+            api.loadSites()
+        self.assertEqual(self.__series(api, 'sites', 'GET')['requests'], 3)
+
+    def test_post_not_retried_on_unknown_outcome(self):
+        api = self.api()
+        self.server.injectErrors(502, 1, 'POST')
+        result = api.createSites([{'name': 'new', 'slug': 'new'}])
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (0, 1))
+        self.assertEqual(self.__series(api, 'sites', 'POST')['requests'], 1)
+
+    def test_post_retried_when_not_processed(self):
+        api = self.api()
+        self.server.injectErrors(429, 1, 'POST', {'Retry-After': '0'})
+        self.server.injectErrors(503, 1, 'POST', {'Retry-After': '0'})
+        result = api.createSites([{'name': 'new', 'slug': 'new'}])
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (1, 0))
+        self.assertEqual(self.__series(api, 'sites', 'POST')['requests'], 3)
+        self.assertEqual(len(self.table('sites')), 6)
+
+    def test_retry_after(self):
+        api = self.api(backoff=30)
+        self.server.injectErrors(429, 1, 'PATCH', {'Retry-After': '0.3'})
+        start = time.monotonic()
+        result = api.updateSites([{'id': 1, 'name': 'sites-1', 'description': 'updated'}])
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(result['count_of_good'], 1)
+
+    def test_delete_retried(self):
+        api = self.api()
+        self.server.injectErrors(504, 1, 'DELETE')
+        result = api.deleteSites([{'id': 1, 'name': 'sites-1'}])
+        self.assertEqual(result['count_of_good'], 1)
+        self.assertEqual(self.__series(api, 'sites', 'DELETE')['status_codes'], {204: 1, 504: 1})
+        self.assertNotIn(1, self.table('sites'))
+
+#-------------------------------------------------------------------------------
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def __request(self, limiter, key, latency, overloaded=False):
+        limiter.acquire()
+        limiter.release(key, latency, overloaded)
+
+    def test_overload_halves_and_recovers(self):
+        limiter = lib_netbox.AdaptiveLimiter(16, min_limit=2)
+        self.__request(limiter, ('sites', 'GET'), 0.01, overloaded=True)
+        self.assertEqual(limiter.getLimit(), 8)
+        for i in range(5):
+            self.__request(limiter, ('sites', 'GET'), 0.01, overloaded=True)
+        self.assertEqual(limiter.getLimit(), 2)
+        for i in range(500):
+            self.__request(limiter, ('sites', 'GET'), 0.01)
+        self.assertEqual(limiter.getLimit(), 16)
+
+    def test_latency_shrinks_per_key(self):
+        limiter = lib_netbox.AdaptiveLimiter(16)
+        for i in range(20):
+            self.__request(limiter, ('sites', 'GET'), 0.01)
+            self.__request(limiter, ('devices', 'GET'), 0.5)
+        # a part that is always slow is not a sign of overload
+        self.assertEqual(limiter.getLimit(), 16)
+        for i in range(20):
+            self.__request(limiter, ('sites', 'GET'), 0.2)
+        self.assertLess(limiter.getLimit(), 16)
+
+    def test_limit_blocks(self):
+        limiter = lib_netbox.AdaptiveLimiter(2)
+        limiter.acquire()
+        limiter.acquire()
+        acquired = threading.Event()
+        def __acquire():
+            limiter.acquire()
+            acquired.set()
+        thread = threading.Thread(target=__acquire, daemon=True)
+        thread.start()
+        self.assertFalse(acquired.wait(0.2))
+        # a larger max_limit lets the waiting request through once the limit grows past the requests in flight
+        limiter.setMaxLimit(3)
+        limiter.release(('sites', 'GET'), 0.01)
+        self.assertTrue(acquired.wait(2))
+        thread.join()
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
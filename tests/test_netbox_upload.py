@@ -0,0 +1,75 @@
+import threading
+import unittest
+
+import lib_netbox
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+class TestDependencyWaves(unittest.TestCase):
+
+    def test_waves(self):
+        self.assertEqual(lib_netbox.dependencyWaves(['devices', 'racks', 'sites', 'manufacturers', 'owners']),
+                         [['sites', 'manufacturers', 'owners'], ['racks'], ['devices']])
+        self.assertEqual(lib_netbox.dependencyWaves([]), [])
+
+    def test_missing_parts_do_not_add_waves(self):
+        # locations sit between sites and racks, without them racks follow sites directly
+        self.assertEqual(lib_netbox.dependencyWaves(['racks', 'sites']), [['sites'], ['racks']])
+
+#-------------------------------------------------------------------------------
+
+class TestUploadData(NetboxServerTestCase):
+    sizes = {'sites': 5, 'locations': 5, 'racks': 5, 'manufacturers': 5}
+
+    def setUp(self):
+        super().setUp()
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def __record(self, span):
+        with self.lock:
+            self.spans.append((span['part'], span['method']))
+
+    def __positions(self, part, method):
+        return [i for i, span in enumerate(self.spans) if span == (part, method)]
+
+    def test_waves_and_report(self):
+        api = self.api(max_workers=4)
+        api.getMetrics().addSpanCallback(self.__record)
+        result = api.uploadData(data_to_create={'racks':         [{'name': 'rack-new', 'site': 1, 'location': 1}],
+                                                'locations':     [{'name': 'location-new', 'slug': 'location-new', 'site': 1}],
+                                                'sites':         [{'name': 'site-new', 'slug': 'site-new'}],
+                                                'manufacturers': [{'name': 'vendor-new', 'slug': 'vendor-new'}],
+                                                'unknown':       [{'name': 'skipped'}]},
+                                data_to_update={'racks': [{'id': 1, 'name': 'racks-1', 'u_height': 48}],
+                                                'sites': [{'id': 1, 'name': 'sites-1', 'description': 'updated'}]},
+                                data_to_delete={'sites':     [{'id': 5, 'name': 'sites-5'}],
+                                                'locations': [{'id': 5, 'name': 'locations-5'}],
+                                                'racks':     [{'id': 5, 'name': 'racks-5'}]})
+
+        self.assertEqual(set(result.keys()), {'create', 'update', 'delete'})
+        self.assertEqual(list(result['create'].keys()), ['sites', 'manufacturers', 'locations', 'racks'])
+        self.assertEqual(list(result['update'].keys()), ['sites', 'racks'])
+        self.assertEqual(list(result['delete'].keys()), ['racks', 'locations', 'sites'])
+        for action, parts in result.items():
+            for part, part_result in parts.items():
+                self.assertEqual((part_result['count_of_good'], part_result['count_of_bad']), (1, 0), f'{action} {part}')
+        self.assertEqual(result['create']['sites']['list_of_created'][0]['name'], 'site-new')
+
+        # creates and updates run parents first, deletes run children first
+        self.assertLess(max(self.__positions('sites', 'POST')), min(self.__positions('locations', 'POST')))
+        self.assertLess(max(self.__positions('locations', 'POST')), min(self.__positions('racks', 'POST')))
+        self.assertLess(max(self.__positions('racks', 'POST')), min(self.__positions('sites', 'PATCH')))
+        self.assertLess(max(self.__positions('sites', 'PATCH')), min(self.__positions('racks', 'PATCH')))
+        self.assertLess(max(self.__positions('racks', 'DELETE')), min(self.__positions('locations', 'DELETE')))
+        self.assertLess(max(self.__positions('locations', 'DELETE')), min(self.__positions('sites', 'DELETE')))
+
+    def test_nothing_to_upload(self):
+        self.assertEqual(self.api().uploadData(), {'create': {}, 'update': {}, 'delete': {}})
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
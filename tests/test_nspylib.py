@@ -0,0 +1,34 @@
+import random
+import unittest
+
+import lib_nspylib as mylib
+
+#-------------------------------------------------------------------------------
+
+class TestPackedIPs(unittest.TestCase):
+
+    def test_sorted_ips_orders_by_value(self):
+        generator = random.Random(1)
+        ip_list = [f'10.{generator.randrange(256)}.{generator.randrange(256)}.{generator.randrange(256)}/24' for i in range(200)]
+        ip_list += [f'2001:db8::{generator.randrange(65536):x}' for i in range(50)] + ['::1', '0.0.0.1', 'fe80::1%eth0', 'bad']
+        generator.shuffle(ip_list)
+        self.assertEqual(mylib.sortedIPs(ip_list), sorted(ip_list, key=mylib.ipToInt))
+
+    def test_sorted_ips_unique_keeps_families_apart(self):
+        self.assertEqual(mylib.sortedIPs(['0.0.0.1', '::1'], unique=True), ['0.0.0.1', '::1'])
+        self.assertEqual(mylib.sortedIPs(['0.0.0.1', '::1', '0.0.0.1', '::1'], unique=True), ['0.0.0.1', '::1'])
+        self.assertEqual(mylib.sortedIPs(['::1', '10.0.0.2/24', '10.0.0.1', '10.0.0.2/24'], unique=True), ['::1', '10.0.0.1', '10.0.0.2/24'])
+
+    def test_scoped_ipv6(self):
+        self.assertEqual(mylib.sortedIPs(['fe80::2', 'fe80::1%eth0', '10.0.0.1']), ['10.0.0.1', 'fe80::1%eth0', 'fe80::2'])
+
+    def test_filter_ips_by_range_keeps_families_apart(self):
+        ip_list = ['10.0.0.5', '::a00:5', '10.0.1.1', 'fe80::1%eth0']
+        self.assertEqual(mylib.filterIPsByRange(ip_list, '10.0.0.0', '10.0.0.255'), ['10.0.0.5'])
+        self.assertEqual(mylib.filterIPsByRange(ip_list, '::', '::ffff:ffff'), ['::a00:5'])
+        self.assertEqual(mylib.filterIPsByRange(ip_list, 'fe80::', 'fe80::ffff'), ['fe80::1%eth0'])
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+import lib_netbox_index
+import lib_netbox_records
+import lib_netbox_store
+
+BASE = 'https://netbox.local/api'
+
+#-------------------------------------------------------------------------------
+
+def _ip(object_id, address, object_type, assigned_id, parent):
+    endpoint = 'dcim/interfaces' if object_type == 'dcim.interface' else 'virtualization/interfaces'
+    parent_field = 'device' if object_type == 'dcim.interface' else 'virtual_machine'
+    parent_endpoint = 'dcim/devices' if object_type == 'dcim.interface' else 'virtualization/virtual-machines'
+    return {'id':                   object_id,
+            'url':                  f'{BASE}/ipam/ip-addresses/{object_id}/',
+            'address':              address,
+            'assigned_object_type': object_type,
+            'assigned_object_id':   assigned_id,
+            'assigned_object':      {'id':         assigned_id,
+                                     'url':        f'{BASE}/{endpoint}/{assigned_id}/',
+                                     'name':       f'eth{assigned_id}',
+                                     parent_field: {'id':   parent,
+                                                    'url':  f'{BASE}/{parent_endpoint}/{parent}/',
+                                                    'name': f'{parent_field}-{parent}'}},
+            'tags':                 []}
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxRecords(unittest.TestCase):
+
+    def setUp(self):
+        # a VM interface and a device interface share id 5
+        self.items = [_ip(1, '10.0.0.1/24', 'virtualization.vminterface', 5, 100),
+                      _ip(2, '10.0.0.2/24', 'dcim.interface', 5, 200),
+                      _ip(3, '10.0.0.3/24', 'dcim.interface', 6, 200)]
+        self.part = lib_netbox_records.NetboxCompactPart('ip_addresses', self.items)
+
+    def test_polymorphic_round_trip(self):
+        self.assertEqual(self.part.toList(), self.items)
+        self.assertEqual(self.part[1].refId('assigned_object'), 5)
+
+    def test_polymorphic_without_urls(self):
+        items = []
+        for item in self.items:
+            item = dict(item, assigned_object={key: value for key, value in item['assigned_object'].items() if key != 'url'})
+            del item['url']
+            items.append(item)
+        part = lib_netbox_records.NetboxCompactPart('ip_addresses', items)
+        self.assertEqual(part.toList(), items)
+
+    def test_inventory_index(self):
+        index = lib_netbox_index.NetboxInventoryIndex({'ip_addresses': self.part})
+        self.assertEqual([item['id'] for item in index.ipsOfVM(100)], [1])
+        self.assertEqual(sorted(item['id'] for item in index.ipsOfDevice(200)), [2, 3])
+
+    def test_items(self):
+        self.assertEqual(dict(self.part[0].items()), self.items[0])
+
+    def test_snapshot_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = lib_netbox_store.NetboxSnapshotStore(os.path.join(directory, 'snapshot.db'))
+            try:
+                self.assertEqual(store.writeData({'ip_addresses': self.part}), {'ip_addresses': 3})
+                self.assertEqual(store['ip_addresses'], self.items)
+                self.assertEqual(store.getById('ip_addresses', 2), self.items[1])
+            finally:
+                store.close()
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
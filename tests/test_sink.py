@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+
+import lib_netbox_sink
+
+from netbox_server import NetboxServerTestCase
+
+#-------------------------------------------------------------------------------
+
+def _lines(filename):
+    with open(filename, 'rb') as f:
+        return [json.loads(line) for line in f]
+
+#-------------------------------------------------------------------------------
+
+class TestJSONLinesSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'results.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_buffered_until_flush(self):
+        sink = lib_netbox_sink.NetboxJSONLinesSink(self.filename, buffer_size=3)
+        sink({'n': 1})
+        sink({'n': 2})
+        self.assertEqual(_lines(self.filename), [])
+        sink({'n': 3})
+        self.assertEqual(len(_lines(self.filename)), 3)
+        sink({'n': 4})
+        sink.flush()
+        self.assertEqual(_lines(self.filename), [{'n': 1}, {'n': 2}, {'n': 3}, {'n': 4}])
+        sink.close()
+
+    def test_append_and_write_mode(self):
+        with lib_netbox_sink.NetboxJSONLinesSink(self.filename) as sink:
+            sink({'n': 1})
+        with lib_netbox_sink.NetboxJSONLinesSink(self.filename) as sink:
+            sink({'n': 2})
+        self.assertEqual(_lines(self.filename), [{'n': 1}, {'n': 2}])
+        with lib_netbox_sink.NetboxJSONLinesSink(self.filename, mode='w') as sink:
+            sink({'n': 3})
+        self.assertEqual(_lines(self.filename), [{'n': 3}])
+
+    def test_close_twice(self):
+        sink = lib_netbox_sink.NetboxJSONLinesSink(self.filename)
+        sink({'n': 1})
+        sink.close()
+        sink.close()
+        self.assertEqual(_lines(self.filename), [{'n': 1}])
+
+#-------------------------------------------------------------------------------
+
+class TestResultCollector(unittest.TestCase):
+
+    def test_aggregate(self):
+        records = []
+        collector = lib_netbox_sink.NetboxResultCollector('create', 'sites', 'task', 3, sink=records.append)
+        collector.goodChunk(['b', 'a'], [{'name': 'b'}, {'name': 'a'}], created=[{'id': 1}, {'id': 2}], first_index=0)
+        collector.bad('c', {'name': 'c'}, {'detail': 'bad'}, index=2)
+        result = collector.finish()
+        self.assertEqual((result['count_of_good'], result['count_of_bad']), (2, 1))
+        self.assertEqual(result['list_of_good'], ['a', 'b'])
+        self.assertEqual(result['dict_of_bad'], {'c': {'request': {'name': 'c'}, 'response': {'detail': 'bad'}}})
+        self.assertEqual(result['list_of_created'], [{'id': 1}, {'id': 2}])
+        self.assertEqual([(record['name'], record['ok'], record['index']) for record in records], [('b', True, 0), ('a', True, 1), ('c', False, 2)])
+        self.assertEqual(records[2]['request'], {'name': 'c'})
+
+    def test_no_aggregate(self):
+        records = []
+        progress = []
+        collector = lib_netbox_sink.NetboxResultCollector('update', 'sites', 'task', 3, sink=records.append, aggregate=False,
+                                                          progress=lambda task, done, total: progress.append((task, done, total)))
+        collector.good('a', {'id': 1})
+        collector.good('b', {'id': 2})
+        collector.bad('c', {'id': 3}, {'detail': 'bad'})
+        self.assertEqual(collector.finish(), {'count_of_good': 2, 'count_of_bad': 1})
+        self.assertEqual(len(records), 3)
+        self.assertEqual(progress, [('task', 1, 3), ('task', 2, 3), ('task', 3, 3)])
+
+    def test_sink_file_name(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'results.jsonl')
+            collector = lib_netbox_sink.NetboxResultCollector('delete', 'sites', 'task', 1, sink=filename, aggregate=False)
+            collector.good('a', {'id': 1})
+            collector.finish()
+            self.assertEqual(_lines(filename), [{'action': 'delete', 'part': 'sites', 'name': 'a', 'ok': True, 'index': None}])
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxSink(NetboxServerTestCase):
+    sizes = {'sites': 5}
+
+    def test_create_without_aggregate(self):
+        records = []
+        api = self.api()
+        result = api.createSites([{'name': f'new-{i}', 'slug': f'new-{i}'} for i in range(4)], chunk_size=3, sink=records.append, aggregate=False)
+        self.assertEqual(result, {'count_of_good': 4, 'count_of_bad': 0})
+        self.assertEqual(sorted(record['name'] for record in records), [f'new-{i}' for i in range(4)])
+        self.assertTrue(all(record['ok'] and 'id' in record['response'] for record in records))
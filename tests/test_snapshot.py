@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import lib_netbox_snapshot
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'snapshot.nbsnap')
+        self.sites = [{'id': i, 'name': f'dc-{i}'} for i in range(1, 26)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(lib_netbox_snapshot.writeSnapshot(self.filename, {'sites': self.sites}, block_size=10), {'sites': 25})
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            self.assertEqual(snapshot['sites'], self.sites)
+            self.assertEqual(snapshot.getById('sites', 17), self.sites[16])
+            self.assertIsNone(snapshot.getById('sites', 100))
+
+    def test_exception_leaves_no_file(self):
+        def items():
+            yield from self.sites
+            raise RuntimeError('load failed')
+        with self.assertRaises(RuntimeError):
+            with lib_netbox_snapshot.NetboxSnapshotWriter(self.filename, block_size=10) as writer:
+                writer.writePart('sites', items())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_failed_rewrite_keeps_snapshot(self):
+        lib_netbox_snapshot.writeSnapshot(self.filename, {'sites': self.sites}, block_size=10)
+        def items():
+            yield from self.sites[:5]
+            raise RuntimeError('load failed')
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            with self.assertRaises(RuntimeError):
+                with lib_netbox_snapshot.NetboxSnapshotWriter(self.filename, block_size=10) as writer:
+                    writer.writePart('sites', items())
+            self.assertEqual(snapshot['sites'], self.sites)
+        self.assertEqual(os.listdir(self.directory.name), ['snapshot.nbsnap'])
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            self.assertEqual(snapshot.countOf('sites'), 25)
+
+    def test_rewrite_keeps_open_readers(self):
+        lib_netbox_snapshot.writeSnapshot(self.filename, {'sites': self.sites}, block_size=10)
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            lib_netbox_snapshot.writeSnapshot(self.filename, {'sites': self.sites[:3]})
+            self.assertEqual(snapshot.getById('sites', 25), self.sites[24])
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            self.assertEqual(snapshot['sites'], self.sites[:3])
+
+    def test_unclosed_writer_writes_no_footer(self):
+        writer = lib_netbox_snapshot.NetboxSnapshotWriter(self.filename)
+        writer.writePart('sites', self.sites)
+        del writer
+        self.assertFalse(lib_netbox_snapshot.isSnapshotFile(self.filename))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_parts_are_cached(self):
+        lib_netbox_snapshot.writeSnapshot(self.filename, {'sites': self.sites})
+        with lib_netbox_snapshot.NetboxSnapshotFile(self.filename) as snapshot:
+            self.assertIs(snapshot['sites'], snapshot['sites'])
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import lib_netbox_store
+
+#-------------------------------------------------------------------------------
+
+class TestNetboxSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'snapshot.db')
+        self.sites = [{'id': i, 'name': f'dc-{i}', 'slug': f'dc-{i}', 'region': {'id': i % 2}} for i in range(1, 6)]
+        store = lib_netbox_store.NetboxSnapshotStore(self.filename)
+        store.writeData({'sites': self.sites, 'racks': []})
+        store.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        store = lib_netbox_store.NetboxSnapshotStore(self.filename, read_only=True)
+        self.assertEqual(list(store), ['sites', 'racks'])
+        self.assertEqual(store['sites'], self.sites)
+        self.assertEqual(store['racks'], [])
+        self.assertEqual(store.getById('sites', 3), self.sites[2])
+        self.assertEqual(store.findBySlug('sites', 'dc-2'), [self.sites[1]])
+        self.assertEqual([item['id'] for item in store.findByRef('sites', 'region', 0)], [2, 4])
+        self.assertNotIn('vms', store)
+        store.close()
+
+    def test_parts_are_cached(self):
+        store = lib_netbox_store.NetboxSnapshotStore(self.filename, read_only=True)
+        store['sites'].append({'id': 6, 'name': 'dc-6'})
+        self.assertIs(store['sites'], store['sites'])
+        self.assertEqual(len(store['sites']), 6)
+        store.close()
+
+    def test_read_only_does_not_change_the_file(self):
+        with open(self.filename, 'rb') as f:
+            before = f.read()
+        files = sorted(os.listdir(self.directory.name))
+        store = lib_netbox_store.NetboxSnapshotStore(self.filename, read_only=True)
+        self.assertEqual(len(store['sites']), 5)
+        with self.assertRaises(sqlite3.OperationalError):
+            store.writePart('racks', [{'id': 1, 'name': 'rack-1'}])
+        store.close()
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), files)
+
+    def test_failed_open(self):
+        unraisable = []
+        old_hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                lib_netbox_store.NetboxSnapshotStore(os.path.join(self.directory.name, 'missing', 'snapshot.db'))
+            gc.collect()
+        finally:
+            sys.unraisablehook = old_hook
+        self.assertEqual(unraisable, [])
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()